@@ -0,0 +1,173 @@
+""" AVL tree augmented with user-defined aggregates over every sub-tree.
+
+Each aggregate is a monoid: an associative combine function with an
+identity, applied to a measure of every (key, item) pair. Every node stores
+combine(left aggregate, measure(node), right aggregate), kept up to date
+by insertions, deletions and rotations, so the aggregate over any key
+range is answered in O(log(N)). For example, the total emerald value of
+the caves whose key is at least x:
+
+```
+tree = AggregateAVLTree(aggregates={'value': Monoid.sum(lambda key, cave: cave.quantity * price)})
+tree.range_aggregate('value', lo=x)
+```
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import math
+import operator
+from avl import AVLTree
+from typing import Callable, TypeVar, Generic
+from node import AggregateAVLTreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+V = TypeVar('V')
+
+
+class Monoid(Generic[K, I, V]):
+    """ An associative combine function, its identity and the measure of a
+        single (key, item) pair.
+    """
+
+    def __init__(self, combine: Callable[[V, V], V], identity: V, measure: Callable[[K, I], V]) -> None:
+        self.combine = combine
+        self.identity = identity
+        self.measure = measure
+
+    @classmethod
+    def sum(cls, measure: Callable[[K, I], V]) -> Monoid[K, I, V]:
+        return cls(operator.add, 0, measure)
+
+    @classmethod
+    def max(cls, measure: Callable[[K, I], V]) -> Monoid[K, I, V]:
+        return cls(max, -math.inf, measure)
+
+    @classmethod
+    def min(cls, measure: Callable[[K, I], V]) -> Monoid[K, I, V]:
+        return cls(min, math.inf, measure)
+
+
+class AggregateAVLTree(AVLTree, Generic[K, I]):
+    """ AVL tree keeping named monoid aggregates over every sub-tree. """
+
+    node_type = AggregateAVLTreeNode
+
+    def __init__(self, recycle_nodes: bool = False, key: Callable[[I], K] = None, tie_break: bool = False,
+                 aggregates: dict[str, Monoid] = None) -> None:
+        """
+            Initialises an empty tree maintaining the given aggregates
+            (name -> Monoid). See AVLTree for the other arguments.
+            :complexity: O(1)
+        """
+        AVLTree.__init__(self, recycle_nodes, key, tie_break)
+        aggregates = {} if aggregates is None else aggregates
+        self.aggregate_names = list(aggregates)
+        self.monoids = [aggregates[name] for name in self.aggregate_names]
+
+    def new_node(self, key: K, item: I) -> AggregateAVLTreeNode:
+        node = AVLTree.new_node(self, key, item)
+        node.aggregate = tuple(monoid.measure(key, item) for monoid in self.monoids)
+        return node
+
+    def update_height_and_size(self, current: AggregateAVLTreeNode) -> None:
+        """
+            Recompute the height, size and aggregates of a node from those
+            of its children.
+            :complexity: O(A), A being the number of aggregates
+        """
+        AVLTree.update_height_and_size(self, current)
+        left = current.left
+        right = current.right
+        aggregate = []
+        for i, monoid in enumerate(self.monoids):
+            value = monoid.measure(current.key, current.item)
+            if left is not None:
+                value = monoid.combine(left.aggregate[i], value)
+            if right is not None:
+                value = monoid.combine(value, right.aggregate[i])
+            aggregate.append(value)
+        current.aggregate = tuple(aggregate)
+
+    def retrace(self, path: list, subtree: AggregateAVLTreeNode, change: int) -> AggregateAVLTreeNode:
+        """
+            Same as AVLTree.retrace, but never stops early: the aggregates
+            of every node on the path change, not just their sizes.
+            :complexity: O(A * len(path))
+        """
+        for node, went_left in reversed(path):
+            if went_left:
+                node.left = subtree
+            else:
+                node.right = subtree
+            self.update_height_and_size(node)
+            subtree = self.rebalance(node)
+        return subtree
+
+    def refresh(self, key: K) -> None:
+        """
+            Recomputes the aggregates on the path to key, to be called after
+            changing the item stored under key in place.
+            :complexity: O(A * log(N))
+            :raises KeyError: if key is not in the tree
+        """
+        path, node = self.find_path(self.root, key)
+        if node is None:
+            raise KeyError('Key not found: {0}'.format(key))
+        self.refresh_path(path, node)
+
+    def refresh_path(self, path: list, node: AggregateAVLTreeNode) -> None:
+        """
+            Recomputes the aggregates of node and of every node above it on
+            path, since the measure may depend on node's key and item.
+            :complexity: O(A * len(path))
+        """
+        self.update_height_and_size(node)
+        for parent, _ in reversed(path):
+            self.update_height_and_size(parent)
+
+    def aggregate(self, name: str):
+        """
+            Returns the aggregate over the whole tree.
+            :complexity: O(1)
+            :raises KeyError: if there is no aggregate with that name
+        """
+        i = self.index_of(name)
+        if self.root is None:
+            return self.monoids[i].identity
+        return self.root.aggregate[i]
+
+    def range_aggregate(self, name: str, lo: K = None, hi: K = None, inclusive: tuple[bool, bool] = (True, True)):
+        """
+            Returns the aggregate over the keys in between lo and hi (None
+            meaning no bound). Only the nodes on the paths to the two bounds
+            are visited, whole sub-trees in between use their stored value.
+            :complexity: O(A + log(N))
+            :raises KeyError: if there is no aggregate with that name
+        """
+        i = self.index_of(name)
+        return self.range_aggregate_aux(self.root, i, lo, hi, inclusive)
+
+    def range_aggregate_aux(self, current: AggregateAVLTreeNode, i: int, lo: K, hi: K, inclusive: tuple[bool, bool]):
+        monoid = self.monoids[i]
+        if current is None:
+            return monoid.identity
+        if lo is None and hi is None:   # the whole sub-tree is in range
+            return current.aggregate[i]
+        lo_inclusive, hi_inclusive = inclusive
+        if lo is not None and (current.key < lo or (current.key == lo and not lo_inclusive)):
+            return self.range_aggregate_aux(current.right, i, lo, hi, inclusive)
+        if hi is not None and (current.key > hi or (current.key == hi and not hi_inclusive)):
+            return self.range_aggregate_aux(current.left, i, lo, hi, inclusive)
+        # current is in range: the left part only has the lower bound, the right part the upper one
+        value = monoid.measure(current.key, current.item)
+        value = monoid.combine(self.range_aggregate_aux(current.left, i, lo, None, inclusive), value)
+        return monoid.combine(value, self.range_aggregate_aux(current.right, i, None, hi, inclusive))
+
+    def index_of(self, name: str) -> int:
+        """ Returns the position of an aggregate in the node tuples. """
+        if name not in self.aggregate_names:
+            raise KeyError('No such aggregate: {0}'.format(name))
+        return self.aggregate_names.index(name)
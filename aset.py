@@ -77,9 +77,10 @@ class ASet(Set[T]):
         i.e. the result set should contains the elements of self and other.
         """
         res = ASet(len(self.array) + len(other.array))
-        for the_set in [self, other]:
-            for i in range(len(the_set)):
-                res.add(the_set.array[i])
+        self.array.copy_into(res.array, 0, 0, len(self))    # self has no duplicates
+        res.size = len(self)
+        for i in range(len(other)):
+            res.add(other.array[i])
         return res
 
     def intersection(self, other: ASet[T]) -> ASet[T]:
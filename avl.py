@@ -1,11 +1,15 @@
 """ AVL Tree implemented on top of the standard BST. """
+from __future__ import annotations
 
 __author__ = 'Alexey Ignatiev, with edits by Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
 
+from collections import deque
 from bst import BinarySearchTree
-from typing import TypeVar, Generic, List
+from frozen_index import FrozenSortedIndex
+from sorted_map import SortedMap
+from typing import Callable, TypeVar, Generic, Iterable, List
 from node import AVLTreeNode
 
 K = TypeVar('K')
@@ -17,14 +21,146 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         rotations of Adelson-Velsky and Landis (AVL).
     """
 
-    def __init__(self) -> None:
+    node_type = AVLTreeNode
+
+    def __init__(self, recycle_nodes: bool = False, key: Callable[[I], K] = None, tie_break: bool = False) -> None:
         """
-            Initialises an empty Binary Search Tree
+            Initialises an empty Binary Search Tree. If recycle_nodes is
+            True, nodes unlinked by deletions are kept in a free list and
+            reused by later insertions instead of allocating new ones.
+
+            key is the function add() uses to get the key of an item. If
+            tie_break is True, every key is stored as (key, insertion number),
+            so items with equal keys are all kept, in insertion order; the
+            stored key is what add() returns and what lookups and deletions
+            then expect.
             :complexity: O(1)
         """
 
         BinarySearchTree.__init__(self)
-        self.count = 0
+        self.recycle_nodes = recycle_nodes
+        self.free_nodes = []
+        self.key_function = key
+        self.tie_break = tie_break
+        self.insertions = 0
+
+    def make_key(self, key: K) -> K:
+        """
+            Returns the key a new node is stored under: key itself, or
+            (key, insertion number) if ties are broken.
+            :complexity: O(1)
+        """
+        if self.tie_break:
+            key = (key, self.insertions)
+            self.insertions += 1
+        return key
+
+    def __setitem__(self, key: K, item: I) -> None:
+        self.root = self.insert_aux(self.root, self.make_key(key), item)
+
+    def add(self, item: I) -> K:
+        """
+            Inserts item under the key given by the tree's key function (or
+            under item itself if there is none) and returns the stored key.
+            :complexity: O(log(N))
+            :raises ValueError: if the key is already in the tree and ties
+            are not broken
+        """
+        key = item if self.key_function is None else self.key_function(item)
+        key = self.make_key(key)
+        self.root = self.insert_aux(self.root, key, item)
+        return key
+
+    def new_node(self, key: K, item: I) -> AVLTreeNode:
+        """
+            Returns a fresh node, taken from the free list if there is one.
+            :complexity: O(1)
+        """
+        if len(self.free_nodes) > 0:
+            node = self.free_nodes.pop()
+            node.reset(key, item)
+            return node
+        return self.node_type(key, item)
+
+    def release_node(self, node: AVLTreeNode) -> None:
+        """
+            Called with every node unlinked from the tree. Keeps it in the
+            free list if recycling is on, dropping its references so the old
+            key and item can be garbage collected.
+            :complexity: O(1)
+        """
+        if self.recycle_nodes:
+            node.key = node.item = node.left = node.right = None
+            self.free_nodes.append(node)
+
+    def clear_free_list(self) -> None:
+        """
+            Drops all the nodes kept for recycling.
+            :complexity: O(1)
+        """
+        self.free_nodes = []
+
+    @classmethod
+    def from_sorted(cls, pairs: Iterable[tuple[K, I]], **tree_options) -> AVLTree[K, I]:
+        """
+            Builds a perfectly balanced tree from (key, item) pairs already
+            sorted by key, without any comparisons between nodes or rotations.
+            tree_options are passed on to the constructor.
+            :complexity: O(N)
+            :raises ValueError: if the keys are not in increasing order
+        """
+        tree = cls(**tree_options)
+        entries = tree.group_sorted(pairs)
+        tree.root = tree.build_balanced(entries, 0, len(entries))
+        tree.length = len(entries)
+        return tree
+
+    @classmethod
+    def from_items(cls, pairs: Iterable[tuple[K, I]], **tree_options) -> AVLTree[K, I]:
+        """
+            Sorts (key, item) pairs by key and then bulk-loads them with
+            from_sorted. Items with equal keys keep their relative order.
+            :complexity: O(N * log(N)) for the sort, O(N) for the build
+            :raises ValueError: if two keys are equal and ties are not
+            broken (see group_sorted)
+        """
+        return cls.from_sorted(sorted(pairs, key=lambda pair: pair[0]), **tree_options)
+
+    def group_sorted(self, pairs: Iterable[tuple[K, I]]) -> list:
+        """
+            Turns sorted (key, item) pairs into the (key, item) list of the
+            nodes to build. Keys are unique in an AVLTree; if ties are
+            broken, every key goes through make_key first, so equal keys
+            become increasing (key, insertion number) pairs.
+            :complexity: O(N)
+            :raises ValueError: if a key is not larger than the previous one
+        """
+        if self.tie_break:
+            entries = [(self.make_key(key), item) for key, item in pairs]
+        else:
+            entries = list(pairs)
+        for i in range(1, len(entries)):
+            if not entries[i - 1][0] < entries[i][0]:
+                if entries[i - 1][0] == entries[i][0]:
+                    raise ValueError('Inserting duplicate item')
+                raise ValueError('Keys are not sorted: {0}'.format(entries[i][0]))
+        return entries
+
+    def build_balanced(self, entries: list, lo: int, hi: int) -> AVLTreeNode:
+        """
+            Builds the sub-tree for entries[lo:hi] around its middle entry.
+            returns the root of the subtree.
+            :complexity: O(hi - lo)
+        """
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        key, item = entries[mid]
+        current = self.new_node(key, item)
+        current.left = self.build_balanced(entries, lo, mid)
+        current.right = self.build_balanced(entries, mid + 1, hi)
+        self.update_height_and_size(current)
+        return current
 
     def get_height(self, current: AVLTreeNode) -> int:
         """
@@ -48,81 +184,246 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             return 0
         return self.get_height(current.right) - self.get_height(current.left)
 
-    def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
+
+    def update_height_and_size(self, current: AVLTreeNode) -> None:
         """
-            Attempts to insert an item into the tree, it uses the Key to insert it
-            best and worst case: O(log(N)), N is the number of nodes in the tree
+            Recompute the height and size of a node from those of its children.
+            :complexity: O(1)
         """
-        if current is None:  # base case: at the leaf
-            current = AVLTreeNode(key, item)
-            self.length += 1
-
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-            current.size += 1
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-            current.size += 1
-        else:  # key == current.key
-            raise ValueError('Inserting duplicate item')
-
-        if self.is_leaf(current):
-            pass
-        elif current.left is None:
-            current.height = 1 + self.get_height(current.right) #current.right.height
-        elif current.right is None:
-            current.height = 1 + self.get_height(current.left)
+        left = current.left
+        right = current.right
+        if left is None:
+            if right is None:
+                current.height = 1
+                current.size = 1
+            else:
+                current.height = 1 + right.height
+                current.size = 1 + right.size
+        elif right is None:
+            current.height = 1 + left.height
+            current.size = 1 + left.size
         else:
-            current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
+            current.height = 1 + (left.height if left.height > right.height else right.height)
+            current.size = 1 + left.size + right.size
 
-        current = self.rebalance(current)
-        return current
+    def insert_duplicate(self, current: AVLTreeNode, item: I) -> None:
+        """
+            Called by insert_aux when the key being inserted is already in the
+            tree at node current. Keys are unique in an AVLTree.
+            :raises ValueError: always
+        """
+        raise ValueError('Inserting duplicate item')
+
+    def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
+        """
+            Attempts to insert an item into the tree, it uses the Key to insert it.
+            Walks down from current remembering the path, then walks back up
+            fixing sizes, heights and balance. Once a subtree is as high as it
+            was before the insertion, the nodes above it only need their size
+            fixed.
+            returns the new root of the subtree.
+            best and worst case: O(log(N)), N is the number of nodes in the tree
+        """
+        path = []       # (node, whether we went left from it)
+        node = current
+        while node is not None:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            elif key > node.key:
+                path.append((node, False))
+                node = node.right
+            else:  # key == node.key
+                self.insert_duplicate(node, item)
+                return current
+
+        subtree = self.new_node(key, item)
+        self.length += 1
+        return self.retrace(path, subtree, 1)
 
     def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
         """
             Attempts to delete an item from the tree, it uses the Key to
-            determine the node to delete.
-            worst case: O(D * D), D is the depth of the tree
-            best case: O(D), when successor is None
+            determine the node to delete. Walks down from current remembering
+            the path, then unlinks the node as in unlink.
+            returns the new root of the subtree.
+            best and worst case: O(log(N)), N is the number of nodes in the tree
         """
-
-        if current is None:  # key not found
+        path, node = self.find_path(current, key)
+        if node is None:  # key not found
             raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-            current.size -= 1
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-            current.size -= 1
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)      # O(D)
-            current.key  = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
-
-        if self.is_leaf(current):
-            pass
-        elif current.left is None:
-            current.height = 1 + self.get_height(current.right)
-        elif current.right is None:
-            current.height = 1 + self.get_height(current.left)
+        return self.unlink(path, node)
+
+    def find_path(self, current: AVLTreeNode, key: K) -> tuple[list, AVLTreeNode]:
+        """
+            Walks down from current towards key. Returns the path taken, as
+            (node, whether we went left from it) pairs, and the node holding
+            key (None if key is not in the subtree).
+            :complexity: O(log(N))
+        """
+        path = []
+        node = current
+        while node is not None and key != node.key:
+            went_left = key < node.key
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        return path, node
+
+    def extreme_path(self, largest: bool) -> tuple[list, AVLTreeNode]:
+        """
+            Same as find_path, but walks down to the node with the largest
+            (or smallest) key.
+            :complexity: O(log(N))
+            :raises IndexError: if the tree is empty
+        """
+        if self.root is None:
+            raise IndexError('pop from an empty tree')
+        path = []
+        node = self.root
+        child = node.right if largest else node.left
+        while child is not None:
+            path.append((node, not largest))
+            node = child
+            child = node.right if largest else node.left
+        return path, node
+
+    def unlink(self, path: list, node: AVLTreeNode) -> AVLTreeNode:
+        """
+            Removes node, found at the end of path, from the tree. If it has
+            two children, it takes the key and item of its successor and the
+            successor is unlinked instead. Then walks back up as in
+            insert_aux.
+            returns the new root of the subtree the path starts at.
+            :complexity: O(log(N))
+        """
+        if node.left is not None and node.right is not None:
+            # general case => replace by the successor and unlink that instead
+            path.append((node, False))
+            succ = node.right
+            while succ.left is not None:
+                path.append((succ, True))
+                succ = succ.left
+            node.key = succ.key
+            node.item = succ.item
+            node = succ
+
+        self.length -= 1
+        subtree = node.left if node.left is not None else node.right
+        self.release_node(node)
+        return self.retrace(path, subtree, -1)
+
+    def pop_max(self) -> tuple[K, I]:
+        """
+            Removes and returns the (key, item) pair with the largest key,
+            with a single walk down the right spine and back up.
+            :complexity: O(log(N))
+            :raises IndexError: if the tree is empty
+        """
+        return self.pop_extreme(True)
+
+    def pop_min(self) -> tuple[K, I]:
+        """
+            Removes and returns the (key, item) pair with the smallest key.
+            :complexity: O(log(N))
+            :raises IndexError: if the tree is empty
+        """
+        return self.pop_extreme(False)
+
+    def pop_extreme(self, largest: bool) -> tuple[K, I]:
+        path, node = self.extreme_path(largest)
+        key, item = node.key, node.item
+        self.root = self.unlink(path, node)
+        return (key, item)
+
+    def fits(self, path: list, node: AVLTreeNode, key: K) -> bool:
+        """
+            Checks whether node, found at the end of path, could hold key
+            instead of its own key without breaking the search order, i.e.
+            whether key lies strictly between the keys of its in-order
+            predecessor and successor (or is node's own key).
+            :complexity: O(log(N))
+        """
+        if key == node.key:
+            return True
+        lower = upper = None
+        for parent, went_left in path:
+            if went_left:
+                upper = parent
+            else:
+                lower = parent
+        if node.left is not None:
+            lower = self.get_maximum(node.left)
+        if node.right is not None:
+            upper = self.get_minimal(node.right)
+        return (lower is None or lower.key < key) and (upper is None or key < upper.key)
+
+    def refresh_path(self, path: list, node: AVLTreeNode) -> None:
+        """
+            Called after the key or item of node, found at the end of path,
+            is changed in place. Heights and sizes do not depend on them, so
+            there is nothing to do here.
+            :complexity: O(1)
+        """
+        pass
+
+    def rekey(self, old_key: K, item: I, new_key: K) -> K:
+        """
+            Moves item from old_key to new_key and returns the stored key
+            (new_key, or (new_key, insertion number) if ties are broken).
+            If the new key still sorts between the neighbours of old_key's
+            node, the node is just renamed in place, with no unlinking,
+            rotations or allocation; otherwise it is an insertion followed
+            by a deletion.
+            :complexity: O(log(N))
+            :raises KeyError: if old_key is not in the tree
+            :raises ValueError: if new_key is already in the tree
+        """
+        path, node = self.find_path(self.root, old_key)
+        if node is None:
+            raise KeyError('Key not found: {0}'.format(old_key))
+        new_key = self.make_key(new_key)
+        if self.fits(path, node, new_key):
+            node.key = new_key
+            node.item = item
+            self.refresh_path(path, node)
+        else:   # insert first, so a duplicate new_key leaves the tree unchanged
+            self.root = self.insert_aux(self.root, new_key, item)
+            self.root = self.delete_aux(self.root, old_key)
+        return new_key
+
+    def retrace(self, path: list, subtree: AVLTreeNode, change: int) -> AVLTreeNode:
+        """
+            Hangs subtree below the last node of path and walks back up the
+            path, adding change (+1 or -1) to every size and rebalancing
+            until heights stop changing.
+            returns the new root of the subtree the path starts at.
+            :complexity: O(len(path))
+        """
+        i = len(path) - 1
+        while i >= 0:
+            node, went_left = path[i]
+            if went_left:
+                node.left = subtree
+            else:
+                node.right = subtree
+            old_height = node.height
+            self.update_height_and_size(node)
+            subtree = self.rebalance(node)
+            i -= 1
+            if subtree.height == old_height:
+                break
+
+        if i < 0:
+            return subtree
+        parent, went_left = path[i]
+        if went_left:
+            parent.left = subtree
         else:
-            current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
-        
-        
-        current = self.rebalance(current)
-        return current
+            parent.right = subtree
+        while i >= 0:       # heights are unchanged from here up, only sizes
+            path[i][0].size += change
+            i -= 1
+        return path[0][0]
 
     def left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
         """
@@ -142,38 +443,12 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         """
 
         child = current.right
-        
-        current.right = child.left     
-        child.left = current
-
-        
-        if self.is_leaf(current):
-            current.height = 1
-            current.size = 1
-        elif current.left is None:
-            current.height = 1 + self.get_height(current.right)
-            current.size = 1 + current.right.size
-        elif current.right is None:
-            current.height = 1 + self.get_height(current.left)
-            current.size = 1 + current.left.size
-        else:
-            current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
-            current.size = current.left.size + current.right.size + 1
-
-        if self.is_leaf(child):
-            child.height = 1
-            child.size = 1
-        elif child.left is None:
-            child.height = 1 + self.get_height(child.right)
-            child.size = 1 + child.right.size
-        elif child.right is None:
-            child.height = 1 + self.get_height(child.left)
-            child.size = 1 + child.left.size
-        else:
-            child.height = 1 + max(self.get_height(child.left), self.get_height(child.right))
-            child.size = child.left.size + child.right.size + 1
 
+        current.right = child.left
+        child.left = current
 
+        self.update_height_and_size(current)
+        self.update_height_and_size(child)
         return child
 
     def right_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
@@ -194,37 +469,12 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         """
 
         child = current.left
-        
+
         current.left = child.right     # do current.left is equal to centre
         child.right = current
-        
-        #Only do this if current.left and current.right is not None
-        if self.is_leaf(current):
-            current.height = 1
-            current.size = 1
-        elif current.left is None:
-            current.height = 1 + self.get_height(current.right)
-            current.size = 1 + current.right.size
-        elif current.right is None:
-            current.height = 1 + self.get_height(current.left)
-            current.size = 1 + current.left.size
-        else:
-            current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
-            current.size = current.left.size + current.right.size + 1
-
-        if self.is_leaf(child):
-            child.height = 1
-            child.size = 1
-        elif child.left is None:
-            child.height = 1 + self.get_height(child.right)
-            child.size = 1 + child.right.size
-        elif child.right is None:
-            child.height = 1 + self.get_height(child.left)
-            child.size = 1 + child.left.size
-        else:
-            child.height = 1 + max(self.get_height(child.left), self.get_height(child.right))
-            child.size = child.left.size + child.right.size + 1
 
+        self.update_height_and_size(current)
+        self.update_height_and_size(child)
         return child
 
 
@@ -252,373 +502,407 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         return current
 
-    def range_between(self, i: int, j: int) -> List:
+    def get_size(self, current: AVLTreeNode) -> int:
         """
-        Returns a sorted list of all elements in the tree between the ith and jth indices, inclusive.
-        
-        :worst case complexity O(j - i + log(N))
-        best case: O(log(N))
+            Get the number of nodes in the sub-tree of a node (0 for None).
+            :complexity: O(1)
         """
-        return self.range_between_aux(self.root, i, j, [], j-i)
-    
-    def range_between_aux(self, current: AVLTreeNode, i, j, elements: list[K], difference):
-        '''
-        Recursive function for finding the nodes from range_between function. 
-        This uses the idea of giving each node a size variable which is the size of all childern nodes + 1(the node itself).
-        :complexity O(j - i + log(N))
-        best case: O(log(N))
-        '''
-        self.count = 0
-        if current is None:
-            return elements
-        
-        if current.left is None:
-            a = 0
-        else:
-            a = current.left.size
-
-        if i == a + 1:
-            if self.count <= difference:
-                if current.right is not None:
-                    self.inorder_aux(current.right, elements, difference)
-                    return elements
-                else:
-                    return elements
-
-        
-        if i < a + 1:
-            self.range_between_aux(current.left, i, j, elements, difference)
-            if self.count <= difference:
-                elements.append(current.item)
-                self.count += 1
-            if self.count <= difference:
-                if current.right is not None:
-                    self.inorder_aux(current.right, elements, difference)
-                    return elements
-                else:
-                    return elements
-
-        if i > a + 1:
-            self.range_between_aux(current.right, i - a - 1, j, elements, difference)
-            return elements
-
-        return elements
+        if current is not None:
+            return current.size
+        return 0
 
+    def select(self, k: int) -> AVLTreeNode:
+        """
+            Returns the node with the k-th smallest key, counting from 0
+            (the same indexing as range_between).
+            :complexity: O(log(N))
+            :raises IndexError: if k is not in between 0 and len(self) - 1
+        """
+        if k < 0 or k >= self.get_size(self.root):
+            raise IndexError('Index out of range: {0}'.format(k))
+        current = self.root
+        while True:
+            left_size = self.get_size(current.left)
+            if k < left_size:
+                current = current.left
+            elif k == left_size:
+                return current
+            else:
+                k -= left_size + 1
+                current = current.right
 
-    def inorder_aux(self, current, elements, difference) -> None:
+    def rank(self, key: K) -> int:
         """
-        Actual in-order traversal of the tree
-        :complexity: O(N) where N is number of nodes in the tree
+            Returns the number of keys in the tree smaller than key, i.e. the
+            index select() would give key (key does not need to be present).
+            :complexity: O(log(N))
         """
-        if current is not None and self.count <= difference:  # if not a base case
-            self.inorder_aux(current.left, elements, difference)
-            if self.count <= difference:
-                elements.append(current.item)
-                self.count += 1
-            self.inorder_aux(current.right, elements, difference)
-        
-
-
-class AVLTreeCave(BinarySearchTree, Generic[K, I]):
-    """ Self-balancing binary search tree using rebalancing by sub-tree
-        rotations of Adelson-Velsky and Landis (AVL).
-    """
+        count = 0
+        current = self.root
+        while current is not None:
+            if key <= current.key:
+                current = current.left
+            else:
+                count += self.get_size(current.left) + 1
+                current = current.right
+        return count
 
-    def __init__(self) -> None:
+    def count_at_most(self, key: K) -> int:
         """
-            Initialises an empty Binary Search Tree
-            :complexity: O(1)
+            Returns the number of keys in the tree smaller than or equal to key.
+            :complexity: O(log(N))
         """
+        count = 0
+        current = self.root
+        while current is not None:
+            if key < current.key:
+                current = current.left
+            else:
+                count += self.get_size(current.left) + 1
+                current = current.right
+        return count
 
-        BinarySearchTree.__init__(self)
-        self.count = 0
-
-    def get_height(self, current: AVLTreeNode) -> int:
+    def count_between(self, lo_key: K, hi_key: K) -> int:
         """
-            Get the height of a node. Return current.height if current is
-            not None. Otherwise, return 0.
-            :complexity: O(1)
+            Returns the number of keys k in the tree with lo_key <= k <= hi_key.
+            :complexity: O(log(N))
         """
-
-        if current is not None:
-            return current.height
-        return 0
-
-    def get_balance(self, current: AVLTreeNode) -> int:
+        if hi_key < lo_key:
+            return 0
+        return self.count_at_most(hi_key) - self.rank(lo_key)
+
+    def join_nodes(self, left: AVLTreeNode, middle: AVLTreeNode, right: AVLTreeNode) -> AVLTreeNode:
+        """
+            Joins two AVL sub-trees and a middle node, all keys of left being
+            smaller than middle's and all keys of right larger, descending
+            the spine of the higher sub-tree until the heights are close.
+            returns the root of the joined sub-tree.
+            :complexity: O(|height(left) - height(right)| + 1)
+        """
+        left_height = self.get_height(left)
+        right_height = self.get_height(right)
+        if left_height > right_height + 1:
+            left.right = self.join_nodes(left.right, middle, right)
+            self.update_height_and_size(left)
+            return self.rebalance(left)
+        if right_height > left_height + 1:
+            right.left = self.join_nodes(left, middle, right.left)
+            self.update_height_and_size(right)
+            return self.rebalance(right)
+        middle.left = left
+        middle.right = right
+        self.update_height_and_size(middle)
+        return middle
+
+    def join_two(self, left: AVLTreeNode, right: AVLTreeNode) -> AVLTreeNode:
+        """
+            Joins two AVL sub-trees, all keys of left smaller than those of
+            right, using the largest node of left as the middle node.
+            :complexity: O(log(N))
+        """
+        if left is None:
+            return right
+        left, last = self.split_last(left)
+        return self.join_nodes(left, last, right)
+
+    def split_last(self, current: AVLTreeNode) -> tuple[AVLTreeNode, AVLTreeNode]:
+        """
+            Unlinks the node with the largest key of a sub-tree.
+            returns the remaining sub-tree and that node.
+            :complexity: O(log(N))
+        """
+        if current.right is None:
+            return (current.left, current)
+        rest, last = self.split_last(current.right)
+        return (self.join_nodes(current.left, current, rest), last)
+
+    def split_nodes(self, current: AVLTreeNode, key: K) -> tuple[AVLTreeNode, AVLTreeNode, AVLTreeNode]:
+        """
+            Splits a sub-tree into the nodes with keys smaller than key, the
+            node with key (None if there is none) and the nodes with larger
+            keys. The nodes are reused, so current is consumed.
+            :complexity: O(log(N))
         """
-            Compute the balance factor for the current sub-tree as the value
-            (right.height - left.height). If current is None, return 0.
+        if current is None:
+            return (None, None, None)
+        if key < current.key:
+            left, found, right = self.split_nodes(current.left, key)
+            return (left, found, self.join_nodes(right, current, current.right))
+        if key > current.key:
+            left, found, right = self.split_nodes(current.right, key)
+            return (self.join_nodes(current.left, current, left), found, right)
+        return (current.left, current, current.right)
+
+    def with_root(self, root: AVLTreeNode) -> AVLTree[K, I]:
+        """ Wraps a root into a tree with the same options as this one. """
+        tree = type(self).__new__(type(self))
+        tree.__dict__.update(self.__dict__)
+        tree.free_nodes = []
+        tree.set_root(root)
+        return tree
+
+    def set_root(self, root: AVLTreeNode) -> None:
+        """ Replaces the whole tree by the one rooted at root. """
+        self.root = root
+        self.length = self.get_size(root)
+
+    def split(self, key: K) -> tuple[AVLTree[K, I], AVLTree[K, I]]:
+        """
+            Splits the tree into a tree with the keys smaller than key and a
+            tree with the keys larger than or equal to key. The nodes are
+            moved into the two new trees, so this tree is left empty.
+            :complexity: O(log(N))
+        """
+        left, found, right = self.split_nodes(self.root, key)
+        if found is not None:
+            right = self.join_nodes(None, found, right)
+        result = (self.with_root(left), self.with_root(right))
+        self.set_root(None)
+        return result
+
+    @classmethod
+    def join(cls, left: AVLTree[K, I], right: AVLTree[K, I]) -> AVLTree[K, I]:
+        """
+            Returns the tree with the keys of both trees, all keys of left
+            being smaller than those of right. The nodes are moved into the
+            new tree, so left and right are left empty.
+            :complexity: O(log(N))
+            :raises ValueError: if a key of left is not smaller than all keys of right
+        """
+        if left.root is not None and right.root is not None and \
+                not left.get_maximum(left.root).key < right.get_minimal(right.root).key:
+            raise ValueError('Keys of left should be smaller than keys of right')
+        result = left.with_root(left.join_two(left.root, right.root))
+        left.set_root(None)
+        right.set_root(None)
+        return result
+
+    def merge_duplicate(self, kept: AVLTreeNode, dropped: AVLTreeNode) -> None:
+        """
+            Called by union for a key in both trees, kept being this tree's
+            node. The item of this tree wins in an AVLTree.
             :complexity: O(1)
         """
+        pass
 
-        if current is None:
-            return 0
-        return self.get_height(current.right) - self.get_height(current.left)
-
-    def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
+    def union(self, other: AVLTree[K, I]) -> None:
         """
-            Attempts to insert an item into the tree, it uses the Key to insert it
-            best and worst case: O(log(N)), N is the number of nodes in the tree
+            Adds all the keys of other to this tree, in place (the item of
+            this tree is kept for keys in both). The nodes of other are
+            moved, so other is left empty.
+            :complexity: O(m * log(n/m + 1)), m <= n being the sizes of the trees
         """
-        if current is None:  # base case: at the leaf
-            current = AVLTreeNode(key, item)
-            self.length += 1
-
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-            current.size += 1
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-            current.size += 1
-        else:  # key == current.key
-            temp_lst =[]        # if they have same mining rate, adds it to a list
-            if type(current.item) != list:
-                temp_lst.append(current.item)
-            else:
-                for i in current.item:
-                    temp_lst.append(i)
-            temp_lst.append(item)
-            current.item = temp_lst
-
-        if self.is_leaf(current):
-            pass
-        elif current.left is None:
-            current.height = 1 + self.get_height(current.right) #current.right.height
-        elif current.right is None:
-            current.height = 1 + self.get_height(current.left)
-        else:
-            current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
+        root = self.union_aux(self.root, other.root)
+        self.set_root(root)
+        other.set_root(None)
 
-        current = self.rebalance(current)
-        return current
+    def union_aux(self, current: AVLTreeNode, other: AVLTreeNode) -> AVLTreeNode:
+        if current is None:
+            return other
+        if other is None:
+            return current
+        other_left, found, other_right = self.split_nodes(other, current.key)
+        if found is not None:
+            self.merge_duplicate(current, found)
+            self.release_node(found)
+        left = self.union_aux(current.left, other_left)
+        right = self.union_aux(current.right, other_right)
+        return self.join_nodes(left, current, right)
+
+    def difference(self, other: AVLTree[K, I]) -> None:
+        """
+            Removes all the keys of other from this tree, in place. other is
+            not changed.
+            :complexity: O(m * log(n/m + 1)), m <= n being the sizes of the trees
+        """
+        self.set_root(self.difference_aux(self.root, other.root))
+
+    def difference_aux(self, current: AVLTreeNode, other: AVLTreeNode) -> AVLTreeNode:
+        if current is None or other is None:
+            return current
+        left, found, right = self.split_nodes(current, other.key)
+        if found is not None:
+            self.release_node(found)
+        left = self.difference_aux(left, other.left)
+        right = self.difference_aux(right, other.right)
+        return self.join_two(left, right)
 
-    def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
-        """
-            Attempts to delete an item from the tree, it uses the Key to
-            determine the node to delete.
-            worst case: O(D * D), D is the depth of the tree
-            best case: O(D), when successor is None
+    def range_between(self, i: int, j: int) -> List:
         """
-
-        if current is None:  # key not found
-            raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-            current.size -= 1
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-            current.size -= 1
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
-            current.key  = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
-
-        if self.is_leaf(current):
-            pass
-        elif current.left is None:
-            current.height = 1 + self.get_height(current.right)
-        elif current.right is None:
-            current.height = 1 + self.get_height(current.left)
-        else:
-            current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
-        
-        
-        current = self.rebalance(current)
-        return current
-
-    def left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
+        Returns a sorted list of all elements in the tree between the ith and jth indices, inclusive.
+        Walks the tree with Morris traversal, so apart from the result no
+        memory is allocated: sub-trees wholly before rank i are skipped
+        using their sizes instead of being threaded, and once rank j is
+        passed the walk only goes on until the threads it made are gone.
+        :worst case complexity O(j - i + log(N)) (up to O(log(N)^2) more to unthread)
+        best case: O(log(N))
         """
-            Perform left rotation of the sub-tree.
-            Right child of the current node, i.e. of the root of the target
-            sub-tree, should become the new root of the sub-tree.
-            returns the new root of the subtree.
-            Example:
+        elements = []
+        count = 0           # rank of the next node in order
+        threads = 0         # threads currently in the tree
+        current = self.root
+        while current is not None:
+            if count > j and threads == 0:
+                break
+            if current.left is None:
+                if i <= count <= j:
+                    elements.append(current.item)
+                count += 1
+                current = current.right
+                continue
+            pred = current.left
+            while pred.right is not None and pred.right is not current:
+                pred = pred.right
+            if pred.right is current:       # back through a thread
+                pred.right = None
+                threads -= 1
+            elif count + current.left.size <= i or count > j:
+                count += current.left.size  # left sub-tree not needed: skip it
+            else:                           # first visit: thread and go left
+                pred.right = current
+                threads += 1
+                current = current.left
+                continue
+            if i <= count <= j:
+                elements.append(current.item)
+            count += 1
+            current = current.right
+        return elements
 
-                 current                                       child
-                /       \                                      /   \
-            l-tree     child           -------->        current     r-tree
-                      /     \                           /     \
-                 center     r-tree                 l-tree     center
+SortedMap.register(AVLTree)
 
-            :complexity: O(1)
-        """
 
-        child = current.right
-        
-        current.right = child.left     # do current.left is equal to centre
-        child.left = current
-        
-        if self.is_leaf(current):
-            current.height = 1
-            current.size = 1
-        elif current.left is None:
-            current.height = 1 + self.get_height(current.right)
-            current.size = 1 + current.right.size
-        elif current.right is None:
-            current.height = 1 + self.get_height(current.left)
-            current.size = 1 + current.left.size
-        else:
-            current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
-            current.size = current.left.size + current.right.size + 1
-
-        if self.is_leaf(child):
-            child.height = 1
-            child.size = 1
-        elif child.left is None:
-            child.height = 1 + self.get_height(child.right)
-            child.size = 1 + child.right.size
-        elif child.right is None:
-            child.height = 1 + self.get_height(child.left)
-            child.size = 1 + child.left.size
-        else:
-            child.height = 1 + max(self.get_height(child.left), self.get_height(child.right))
-            child.size = child.left.size + child.right.size + 1
+class AVLMultiMap(AVLTree, Generic[K, I]):
+    """ AVL tree that allows several items with the same key (e.g., caves
+        with the same mining rate or emerald value).
 
+        The item stored in every node is always a deque (a "bucket") of the
+        items inserted with that key, in insertion order, so adding to a
+        bucket and taking the oldest item out of it are both O(1).
+        len(tree) is the number of distinct keys.
+    """
 
-        return child
-
-    def right_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
+    def __init__(self, recycle_nodes: bool = False, key: Callable[[I], K] = None, tie_break: bool = False) -> None:
         """
-            Perform right rotation of the sub-tree.
-            Left child of the current node, i.e. of the root of the target
-            sub-tree, should become the new root of the sub-tree.
-            returns the new root of the subtree.
-            Example:
-
-                       current                                child
-                      /       \                              /     \
-                  child       r-tree     --------->     l-tree     current
-                 /     \                                           /     \
-            l-tree     center                                 center     r-tree
-
+            Same as AVLTree, except that ties cannot be broken: items with
+            equal keys already share a bucket, in insertion order.
             :complexity: O(1)
+            :raises ValueError: if tie_break is True
         """
+        if tie_break:
+            raise ValueError('AVLMultiMap keeps equal keys in one bucket, ties cannot be broken')
+        AVLTree.__init__(self, recycle_nodes, key)
 
-        child = current.left
-        
-        current.left = child.right     # do current.left is equal to centre
-        child.right = current
-        
-        #Only do this if current.left and current.right is not None
-        if self.is_leaf(current):
-            current.height = 1
-            current.size = 1
-        elif current.left is None:
-            current.height = 1 + self.get_height(current.right)
-            current.size = 1 + current.right.size
-        elif current.right is None:
-            current.height = 1 + self.get_height(current.left)
-            current.size = 1 + current.left.size
-        else:
-            current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
-            current.size = current.left.size + current.right.size + 1
-
-        if self.is_leaf(child):
-            child.height = 1
-            child.size = 1
-        elif child.left is None:
-            child.height = 1 + self.get_height(child.right)
-            child.size = 1 + child.right.size
-        elif child.right is None:
-            child.height = 1 + self.get_height(child.left)
-            child.size = 1 + child.left.size
-        else:
-            child.height = 1 + max(self.get_height(child.left), self.get_height(child.right))
-            child.size = child.left.size + child.right.size + 1
-
-        return child
-
-
-    def rebalance(self, current: AVLTreeNode) -> AVLTreeNode:
-        """ Compute the balance of the current node.
-            Do rebalancing of the sub-tree of this node if necessary.
-            Rebalancing should be done either by:
-            - one left rotate
-            - one right rotate
-            - a combination of left + right rotate
-            - a combination of right + left rotate
-            returns the new root of the subtree.
+    def __setitem__(self, key: K, item: I) -> None:
         """
-        if self.get_balance(current) >= 2:
-            child = current.right
-            if self.get_height(child.left) > self.get_height(child.right):
-                current.right = self.right_rotate(child)
-            return self.left_rotate(current)
-
-        if self.get_balance(current) <= -2:
-            child = current.left
-            if self.get_height(child.right) > self.get_height(child.left):
-                current.left = self.left_rotate(child)
-            return self.right_rotate(current)
-
-        return current
+            Adds item to the bucket of key, creating the bucket if needed.
+            :complexity: O(log(N))
+        """
+        self.root = self.insert_aux(self.root, key, deque((item,)))
 
-    def range_between(self, i: int, j: int) -> List:
+    def add(self, item: I) -> K:
         """
-        Returns a sorted list of all elements in the tree between the ith and jth indices, inclusive.
-        
-        :complexity O(j - i + log(N))
+            Adds item to the bucket of the key given by the tree's key
+            function (or of item itself if there is none) and returns the key.
+            :complexity: O(log(N))
         """
-        return self.range_between_aux(self.root, i, j, [], j-i)
-    
-    def range_between_aux(self, current: AVLTreeNode, i, j, elements: list[K], difference):
-        self.count = 0
-        if current is None:
-            return elements
-        
-        if current.left is None:
-            a = 0
-        else:
-            a = current.left.size
-
-        if i == a + 1:
-            if self.count <= difference:
-                if current.right is not None:
-                    self.inorder_aux(current.right, elements, difference)
-                    return elements
-                else:
-                    return elements
-
-        
-        if i < a + 1:
-            self.range_between_aux(current.left, i, j, elements, difference)
-            if self.count <= difference:
-                elements.append(current.item)
-                self.count += 1
-            if self.count <= difference:
-                if current.right is not None:
-                    self.inorder_aux(current.right, elements, difference)
-                    return elements
-                else:
-                    return elements
-
-        if i > a + 1:
-            self.range_between_aux(current.right, i - a - 1, j, elements, difference)
-            return elements
+        key = item if self.key_function is None else self.key_function(item)
+        self[key] = item
+        return key
 
-        return elements
+    def insert_duplicate(self, current: AVLTreeNode, bucket: deque) -> None:
+        """
+            Adds the (single item) bucket being inserted to the existing
+            bucket of current's key.
+            :complexity: O(1)
+        """
+        current.item.extend(bucket)
 
+    def freeze(self) -> FrozenSortedIndex[K, tuple]:
+        """
+            Same as BinarySearchTree.freeze, except that every bucket is
+            copied into a tuple, so the copy does not share the deques that
+            later changes to the tree add to or pop from.
+            :complexity: O(N + number of items)
+        """
+        return FrozenSortedIndex((key, tuple(bucket)) for key, bucket in self.items())
 
-    def inorder_aux(self, current, elements, difference) -> None:
+    def group_sorted(self, pairs: Iterable[tuple[K, I]]) -> list:
         """
-        Actual in-order traversal of the tree
-        :complexity: O(N) where N is number of nodes in the tree
+            Turns sorted (key, item) pairs into one (key, bucket) entry per
+            distinct key, the items of a bucket in their original order.
+            :complexity: O(N)
+            :raises ValueError: if the keys are not in non-decreasing order
         """
-        if current is not None and self.count <= difference:  # if not a base case
-            self.inorder_aux(current.left, elements, difference)
-            if self.count <= difference:
-                elements.append(current.item)
-                self.count += 1
-            self.inorder_aux(current.right, elements, difference)
\ No newline at end of file
+        entries = []
+        for key, item in pairs:
+            if len(entries) > 0 and key == entries[-1][0]:
+                entries[-1][1].append(item)
+            elif len(entries) > 0 and key < entries[-1][0]:
+                raise ValueError('Keys are not sorted: {0}'.format(key))
+            else:
+                entries.append((key, deque((item,))))
+        return entries
+
+    def merge_duplicate(self, kept: AVLTreeNode, dropped: AVLTreeNode) -> None:
+        """
+            Called by union for a key in both trees: the items of other's
+            bucket go after those of this tree's bucket.
+            :complexity: O(len(dropped.item))
+        """
+        kept.item.extend(dropped.item)
+
+    def pop_extreme(self, largest: bool) -> tuple[K, I]:
+        """
+            Removes and returns the oldest item with the largest (or
+            smallest) key, as a (key, item) pair, deleting the key once its
+            bucket is empty.
+            :complexity: O(log(N))
+            :raises IndexError: if the tree is empty
+        """
+        path, node = self.extreme_path(largest)
+        key = node.key
+        item = node.item.popleft()
+        if len(node.item) == 0:
+            self.root = self.unlink(path, node)
+        return (key, item)
+
+    def rekey(self, old_key: K, item: I, new_key: K) -> K:
+        """
+            Moves item from the bucket of old_key to the end of the bucket
+            of new_key and returns new_key, like AVLTree.rekey. If item was alone in its bucket and new_key still
+            sorts between the neighbouring keys, the node is renamed in place.
+            :complexity: O(log(N)), plus O(bucket) if item is not the oldest
+            item of its bucket
+            :raises KeyError: if old_key is not in the tree
+            :raises ValueError: if item is not in the bucket of old_key
+        """
+        path, node = self.find_path(self.root, old_key)
+        if node is None:
+            raise KeyError('Key not found: {0}'.format(old_key))
+        bucket = node.item
+        if len(bucket) == 1 and bucket[0] is item and self.fits(path, node, new_key):
+            node.key = new_key
+            self.refresh_path(path, node)
+            return new_key
+        if bucket[0] is item:
+            bucket.popleft()
+        else:
+            bucket.remove(item)
+        if len(bucket) == 0:
+            self.root = self.unlink(path, node)
+        self[new_key] = item
+        return new_key
+
+    def popleft(self, key: K) -> I:
+        """
+            Removes and returns the oldest item with the given key, deleting
+            the key once its bucket is empty.
+            :complexity: O(log(N))
+            :raises KeyError: if the key is not in the tree
+        """
+        current = self.get_tree_node_by_key(key)
+        item = current.item.popleft()
+        if len(current.item) == 0:
+            del self[key]
+        return item
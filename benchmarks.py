@@ -0,0 +1,215 @@
+"""
+Micro-benchmarks for the data structures used by the game.
+
+These are not run by the tests. Run the whole file (python benchmarks.py)
+or call a single benchmark from an interpreter; every benchmark prints
+one line per variant with the wall time it took.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import random
+import time
+import tracemalloc
+
+from avl import AVLTree, AVLMultiMap
+from bst import BSTInOrderIterator
+from linked_stack import LinkedStack
+from stack_adt import ArrayStack
+from btree import BTree
+from skip_list import SkipList
+from treap import Treap
+from heap import DaryMaxHeap
+
+
+def timed(label: str, func, *args) -> float:
+    """ Runs func(*args) once and prints how long it took in seconds. """
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print('{0:<40} {1:8.3f}s'.format(label, elapsed))
+    return elapsed
+
+
+def bench_heap_arity(n: int = 10 ** 6, arities: tuple = (2, 4, 8), seed: int = 16) -> None:
+    """ Adds n float priorities to a DaryMaxHeap and then empties it,
+        for each arity.
+    """
+    rng = random.Random(seed)
+    priorities = [rng.random() for _ in range(n)]
+
+    def fill_and_drain(arity: int) -> None:
+        heap = DaryMaxHeap(n, arity)
+        for priority in priorities:
+            heap.add(priority)
+        while len(heap) > 0:
+            heap.get_max()
+
+    for arity in arities:
+        timed('DaryMaxHeap arity={0} n={1}'.format(arity, n), fill_and_drain, arity)
+
+
+def bench_avl_insert_delete(n: int = 10 ** 6, seed: int = 16) -> None:
+    """ Inserts n shuffled keys into an AVLTree, then deletes them all. """
+    rng = random.Random(seed)
+    keys = list(range(n))
+    rng.shuffle(keys)
+    tree = AVLTree()
+
+    def insert_all() -> None:
+        for key in keys:
+            tree[key] = key
+
+    def delete_all() -> None:
+        for key in keys:
+            del tree[key]
+
+    timed('AVLTree insert n={0}'.format(n), insert_all)
+    timed('AVLTree delete n={0}'.format(n), delete_all)
+
+
+def bench_avl_nodes(n: int = 10 ** 6, churn: int = 10 ** 6, seed: int = 16) -> None:
+    """ Reports the memory taken by an n-node AVLTree, then times churn
+        delete/reinsert pairs with and without node recycling.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = AVLTree.from_sorted((key, None) for key in range(n))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('{0:<40} {1:8.1f} bytes/node'.format('AVLTree n={0}'.format(n), (after - before) / n))
+    del tree
+
+    rng = random.Random(seed)
+    keys = [rng.randrange(n) for _ in range(churn)]
+    for recycle_nodes in (False, True):
+        tree = AVLTree.from_sorted(((key, None) for key in range(n)), recycle_nodes=recycle_nodes)
+
+        def delete_reinsert() -> None:
+            for key in keys:
+                del tree[key]
+                tree[key] = None
+
+        timed('AVLTree churn recycle_nodes={0}'.format(recycle_nodes), delete_reinsert)
+
+
+def bench_full_scan(n: int = 10 ** 6) -> None:
+    """ Scans an n-node AVLTree in order with the stack-based and the
+        threaded (Morris) iterator, printing the time and the peak memory
+        allocated by each scan.
+    """
+    tree = AVLTree.from_sorted((key, None) for key in range(n))
+    for label, make in (('stack', tree.__iter__), ('threaded', tree.threaded_iter)):
+        tracemalloc.start()
+        timed('AVLTree {0} scan n={1}'.format(label, n), lambda: sum(1 for _ in make()))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print('{0:<40} {1:8d} bytes peak'.format('AVLTree {0} scan n={1}'.format(label, n), peak))
+
+
+def bench_stacks(n: int = 10 ** 6, batch: int = 64) -> None:
+    """ Compares LinkedStack and ArrayStack: an in-order scan of an n-node
+        AVLTree (one push and one pop per node), n single pushes and pops,
+        and ArrayStack's push_many/pop_many in batches.
+    """
+    tree = AVLTree.from_sorted((key, None) for key in range(n))
+    items = list(range(batch))
+    for stack_type in (LinkedStack, ArrayStack):
+        name = stack_type.__name__
+        timed('{0} tree scan n={1}'.format(name, n),
+              lambda: sum(1 for _ in BSTInOrderIterator(tree.root, stack_type=stack_type)))
+
+        def push_pop() -> None:
+            stack = stack_type()
+            for i in range(n):
+                stack.push(i)
+            while not stack.is_empty():
+                stack.pop()
+
+        timed('{0} push/pop n={1}'.format(name, n), push_pop)
+
+    def push_pop_many() -> None:
+        stack = ArrayStack()
+        for _ in range(n // batch):
+            stack.push_many(items)
+        while not stack.is_empty():
+            stack.pop_many(batch)
+
+    timed('ArrayStack push_many/pop_many n={0}'.format(n), push_pop_many)
+
+
+def bench_multimap_serve(n: int = 10 ** 5, rounds: int = 10 ** 6, seed: int = 16) -> None:
+    """ Serves rounds players the way MultiplayerGame.select_for_players
+        does: take the largest key's oldest item and put it back under a
+        slightly smaller key, with popleft + insert and with rekey.
+    """
+    rng = random.Random(seed)
+    pairs = [(rng.random(), key) for key in range(n)]
+
+    def pop_and_insert() -> None:
+        tree = AVLMultiMap.from_items(pairs, recycle_nodes=True)
+        for _ in range(rounds):
+            key = tree.get_maximum(tree.root).key
+            item = tree.popleft(key)
+            tree[key * 0.999] = item
+
+    def rekey() -> None:
+        tree = AVLMultiMap.from_items(pairs, recycle_nodes=True)
+        for _ in range(rounds):
+            node = tree.get_maximum(tree.root)
+            tree.rekey(node.key, node.item[0], node.key * 0.999)
+
+    timed('AVLMultiMap popleft+insert n={0}'.format(n), pop_and_insert)
+    timed('AVLMultiMap rekey n={0}'.format(n), rekey)
+
+
+def bench_sorted_maps(n: int = 10 ** 5, seed: int = 16) -> dict:
+    """ Times every SortedMap backend on three workloads (building by
+        random insertions, n random lookups, and n/10 range_between calls
+        of ~50 items) and prints and returns the fastest per workload.
+    """
+    rng = random.Random(seed)
+    keys = [rng.random() for _ in range(n)]
+    lookups = [rng.choice(keys) for _ in range(n)]
+    ranges = [rng.randrange(n - 50) for _ in range(n // 10)]
+    backends = {
+        'AVLTree': AVLTree,
+        'Treap': lambda: Treap(seed + 1),      # not seed: priorities equal to the keys would make a path
+        'SkipList': lambda: SkipList(seed + 1),
+        'BTree(32)': lambda: BTree(32),
+    }
+    best = {}
+    for workload in ('insert', 'read', 'range'):
+        timings = {}
+        for name, make in backends.items():
+            sorted_map = make()
+            if workload != 'insert':
+                for key in keys:
+                    sorted_map[key] = key
+
+            def run() -> None:
+                if workload == 'insert':
+                    for key in keys:
+                        sorted_map[key] = key
+                elif workload == 'read':
+                    for key in lookups:
+                        sorted_map[key]
+                else:
+                    for i in ranges:
+                        sorted_map.range_between(i, i + 49)
+
+            timings[name] = timed('{0} {1} n={2}'.format(name, workload, n), run)
+        best[workload] = min(timings, key=timings.get)
+        print('fastest for {0}: {1}'.format(workload, best[workload]))
+    return best
+
+
+if __name__ == '__main__':
+    bench_heap_arity()
+    bench_avl_insert_delete()
+    bench_avl_nodes()
+    bench_full_scan()
+    bench_stacks()
+    bench_multimap_serve()
+    bench_sorted_maps()
@@ -8,9 +8,11 @@ from __future__ import annotations
 __author__ = 'Brendon Taylor, modified by Alexey Ignatiev, further modified by Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterator
 from linked_stack import LinkedStack
+from stack_adt import Stack
 from node import TreeNode
+from frozen_index import FrozenSortedIndex
 import sys
 
 
@@ -22,14 +24,26 @@ T = TypeVar('T')
 
 class BSTInOrderIterator:
     """ In-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+        Performs stack-based BST traversal, or, if threaded is True, Morris
+        traversal: the left sub-tree of a node is walked after linking its
+        last node back to the node ("threading" an empty right pointer),
+        and the link is removed on the way back. A threaded walk allocates
+        nothing per step and uses O(1) extra memory, but while it is in
+        progress the tree holds those temporary links, so the tree must not
+        be read or changed by anything else (another iterator included)
+        until the iterator is exhausted or closed.
     """
 
-    def __init__(self, root: TreeNode[K, I]) -> None:
-        """ Iterator initialiser. """
+    def __init__(self, root: TreeNode[K, I], threaded: bool = False, stack_type: type[Stack] = LinkedStack) -> None:
+        """ Iterator initialiser. stack_type is the Stack implementation
+            used by the stack-based traversal (e.g., LinkedStack or
+            ArrayStack), created with no arguments.
+        """
 
-        self.stack = LinkedStack()
+        self.stack = None if threaded else stack_type()
         self.current = root
+        self.threaded = threaded
+        self.threads = 0    # threads currently in the tree
 
     def __iter__(self) -> BSTInOrderIterator:
         """ Standard __iter__() method for initialisers. Returns itself. """
@@ -40,6 +54,8 @@ class BSTInOrderIterator:
         """ The main body of the iterator.
             Returns keys of the BST one by one respecting the in-order.
         """
+        if self.threaded:
+            return self.next_threaded().key
 
         while self.current:
             self.stack.push(self.current)
@@ -53,6 +69,47 @@ class BSTInOrderIterator:
 
         return result.key
 
+    def next_threaded(self) -> TreeNode[K, I]:
+        """ One step of Morris traversal, returns the next node.
+            :complexity: O(1) amortised, O(N) for the whole walk
+        """
+        current = self.current
+        while current is not None:
+            if current.left is None:
+                self.current = current.right
+                return current
+            pred = current.left
+            while pred.right is not None and pred.right is not current:
+                pred = pred.right
+            if pred.right is None:      # first visit: thread and go left
+                pred.right = current
+                self.threads += 1
+                current = current.left
+            else:                       # back through the thread: unthread
+                pred.right = None
+                self.threads -= 1
+                self.current = current.right
+                return current
+        self.current = None
+        raise StopIteration
+
+    def close(self) -> None:
+        """ Stops the iteration. A threaded walk with threads still in the
+            tree is run on (without returning anything) until the last of
+            them is removed.
+            :complexity: O(N) for a threaded walk, O(1) if it holds no threads
+        """
+        while self.threads > 0:
+            self.next_threaded()
+        self.current = None
+
+    def __del__(self) -> None:
+        """ Restores the tree if a threaded walk is abandoned (e.g. by a
+            break out of a for loop).
+        """
+        if self.threads > 0:
+            self.close()
+
 
 class BinarySearchTree(Generic[K, I]):
     """ Basic binary search tree. """
@@ -94,6 +151,102 @@ class BinarySearchTree(Generic[K, I]):
         """ Create an in-order iterator. """
         return BSTInOrderIterator(self.root)
 
+    def threaded_iter(self) -> BSTInOrderIterator:
+        """ Create an in-order iterator using Morris traversal, O(1) extra
+            memory (see BSTInOrderIterator for its restrictions).
+        """
+        return BSTInOrderIterator(self.root, threaded=True)
+
+    def items(self) -> Iterator[tuple[K, I]]:
+        """ Lazily yields the (key, item) pairs of the tree in key order. """
+        for node in self.walk_nodes():
+            yield (node.key, node.item)
+
+    def values(self) -> Iterator[I]:
+        """ Lazily yields the items of the tree in key order. """
+        for node in self.walk_nodes():
+            yield node.item
+
+    def reversed(self) -> Iterator[K]:
+        """ Lazily yields the keys of the tree from largest to smallest. """
+        for node in self.walk_nodes(reverse=True):
+            yield node.key
+
+    def __reversed__(self) -> Iterator[K]:
+        return self.reversed()
+
+    def irange(self, lo: K = None, hi: K = None, inclusive: tuple[bool, bool] = (True, True), reverse: bool = False) -> Iterator[K]:
+        """
+            Lazily yields the keys in between lo and hi (None meaning no
+            bound), in key order or reversed. inclusive says whether lo and
+            hi themselves are included.
+            :complexity: O(D + k) in total, k being the number of keys yielded
+        """
+        for node in self.walk_nodes(lo, hi, inclusive, reverse):
+            yield node.key
+
+    def irange_items(self, lo: K = None, hi: K = None, inclusive: tuple[bool, bool] = (True, True), reverse: bool = False) -> Iterator[tuple[K, I]]:
+        """ Same as irange, but yields (key, item) pairs. """
+        for node in self.walk_nodes(lo, hi, inclusive, reverse):
+            yield (node.key, node.item)
+
+    def freeze(self) -> FrozenSortedIndex[K, I]:
+        """
+            Returns a read-only copy of the tree as sorted arrays, for when
+            the tree will only be read from now on (the tree itself is left
+            unchanged, later changes to it are not seen by the copy).
+            :complexity: O(N)
+        """
+        return FrozenSortedIndex(self.items())
+
+    def walk_nodes(self, lo: K = None, hi: K = None, inclusive: tuple[bool, bool] = (True, True), reverse: bool = False) -> Iterator[TreeNode]:
+        """
+            Lazily yields the nodes with keys in between lo and hi, in order
+            (or reversed). Seeks to the first node with one descent and then
+            keeps a stack of the nodes still to visit; the stack is a list,
+            so steps do not allocate stack nodes.
+            :complexity: O(D) to seek, then O(1) amortised per node
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        if reverse:     # walk from hi down to lo, mirroring left and right
+            start, start_inclusive, stop, stop_inclusive = hi, hi_inclusive, lo, lo_inclusive
+        else:
+            start, start_inclusive, stop, stop_inclusive = lo, lo_inclusive, hi, hi_inclusive
+
+        def before_start(key: K) -> bool:
+            if start is None:
+                return False
+            if reverse:
+                return key > start or (key == start and not start_inclusive)
+            return key < start or (key == start and not start_inclusive)
+
+        def after_stop(key: K) -> bool:
+            if stop is None:
+                return False
+            if reverse:
+                return key < stop or (key == stop and not stop_inclusive)
+            return key > stop or (key == stop and not stop_inclusive)
+
+        # seek: stack holds the nodes at or after start on the search path
+        stack = []
+        current = self.root
+        while current is not None:
+            if before_start(current.key):
+                current = current.left if reverse else current.right
+            else:
+                stack.append(current)
+                current = current.right if reverse else current.left
+
+        while len(stack) > 0:
+            node = stack.pop()
+            if after_stop(node.key):
+                return
+            yield node
+            current = node.left if reverse else node.right
+            while current is not None:
+                stack.append(current)
+                current = current.right if reverse else current.left
+
     def __getitem__(self, key: K) -> I:
         """
             Attempts to get an item in the tree, it uses the Key to attempt to find it
@@ -210,6 +363,76 @@ class BinarySearchTree(Generic[K, I]):
         return current
         
 
+    def bound_node(self, key: K, below: bool, inclusive: bool) -> TreeNode | None:
+        """
+            Descends once from the root towards key, remembering the last
+            node on the correct side of key. Returns the node with the largest
+            key below key (below=True) or the smallest key above it, key
+            itself counting when inclusive; None if there is no such node.
+            :complexity: O(CompK * D)
+        """
+        best = None
+        current = self.root
+        while current is not None:
+            if key == current.key and inclusive:
+                return current
+            if (current.key < key) == below and current.key != key:
+                best = current
+                current = current.right if below else current.left
+            else:
+                current = current.left if below else current.right
+        return best
+
+    def floor(self, key: K) -> TreeNode | None:
+        """ Returns the node with the largest key <= key, or None. """
+        return self.bound_node(key, True, True)
+
+    def ceiling(self, key: K) -> TreeNode | None:
+        """ Returns the node with the smallest key >= key, or None. """
+        return self.bound_node(key, False, True)
+
+    def lower(self, key: K) -> TreeNode | None:
+        """ Returns the node with the largest key < key, or None. """
+        return self.bound_node(key, True, False)
+
+    def higher(self, key: K) -> TreeNode | None:
+        """ Returns the node with the smallest key > key, or None. """
+        return self.bound_node(key, False, False)
+
+    def nearest(self, key: K) -> TreeNode | None:
+        """
+            Returns the node whose key is closest to key (keys have to support
+            subtraction), the smaller one on a tie; None if the tree is empty.
+            :complexity: O(CompK * D)
+        """
+        below = self.floor(key)
+        above = self.ceiling(key)
+        if below is None or above is None:
+            return above if below is None else below
+        return below if key - below.key <= above.key - key else above
+
+    def max_item(self) -> tuple[K, I]:
+        """
+            Returns the (key, item) pair with the largest key.
+            :complexity: O(D)
+            :raises IndexError: if the tree is empty
+        """
+        if self.root is None:
+            raise IndexError('Empty tree')
+        node = self.get_maximum(self.root)
+        return (node.key, node.item)
+
+    def min_item(self) -> tuple[K, I]:
+        """
+            Returns the (key, item) pair with the smallest key.
+            :complexity: O(D)
+            :raises IndexError: if the tree is empty
+        """
+        if self.root is None:
+            raise IndexError('Empty tree')
+        node = self.get_minimal(self.root)
+        return (node.key, node.item)
+
     def is_leaf(self, current: TreeNode) -> bool:
         """ Simple check whether or not the node is a leaf. """
 
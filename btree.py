@@ -0,0 +1,236 @@
+""" B+ tree implemented on top of the SortedMap ADT.
+
+Nodes hold up to fanout keys in Python lists, and the items live in the
+leaves only. A lookup bisects one short list per level, in C, and the
+tree is only about log_fanout(N) levels deep, so a read makes far fewer
+Python-level steps (and pointer chases) than in a binary tree. Internal
+nodes also keep the number of keys below every child, for the rank-based
+range_between.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from bisect import bisect_left, bisect_right
+from typing import TypeVar, Generic, Iterator
+from node import BTreeNode
+from sorted_map import SortedMap
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class BTree(SortedMap, Generic[K, I]):
+    """ B+ tree with a configurable fanout. """
+
+    def __init__(self, fanout: int = 32) -> None:
+        """
+            Initialises an empty tree whose nodes hold fanout // 2 to
+            fanout keys (the root can hold fewer).
+            :complexity: O(1)
+            :pre: fanout >= 4
+        """
+        if fanout < 4:
+            raise ValueError("Fanout should be at least 4.")
+        self.fanout = fanout
+        self.min_keys = fanout // 2
+        self.root = BTreeNode([], [])
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def child_index(self, node: BTreeNode, key: K) -> int:
+        """ Returns the index of the child of an internal node to search for key. """
+        return max(0, bisect_right(node.keys, key) - 1)
+
+    def __getitem__(self, key: K) -> I:
+        """
+            :complexity: O(log(N)), log_fanout(N) bisects
+            :raises KeyError: if key is not in the tree
+        """
+        node = self.root
+        while node.children is not None:     # child_index, inlined on the read path
+            i = bisect_right(node.keys, key) - 1
+            node = node.children[i if i > 0 else 0]
+        i = bisect_left(node.keys, key)
+        if i == len(node.keys) or node.keys[i] != key:
+            raise KeyError('Key not found: {0}'.format(key))
+        return node.items[i]
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            :complexity: O(fanout * log_fanout(N))
+            :raises ValueError: if key is already in the tree
+        """
+        sibling = self.insert_aux(self.root, key, item)
+        if sibling is not None:     # the root was split, grow a level
+            old_root = self.root
+            self.root = BTreeNode([old_root.keys[0], sibling.keys[0]], None,
+                                  [old_root, sibling], [old_root.count(), sibling.count()])
+        self.length += 1
+
+    def insert_aux(self, node: BTreeNode, key: K, item: I) -> BTreeNode | None:
+        """
+            Inserts into the sub-tree of node. returns the new right half of
+            node if node had to be split, else None.
+        """
+        if node.children is None:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                raise ValueError('Inserting duplicate item')
+            node.keys.insert(i, key)
+            node.items.insert(i, item)
+        else:
+            i = self.child_index(node, key)
+            child = node.children[i]
+            sibling = self.insert_aux(child, key, item)
+            if key < node.keys[i]:  # new smallest key of the sub-tree
+                node.keys[i] = key
+            if sibling is None:
+                node.sizes[i] += 1
+            else:
+                node.keys.insert(i + 1, sibling.keys[0])
+                node.children.insert(i + 1, sibling)
+                node.sizes[i] = child.count()
+                node.sizes.insert(i + 1, sibling.count())
+        if len(node.keys) > self.fanout:
+            return self.split_node(node)
+        return None
+
+    def split_node(self, node: BTreeNode) -> BTreeNode:
+        """ Moves the upper half of node into a new node and returns it. """
+        half = len(node.keys) // 2
+        if node.children is None:
+            sibling = BTreeNode(node.keys[half:], node.items[half:])
+            del node.items[half:]
+        else:
+            sibling = BTreeNode(node.keys[half:], None, node.children[half:], node.sizes[half:])
+            del node.children[half:]
+            del node.sizes[half:]
+        del node.keys[half:]
+        return sibling
+
+    def __delitem__(self, key: K) -> None:
+        """
+            :complexity: O(fanout * log_fanout(N))
+            :raises ValueError: if key is not in the tree
+        """
+        self.delete_aux(self.root, key)
+        if self.root.children is not None and len(self.root.children) == 1:
+            self.root = self.root.children[0]     # shrink a level
+        self.length -= 1
+
+    def delete_aux(self, node: BTreeNode, key: K) -> None:
+        """ Deletes from the sub-tree of node, fixing children left with too few keys. """
+        if node.children is None:
+            i = bisect_left(node.keys, key)
+            if i == len(node.keys) or node.keys[i] != key:
+                raise ValueError('Deleting non-existent item')
+            del node.keys[i]
+            del node.items[i]
+            return
+        i = self.child_index(node, key)
+        child = node.children[i]
+        self.delete_aux(child, key)
+        node.sizes[i] -= 1
+        if len(child.keys) < self.min_keys:
+            self.fix_child(node, i)
+
+    def fix_child(self, node: BTreeNode, i: int) -> None:
+        """
+            Refills child i of node, which has too few keys, by moving a key
+            over from a sibling with keys to spare, or else merging it with
+            that sibling.
+            :complexity: O(fanout)
+        """
+        j = i - 1 if i > 0 else i + 1
+        if j >= len(node.children):     # only child, nothing to do
+            return
+        child, sibling = node.children[i], node.children[j]
+        if len(sibling.keys) > self.min_keys:
+            if j < i:   # take the largest entry of the left sibling
+                moved = self.move_entry(sibling, -1, child, 0)
+            else:       # take the smallest entry of the right sibling
+                moved = self.move_entry(sibling, 0, child, len(child.keys))
+                node.keys[j] = sibling.keys[0]
+            node.keys[i] = child.keys[0]
+            node.sizes[i] += moved
+            node.sizes[j] -= moved
+            return
+        left = min(i, j)
+        kept, merged = node.children[left], node.children[left + 1]
+        kept.keys.extend(merged.keys)
+        if kept.children is None:
+            kept.items.extend(merged.items)
+        else:
+            kept.children.extend(merged.children)
+            kept.sizes.extend(merged.sizes)
+        node.sizes[left] += node.sizes[left + 1]
+        del node.keys[left + 1]
+        del node.children[left + 1]
+        del node.sizes[left + 1]
+
+    def move_entry(self, source: BTreeNode, source_index: int, target: BTreeNode, target_index: int) -> int:
+        """ Moves one key (with its item or child) between sibling nodes.
+            returns the number of keys of the whole tree that moved.
+        """
+        target.keys.insert(target_index, source.keys.pop(source_index))
+        if source.children is None:
+            target.items.insert(target_index, source.items.pop(source_index))
+            return 1
+        target.children.insert(target_index, source.children.pop(source_index))
+        moved = source.sizes.pop(source_index)
+        target.sizes.insert(target_index, moved)
+        return moved
+
+    def items(self) -> Iterator[tuple[K, I]]:
+        """ Lazily yields the (key, item) pairs in key order. """
+        stack = [self.root]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node.children is None:
+                yield from zip(node.keys, node.items)
+            else:
+                stack.extend(reversed(node.children))
+
+    def range_between(self, i: int, j: int) -> list[I]:
+        """
+            Returns the items of the keys ranked i to j (0-based, inclusive).
+            :complexity: O(fanout * log_fanout(N) + j - i)
+        """
+        i = max(i, 0)
+        if j < i:
+            return []
+        elements = []
+        self.range_between_aux(self.root, i, j, elements)
+        return elements
+
+    def range_between_aux(self, node: BTreeNode, i: int, j: int, elements: list[I]) -> None:
+        """ Appends the items ranked i to j of the sub-tree, in order. """
+        if node.children is None:
+            elements.extend(node.items[i:j + 1])
+            return
+        offset = 0
+        for child, size in zip(node.children, node.sizes):
+            if offset > j:
+                return
+            if offset + size > i:
+                self.range_between_aux(child, max(i - offset, 0), j - offset, elements)
+            offset += size
+
+    def max_item(self) -> tuple[K, I]:
+        if self.length == 0:
+            raise IndexError('Empty tree')
+        node = self.root
+        while node.children is not None:
+            node = node.children[-1]
+        return (node.keys[-1], node.items[-1])
+
+    def min_item(self) -> tuple[K, I]:
+        if self.length == 0:
+            raise IndexError('Empty tree')
+        node = self.root
+        while node.children is not None:
+            node = node.children[0]
+        return (node.keys[0], node.items[0])
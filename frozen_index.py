@@ -0,0 +1,208 @@
+"""
+Read-only sorted index built from a search tree.
+
+A tree that is built once and then only read pays for its flexibility on
+every lookup: each step is a pointer chase through a Python node object.
+FrozenSortedIndex keeps the same (key, item) pairs in two parallel sorted
+arrays instead, and answers lookups with bisect, rank/select by indexing,
+and range queries with a slice that shares the arrays.
+
+Float keys are stored unboxed in an ArrayTyped with typecode 'd' (and int
+keys that fit in 64 bits with 'q'); any other keys (e.g., the tuples of a
+tree with tie_break) are kept in an ArrayR.
+
+Usage:
+```
+index = tree.freeze()           # O(N), the tree is left unchanged
+index[key]                      # O(log(N))
+index.select_item(0)            # (smallest key, its item), O(1)
+index.slice(lo, hi)             # keys in [lo, hi], O(log(N)), no copy
+```
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Generic, Iterable, Iterator, TypeVar
+from referential_array import ArrayR, ArrayTyped
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def key_array(keys: list) -> ArrayR | ArrayTyped:
+    """ Returns an array holding keys, unboxed if they are all floats or
+        all 64-bit ints.
+        :complexity: O(N)
+    """
+    if len(keys) > 0 and all(type(key) is float for key in keys):
+        return ArrayTyped.from_view(memoryview(array('d', keys)))
+    if len(keys) > 0 and all(type(key) is int and INT64_MIN <= key <= INT64_MAX for key in keys):
+        return ArrayTyped.from_view(memoryview(array('q', keys)))
+    result = ArrayR(max(1, len(keys)))
+    if len(keys) > 0:
+        result[0:len(keys)] = keys
+    return result
+
+
+class FrozenSortedIndex(Generic[K, I]):
+    """ Immutable sorted (key, item) index with unique keys.
+
+        An index covers the positions [start, stop) of its arrays, so that
+        slice() can return a sub-index sharing them.
+    """
+
+    def __init__(self, pairs: Iterable[tuple[K, I]]) -> None:
+        """
+            Builds the index from (key, item) pairs in strictly increasing
+            key order, e.g. tree.items().
+            :complexity: O(N)
+            :raises ValueError: if the keys are not strictly increasing
+        """
+        keys = []
+        items = []
+        for key, item in pairs:
+            if len(keys) > 0 and not keys[-1] < key:
+                raise ValueError('Keys are not strictly increasing: {0}'.format(key))
+            keys.append(key)
+            items.append(item)
+        self.keys = key_array(keys)
+        self.search_keys = self.keys.array  # bisect the raw memoryview/ctypes array, not the wrapper
+        self.items_array = ArrayR(max(1, len(items)))
+        if len(items) > 0:
+            self.items_array[0:len(items)] = items
+        self.start = 0
+        self.stop = len(keys)
+
+    def sub_index(self, start: int, stop: int) -> FrozenSortedIndex[K, I]:
+        """ Returns the index of positions [start, stop), sharing the arrays.
+            :complexity: O(1)
+        """
+        result = FrozenSortedIndex.__new__(FrozenSortedIndex)
+        result.keys = self.keys
+        result.search_keys = self.search_keys
+        result.items_array = self.items_array
+        result.start = start
+        result.stop = max(start, stop)
+        return result
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def is_empty(self) -> bool:
+        """ Returns whether the index holds no keys. """
+        return self.stop == self.start
+
+    def position(self, key: K) -> int:
+        """
+            Returns the array position of key.
+            :complexity: O(log(N))
+            :raises KeyError: if key is not in the index
+        """
+        i = bisect_left(self.search_keys, key, self.start, self.stop)
+        if i == self.stop or self.keys[i] != key:
+            raise KeyError('Key not found: {0}'.format(key))
+        return i
+
+    def __getitem__(self, key: K) -> I:
+        """
+            Returns the item stored under key.
+            :complexity: O(log(N))
+            :raises KeyError: if key is not in the index
+        """
+        return self.items_array[self.position(key)]
+
+    def __contains__(self, key: K) -> bool:
+        try:
+            self.position(key)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[K]:
+        for i in range(self.start, self.stop):
+            yield self.keys[i]
+
+    def __reversed__(self) -> Iterator[K]:
+        for i in range(self.stop - 1, self.start - 1, -1):
+            yield self.keys[i]
+
+    def items(self) -> Iterator[tuple[K, I]]:
+        """ Yields the (key, item) pairs in key order. """
+        for i in range(self.start, self.stop):
+            yield (self.keys[i], self.items_array[i])
+
+    def values(self) -> Iterator[I]:
+        """ Yields the items in key order. """
+        for i in range(self.start, self.stop):
+            yield self.items_array[i]
+
+    def select_item(self, k: int) -> tuple[K, I]:
+        """
+            Returns the (key, item) pair with the k-th smallest key (k = 0
+            for the smallest; negative k counts from the largest). Named
+            apart from AVLTree.select, which returns a node.
+            :complexity: O(1)
+            :raises IndexError: if k is out of range
+        """
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError('Index out of range: {0}'.format(k))
+        return (self.keys[self.start + k], self.items_array[self.start + k])
+
+    def rank(self, key: K) -> int:
+        """
+            Returns the number of keys strictly smaller than key.
+            :complexity: O(log(N))
+        """
+        return bisect_left(self.search_keys, key, self.start, self.stop) - self.start
+
+    def bound_item(self, key: K, below: bool, inclusive: bool) -> tuple[K, I] | None:
+        """
+            Returns the (key, item) pair with the largest key below key
+            (below=True) or the smallest key above it, key itself counting
+            when inclusive; None if there is no such key.
+            :complexity: O(log(N))
+        """
+        if below:
+            i = (bisect_right if inclusive else bisect_left)(self.search_keys, key, self.start, self.stop) - 1
+        else:
+            i = (bisect_left if inclusive else bisect_right)(self.search_keys, key, self.start, self.stop)
+        if not self.start <= i < self.stop:
+            return None
+        return (self.keys[i], self.items_array[i])
+
+    def floor_item(self, key: K) -> tuple[K, I] | None:
+        """ Returns the (key, item) pair with the largest key <= key, or None. """
+        return self.bound_item(key, True, True)
+
+    def ceiling_item(self, key: K) -> tuple[K, I] | None:
+        """ Returns the (key, item) pair with the smallest key >= key, or None. """
+        return self.bound_item(key, False, True)
+
+    def lower_item(self, key: K) -> tuple[K, I] | None:
+        """ Returns the (key, item) pair with the largest key < key, or None. """
+        return self.bound_item(key, True, False)
+
+    def higher_item(self, key: K) -> tuple[K, I] | None:
+        """ Returns the (key, item) pair with the smallest key > key, or None. """
+        return self.bound_item(key, False, False)
+
+    def slice(self, lo: K = None, hi: K = None, inclusive: tuple[bool, bool] = (True, True)) -> FrozenSortedIndex[K, I]:
+        """
+            Returns the sub-index of the keys in between lo and hi (None
+            meaning no bound), sharing this index's arrays.
+            :complexity: O(log(N))
+        """
+        start, stop = self.start, self.stop
+        if lo is not None:
+            start = (bisect_left if inclusive[0] else bisect_right)(self.search_keys, lo, self.start, self.stop)
+        if hi is not None:
+            stop = (bisect_right if inclusive[1] else bisect_left)(self.search_keys, hi, self.start, self.stop)
+        return self.sub_index(start, stop)
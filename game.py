@@ -176,6 +176,16 @@ class Game:
                 trader_amount += 1
 
 
+    def generate_deals(self) -> None:
+        """
+        Every trader generates a new deal for the day.
+        Best and worst case complexity: O(T)
+        """
+        for trader in self.traders:
+            trader.generate_deal()
+        print("Traders Deals:\n\t", end="")
+        print("\n\t".join(map(str, self.get_traders())))
+
     def finish_day(self):
         """
         DO NOT CHANGE
@@ -221,12 +231,19 @@ class SoloGame(Game):
         Best and Worst case complexity: O(T + F + O(select_food_and_caves) + C * T), select_food_and_caves = O(T * log(t) + F * (log(t) * log(C) * C1)))
         """
         # 1. Traders make deals
-        for trader in self.traders:
-            trader.generate_deal()
-        # raise NotImplementedError()
-        print("Traders Deals:\n\t", end="")
-        print("\n\t".join(map(str, self.get_traders())))
+        self.generate_deals()
         # 2. Food is offered
+        foods = self.offer_food()
+        # 3. Select one food item to purchase
+        selection = self.make_selection(foods)
+        # 4. Quantites for caves is updated, some more stuff is added.
+        self.verify_output_and_update_quantities(*selection)
+
+    def offer_food(self) -> list[Food]:
+        """
+        Offers the player between MIN_FOOD and MAX_FOOD random foods.
+        Best and Worst case complexity: O(F)
+        """
         food_num = RandomGen.randint(self.MIN_FOOD, self.MAX_FOOD)
         foods = []
         for _ in range(food_num):
@@ -234,11 +251,20 @@ class SoloGame(Game):
         print("\nFoods:\n\t", end="")
         print("\n\t".join(map(str, foods)))
         self.player.set_foods(foods)
-        # 3. Select one food item to purchase
+        return foods
+
+    def make_selection(self, foods: list[Food]) -> tuple[Food | None, float, list[tuple[Cave, float]]]:
+        """
+        Lets the player select the food to eat and the caves to mine.
+        Best and Worst case complexity: O(select_food_and_caves)
+        """
         food, balance, caves = self.player.select_food_and_caves()      # O(T * log(t) + F * (log(t) * log(C) * C))
         print(food, balance, caves)
-        # 4. Quantites for caves is updated, some more stuff is added.
-        self.verify_output_and_update_quantities(food, balance, caves)
+        return (food, balance, caves)
+
+    def player_balances(self) -> list[float]:
+        """ Returns the emerald balance of the player, in a list. """
+        return [self.player.balance]
 
     def verify_output_and_update_quantities(self, food: Food | None, balance: float, caves: list[tuple[Cave, float]]) -> None:
         '''
@@ -345,18 +371,33 @@ class MultiplayerGame(Game):
         COMPLEXITY NOT RIGHT. NEED TO DO VERIFY_OUTPUT COMPLEXITY
         """
         # 1. Traders make deals
-        for trader in self.traders:
-            trader.generate_deal()
-        # raise NotImplementedError()
-        print("Traders Deals:\n\t", end="")
-        print("\n\t".join(map(str, self.get_traders())))
+        self.generate_deals()
         # 2. Food is offered
-        offered_food = Food.random_food()
-        print(f"\nFoods:\n\t{offered_food}")
+        offered_food = self.offer_food()
         # 3. Each player selects a cave - The game does this instead.
-        foods, balances, caves = self.select_for_players(offered_food)
+        selection = self.make_selection(offered_food)
         # 4. Quantites for caves is updated, some more stuff is added.
-        self.verify_output_and_update_quantities(foods, balances, caves)
+        self.verify_output_and_update_quantities(*selection)
+
+    def offer_food(self) -> Food:
+        """
+        Offers one random food to every player.
+        Best and worst case complexity: O(1)
+        """
+        offered_food = Food.random_food()
+        print(f"\nFoods:\n\t{offered_food}")
+        return offered_food
+
+    def make_selection(self, food: Food) -> tuple[list[Food|None], list[float], list[tuple[Cave, float]|None]]:
+        """
+        The game selects the food and cave of every player.
+        Best and worst case complexity: O(select_for_players)
+        """
+        return self.select_for_players(food)
+
+    def player_balances(self) -> list[float]:
+        """ Returns the emerald balance of every player, in player order. """
+        return [player.balance for player in self.players]
 
     def select_for_players(self, food: Food) -> tuple[list[Food|None], list[float], list[tuple[Cave, float]|None]]:
         """
@@ -461,16 +502,17 @@ class MultiplayerGame(Game):
                 trader_info[trader.material.name] = trader.buying_price            #O(1)
         self.trader_table = trader_info
         #Sorting cave by material, sorting by emerald value 
-        cave_avl = AVLTreeCave()
+        cave_values = []
         for cave in self.caves:         #O(C)
             try:
                 if cave.material.name in trader_info:           #O(1)
 
                     selling_price = trader_info[cave.material.name]     #O(1)
                     cave_emerald_value = selling_price * (default_hunger/cave.material.mining_rate) * cave.quantity     #O(1)
-                    cave_avl[cave_emerald_value] = cave         #O(log(C))
+                    cave_values.append((cave_emerald_value, cave))
             except ZeroDivisionError:
                 continue
+        cave_avl = AVLMultiMap.from_items(cave_values, recycle_nodes=True)   #O(C * log(C)) sort, O(C) build. Every player served re-keys one cave
             
         #Loop through all the players
         for i in range(len(self.players)):              #O(P)
@@ -483,55 +525,27 @@ class MultiplayerGame(Game):
 
                 #Visit cave of maximum
                 current_cave = cave_avl.get_maximum(cave_avl.root)      #O(log(C))
-                #Find material
-                if type(current_cave.item) == list:  
-                    for cave in current_cave.item:               #O(1) because it breaks after 1 iteration
-                        current_material = cave.material           #O(1)
-                        #Find how much materials mined 
-                        quantity_mined = (float(current_hunger) / current_material.mining_rate)      #O(1)
-
-                        if quantity_mined > cave.quantity:          #O(1)
-                            quantity_mined = cave.quantity          #O(1)
-
-                        #Append to return
-                        caves_and_materials_list.append([cave, quantity_mined])            #O(1)
-
-                        #Append to return
-                        selling_price = trader_info[current_material.name]          #O(1)
-                        emerald_balance_list.append(current_player.balance + selling_price * quantity_mined)           #O(1)
-
-                        #Update items in current_cave 
-                        cave.quantity -= quantity_mined #For next player to know if the cave has like 20% of its mats left = bad choice 
-                        
-                        current_cave.item.pop(0)    #O(1) because always popping at the first position
-                        if len(current_cave.item) == 0:
-                            del cave_avl[current_cave.key]
-
-                        cave_emerald_value = selling_price * (default_hunger/cave.material.mining_rate) * cave.quantity     #O(1)
-                        cave_avl[cave_emerald_value] = cave 
-                        
-                        break
-                    continue
-                else:
-                    current_material = current_cave.item.material       #O(1)
-
-                    #Find how much materials mined 
-                    quantity_mined = current_hunger / current_cave.item.material.mining_rate        #O(1)
-                    if quantity_mined > current_cave.item.quantity:         #O(1)
-                        quantity_mined = current_cave.item.quantity         #O(1)
-
-                    #Append to return
-                    caves_and_materials_list.append([current_cave.item, quantity_mined])       #O(1)
-
-                    #Append to return
-                    selling_price = trader_info[current_material.name]          #O(1)
-                    emerald_balance_list.append(current_player.balance + selling_price * quantity_mined)           #O(1)
-
-                    #Update items in current_cave 
-                    current_cave.item.quantity -= quantity_mined #For next player to know if the cave has like 20% of its mats left = bad choice 
-                    del cave_avl[current_cave.key]
-                    cave_emerald_value = selling_price * (default_hunger/current_cave.item.material.mining_rate) * current_cave.item.quantity     #O(1)
-                    cave_avl[cave_emerald_value] = current_cave.item 
+                #Oldest cave in the bucket of that value, re-keyed below
+                cave = current_cave.item[0]                     #O(1)
+                current_value = current_cave.key                #O(1)
+                current_material = cave.material           #O(1)
+
+                #Find how much materials mined 
+                quantity_mined = current_hunger / current_material.mining_rate      #O(1)
+                if quantity_mined > cave.quantity:          #O(1)
+                    quantity_mined = cave.quantity          #O(1)
+
+                #Append to return
+                caves_and_materials_list.append([cave, quantity_mined])            #O(1)
+
+                #Append to return
+                selling_price = trader_info[current_material.name]          #O(1)
+                emerald_balance_list.append(current_player.balance + selling_price * quantity_mined)           #O(1)
+
+                #Update items in current_cave 
+                cave.quantity -= quantity_mined #For next player to know if the cave has like 20% of its mats left = bad choice 
+                cave_emerald_value = selling_price * (default_hunger/current_material.mining_rate) * cave.quantity     #O(1)
+                cave_avl.rekey(current_value, cave, cave_emerald_value)         #O(log(C)), renamed in place if it keeps its position
             else: #Cannot buy food item, no cave, no increase in emeralds 
                 food_purchased_list.append(None)            #O(1)       
                 emerald_balance_list.append(current_player.balance)         #O(1)
@@ -3,9 +3,11 @@ from __future__ import annotations
 __author__ = "Brendon Taylor, modified by Jackson Goerner"
 __docformat__ = 'reStructuredText'
 
-from typing import Generic
+from typing import Generic, Hashable, Iterable, TypeVar
 from referential_array import ArrayR, T
 
+H = TypeVar('H', bound=Hashable)
+
 
 class MaxHeap(Generic[T]):
     MIN_CAPACITY = 1
@@ -83,6 +85,283 @@ class MaxHeap(Generic[T]):
         return max_elt
 
 
+class DaryMaxHeap(Generic[T]):
+    """ Max heap where each node has `arity` children (2, 4 or 8 usually).
+
+        Unlike MaxHeap the array is 0-based (the children of k are
+        arity*k + 1 ... arity*k + arity) and doubles in size when it is
+        full instead of raising IndexError. A wider heap is shallower, so
+        sinking does fewer levels (at more comparisons per level).
+    """
+    MIN_CAPACITY = 1
+
+    def __init__(self, max_size: int = 1, arity: int = 2) -> None:
+        if arity < 2:
+            raise ValueError("Arity should be at least 2.")
+        self.length = 0
+        self.arity = arity
+        self.the_array = ArrayR(max(self.MIN_CAPACITY, max_size))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def is_full(self) -> bool:
+        return self.length == len(self.the_array)
+
+    def rise(self, k: int) -> None:
+        """
+        Rise element at index k to its correct position
+        :pre: 0 <= k < self.length
+        """
+        the_array = self.the_array
+        item = the_array[k]
+        while k > 0:
+            parent = (k - 1) // self.arity
+            if not item > the_array[parent]:
+                break
+            the_array[k] = the_array[parent]
+            k = parent
+        the_array[k] = item
+
+    def largest_child(self, k: int) -> int:
+        """
+        Returns the index of k's child with greatest value.
+        :pre: k has at least one child
+        :complexity: O(arity)
+        """
+        the_array = self.the_array
+        first = self.arity * k + 1
+        best = first
+        best_item = the_array[first]
+        for child in range(first + 1, min(first + self.arity, self.length)):
+            if the_array[child] > best_item:
+                best = child
+                best_item = the_array[child]
+        return best
+
+    def sink(self, k: int) -> None:
+        """ Make the element at index k sink to the correct position.
+            :pre: 0 <= k < self.length
+            :complexity: O(arity * log_arity(n))
+        """
+        the_array = self.the_array
+        item = the_array[k]
+        while self.arity * k + 1 < self.length:
+            max_child = self.largest_child(k)
+            if the_array[max_child] <= item:
+                break
+            the_array[k] = the_array[max_child]
+            k = max_child
+        the_array[k] = item
+
+    def add(self, element: T) -> None:
+        """ Adds an element, doubling the array first if it is full.
+            :complexity: O(log_arity(n)), amortised over the growth
+        """
+        if self.is_full():
+            self.the_array = self.the_array.resized(2 * len(self.the_array))
+        self.the_array[self.length] = element
+        self.length += 1
+        self.rise(self.length - 1)
+
+    def peek(self) -> T:
+        """ Returns (without removing) the maximum element. """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[0]
+
+    def get_max(self) -> T:
+        """ Remove (and return) the maximum element from the heap. """
+        if self.length == 0:
+            raise IndexError
+
+        max_elt = self.the_array[0]
+        self.length -= 1
+        if self.length > 0:
+            self.the_array[0] = self.the_array[self.length]
+            self.sink(0)
+        self.the_array[self.length] = None
+        return max_elt
+
+    def push_pop(self, element: T) -> T:
+        """ Adds element and then removes (and returns) the maximum, with a
+            single sink instead of a rise followed by a sink.
+            :complexity: O(1) if element is the new maximum, O(log_arity(n)) otherwise
+        """
+        if self.length == 0 or not self.the_array[0] > element:
+            return element
+        max_elt = self.the_array[0]
+        self.the_array[0] = element
+        self.sink(0)
+        return max_elt
+
+    def replace(self, element: T) -> T:
+        """ Removes (and returns) the maximum and then adds element, with a
+            single sink. Unlike push_pop the returned value may be smaller
+            than element.
+            :complexity: O(log_arity(n))
+        """
+        if self.length == 0:
+            raise IndexError
+        max_elt = self.the_array[0]
+        self.the_array[0] = element
+        self.sink(0)
+        return max_elt
+
+
+class IndexedMaxHeap(Generic[H, T]):
+    """ Max heap of (handle, priority) entries that also remembers where
+        each handle is, so the priority of any entry can be changed or the
+        entry removed in O(log n) without searching for it.
+
+        Handles must be hashable and unique within the heap. The array
+        doubles in size when it is full.
+    """
+    MIN_CAPACITY = 1
+
+    def __init__(self, max_size: int = 1) -> None:
+        self.length = 0
+        self.handles = ArrayR(max(self.MIN_CAPACITY, max_size) + 1)
+        self.priorities = ArrayR(len(self.handles))
+        self.position = {}
+
+    @classmethod
+    def heapify(cls, entries: Iterable[tuple[H, T]]) -> IndexedMaxHeap[H, T]:
+        """ Builds a heap from (handle, priority) pairs.
+            :complexity: O(n) - sinks every internal node once, bottom up
+            :raises ValueError: if a handle appears twice
+        """
+        entries = list(entries)
+        heap = cls(len(entries))
+        for handle, priority in entries:
+            if handle in heap.position:
+                raise ValueError('Duplicate handle: {0}'.format(handle))
+            heap.length += 1
+            heap.handles[heap.length] = handle
+            heap.priorities[heap.length] = priority
+            heap.position[handle] = heap.length
+        for k in range(heap.length // 2, 0, -1):
+            heap.sink(k)
+        return heap
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, handle: H) -> bool:
+        return handle in self.position
+
+    def __getitem__(self, handle: H) -> T:
+        """ Returns the priority of handle.
+            :raises KeyError: if handle is not in the heap
+        """
+        return self.priorities[self.position[handle]]
+
+    def is_full(self) -> bool:
+        return self.length + 1 == len(self.handles)
+
+    def _place(self, k: int, handle: H, priority: T) -> None:
+        """ Puts an entry at index k and records its position. """
+        self.handles[k] = handle
+        self.priorities[k] = priority
+        self.position[handle] = k
+
+    def rise(self, k: int) -> None:
+        """
+        Rise element at index k to its correct position
+        :pre: 1 <= k <= self.length
+        """
+        handle = self.handles[k]
+        priority = self.priorities[k]
+        while k > 1 and priority > self.priorities[k // 2]:
+            self._place(k, self.handles[k // 2], self.priorities[k // 2])
+            k = k // 2
+        self._place(k, handle, priority)
+
+    def largest_child(self, k: int) -> int:
+        """
+        Returns the index of k's child with greatest priority.
+        :pre: 1 <= k <= self.length // 2
+        """
+        if 2 * k == self.length or \
+                self.priorities[2 * k] > self.priorities[2 * k + 1]:
+            return 2 * k
+        else:
+            return 2 * k + 1
+
+    def sink(self, k: int) -> None:
+        """ Make the element at index k sink to the correct position.
+            :pre: 1 <= k <= self.length
+            :complexity: O(log n)
+        """
+        handle = self.handles[k]
+        priority = self.priorities[k]
+        while 2 * k <= self.length:
+            max_child = self.largest_child(k)
+            if self.priorities[max_child] <= priority:
+                break
+            self._place(k, self.handles[max_child], self.priorities[max_child])
+            k = max_child
+        self._place(k, handle, priority)
+
+    def add(self, handle: H, priority: T) -> None:
+        """ Adds a new entry, growing the array if needed.
+            :complexity: O(log n), amortised over the growth
+            :raises ValueError: if handle is already in the heap
+        """
+        if handle in self.position:
+            raise ValueError('Duplicate handle: {0}'.format(handle))
+        if self.is_full():
+            self.handles = self.handles.resized(2 * len(self.handles))
+            self.priorities = self.priorities.resized(len(self.handles))
+        self.length += 1
+        self._place(self.length, handle, priority)
+        self.rise(self.length)
+
+    def update(self, handle: H, new_priority: T) -> None:
+        """ Changes the priority of handle (increase or decrease key).
+            :complexity: O(log n)
+            :raises KeyError: if handle is not in the heap
+        """
+        k = self.position[handle]
+        old_priority = self.priorities[k]
+        self.priorities[k] = new_priority
+        if new_priority > old_priority:
+            self.rise(k)
+        else:
+            self.sink(k)
+
+    def peek(self) -> tuple[H, T]:
+        """ Returns (without removing) the entry with the greatest priority. """
+        if self.length == 0:
+            raise IndexError
+        return (self.handles[1], self.priorities[1])
+
+    def remove(self, handle: H) -> T:
+        """ Removes handle from the heap and returns its priority.
+            :complexity: O(log n)
+            :raises KeyError: if handle is not in the heap
+        """
+        k = self.position.pop(handle)
+        priority = self.priorities[k]
+        last = self.length
+        self.length -= 1
+        if k != last:
+            self._place(k, self.handles[last], self.priorities[last])
+            if self.priorities[k] > priority:
+                self.rise(k)
+            else:
+                self.sink(k)
+        self.handles[last] = None
+        self.priorities[last] = None
+        return priority
+
+    def get_max(self) -> tuple[H, T]:
+        """ Remove (and return) the entry with the greatest priority. """
+        handle, priority = self.peek()
+        self.remove(handle)
+        return (handle, priority)
+
+
 if __name__ == '__main__':
     items = [ int(x) for x in input('Enter a list of numbers: ').strip().split() ]
     heap = MaxHeap(len(items))
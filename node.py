@@ -1,4 +1,5 @@
 """ Implementation of a node in linked lists and binary search trees. """
+from __future__ import annotations
 
 from typing import TypeVar, Generic
 
@@ -11,7 +12,11 @@ __docformat__ = 'reStructuredText'
 
 
 class TreeNode(Generic[K, I]):
-    """ Node class represent BST nodes. """
+    """ Node class represent BST nodes.
+        Nodes use __slots__ so they carry no per-instance __dict__.
+    """
+
+    __slots__ = ('key', 'item', 'left', 'right')
 
     def __init__(self, key: K, item: I = None) -> None:
         """
@@ -37,6 +42,8 @@ class AVLTreeNode(TreeNode, Generic[K, I]):
     """ Node class for AVL trees.
     """
 
+    __slots__ = ('height', 'size')
+
     def __init__(self, key: K, item: I = None) -> None:
         """
             Initialises the node with a key and optional item
@@ -47,3 +54,109 @@ class AVLTreeNode(TreeNode, Generic[K, I]):
         super(AVLTreeNode, self).__init__(key, item)
         self.height = 1
         self.size = 1
+
+    def reset(self, key: K, item: I = None) -> None:
+        """
+            Re-initialises a recycled node as if it had just been created
+            :complexity: O(1)
+        """
+        self.key = key
+        self.item = item
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+
+    def copy(self) -> AVLTreeNode:
+        """
+            Returns a new node with the same key, item, children, height and size
+            :complexity: O(1)
+        """
+        node = AVLTreeNode(self.key, self.item)
+        node.left = self.left
+        node.right = self.right
+        node.height = self.height
+        node.size = self.size
+        return node
+
+
+class AggregateAVLTreeNode(AVLTreeNode, Generic[K, I]):
+    """ AVL tree node that also stores a tuple of aggregates over its
+        sub-tree (one value per aggregate of the tree).
+    """
+
+    __slots__ = ('aggregate',)
+
+    def __init__(self, key: K, item: I = None) -> None:
+        """
+            Initialises the node with a key and optional item, the
+            aggregate is set by the tree
+            :complexity: O(1)
+        """
+        super(AggregateAVLTreeNode, self).__init__(key, item)
+        self.aggregate = None
+
+
+class TreapNode(TreeNode, Generic[K, I]):
+    """ Node class for treaps: a random heap priority and the sub-tree size.
+    """
+
+    __slots__ = ('priority', 'size')
+
+    def __init__(self, key: K, item: I = None, priority: float = 0.0) -> None:
+        """
+            Initialises the node with a key, optional item and priority
+            :complexity: O(1)
+        """
+        super(TreapNode, self).__init__(key, item)
+        self.priority = priority
+        self.size = 1
+
+
+class SkipListNode(Generic[K, I]):
+    """ Node class for indexable skip lists. forward[level] is the next
+        node on that level and width[level] the number of positions it is
+        ahead of this one.
+    """
+
+    __slots__ = ('key', 'item', 'forward', 'width')
+
+    def __init__(self, key: K, item: I, levels: int) -> None:
+        """
+            Initialises the node with a key, item and levels empty links
+            :complexity: O(levels)
+        """
+        self.key = key
+        self.item = item
+        self.forward = [None] * levels
+        self.width = [1] * levels
+
+
+class BTreeNode(Generic[K, I]):
+    """ Node class for B+ trees. A leaf keeps its sorted keys and their
+        items; an internal node keeps its children, a lower bound of the
+        keys of every child (keys[i] for children[i]) and the number of
+        keys below every child.
+    """
+
+    __slots__ = ('keys', 'items', 'children', 'sizes')
+
+    def __init__(self, keys: list[K], items: list[I] = None, children: list[BTreeNode] = None, sizes: list[int] = None) -> None:
+        """
+            Initialises a leaf (children is None) or an internal node
+            :complexity: O(1)
+        """
+        self.keys = keys
+        self.items = items
+        self.children = children
+        self.sizes = sizes
+
+    def is_leaf(self) -> bool:
+        return self.children is None
+
+    def count(self) -> int:
+        """
+            Returns the number of keys in the sub-tree
+            :complexity: O(fanout)
+        """
+        return len(self.keys) if self.children is None else sum(self.sizes)
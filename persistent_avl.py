@@ -0,0 +1,173 @@
+""" Persistent (path-copying) AVL tree.
+
+Every version of the tree is immutable. insert and delete return a new
+version that copies only the nodes on the search path (and the few nodes
+a rotation touches), sharing every other node with the old version, so
+each update costs O(log(N)) extra memory and every old version stays
+readable with the usual AVLTree read API.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from avl import AVLTree
+from bst import BSTInOrderIterator
+from typing import TypeVar, Generic, List
+from node import AVLTreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class PersistentAVLTree(AVLTree, Generic[K, I]):
+    """ AVL tree whose updates return new versions instead of changing it. """
+
+    def __init__(self, recycle_nodes: bool = False) -> None:
+        """
+            Initialises an empty version.
+            Nodes are shared between versions, so they can never be recycled.
+            :complexity: O(1)
+        """
+        if recycle_nodes:
+            raise ValueError('Nodes of a persistent tree cannot be recycled')
+        AVLTree.__init__(self)
+
+    def __setitem__(self, key: K, item: I) -> None:
+        raise TypeError('PersistentAVLTree is immutable, use insert()')
+
+    def __delitem__(self, key: K) -> None:
+        raise TypeError('PersistentAVLTree is immutable, use delete()')
+
+    def add(self, item: I) -> None:
+        raise TypeError('PersistentAVLTree is immutable, use insert()')
+
+    def split(self, key: K) -> None:
+        raise TypeError('PersistentAVLTree cannot be split in place')
+
+    @classmethod
+    def join(cls, left: AVLTree[K, I], right: AVLTree[K, I]) -> None:
+        raise TypeError('PersistentAVLTree cannot be joined in place')
+
+    def union(self, other: AVLTree[K, I]) -> None:
+        raise TypeError('PersistentAVLTree is immutable')
+
+    def difference(self, other: AVLTree[K, I]) -> None:
+        raise TypeError('PersistentAVLTree is immutable')
+
+    def pop_extreme(self, largest: bool) -> None:
+        raise TypeError('PersistentAVLTree is immutable, use delete()')
+
+    def rekey(self, old_key: K, item: I, new_key: K) -> None:
+        raise TypeError('PersistentAVLTree is immutable')
+
+    def threaded_iter(self) -> BSTInOrderIterator:
+        """ Same as iter(self): Morris traversal would write threads into
+            nodes shared with other versions, so a stack-based walk is used.
+        """
+        return BSTInOrderIterator(self.root)
+
+    def range_between(self, i: int, j: int) -> List:
+        """
+            Same as AVLTree.range_between, without Morris traversal (its
+            threads would be seen by the versions sharing the nodes): seeks
+            rank i by sub-tree sizes and walks on from there with a stack.
+            :complexity: O(log(N) + j - i)
+        """
+        i = max(i, 0)
+        j = min(j, self.length - 1)
+        if j < i:
+            return []
+        elements = []
+        for node in self.walk_nodes(self.select(i).key):
+            elements.append(node.item)
+            if len(elements) > j - i:
+                break
+        return elements
+
+    def new_version(self, root: AVLTreeNode, length: int) -> PersistentAVLTree[K, I]:
+        """ Wraps a root into a new version of the tree. """
+        version = type(self)()
+        version.root = root
+        version.length = length
+        return version
+
+    def copy_path_node(self, node: AVLTreeNode, path: list, went_left: bool) -> AVLTreeNode:
+        """
+            Copies a node met while walking down, links the copy below the
+            previous copy on the path and pushes it on the path.
+            :complexity: O(1)
+        """
+        copy = node.copy()
+        if len(path) > 0:
+            parent, parent_went_left = path[-1]
+            if parent_went_left:
+                parent.left = copy
+            else:
+                parent.right = copy
+        path.append((copy, went_left))
+        return copy
+
+    def insert(self, key: K, item: I) -> PersistentAVLTree[K, I]:
+        """
+            Returns a new version with item inserted under key.
+            :complexity: O(log(N)) time and extra memory
+            :raises ValueError: if key is already in the tree
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            if key == node.key:
+                raise ValueError('Inserting duplicate item')
+            went_left = key < node.key
+            self.copy_path_node(node, path, went_left)
+            node = node.left if went_left else node.right
+        root = self.retrace(path, AVLTreeNode(key, item), 1)
+        return self.new_version(root, self.length + 1)
+
+    def delete(self, key: K) -> PersistentAVLTree[K, I]:
+        """
+            Returns a new version without key.
+            :complexity: O(log(N)) time and extra memory
+            :raises ValueError: if key is not in the tree
+        """
+        path = []
+        node = self.root
+        while node is not None and key != node.key:
+            went_left = key < node.key
+            self.copy_path_node(node, path, went_left)
+            node = node.left if went_left else node.right
+        if node is None:  # key not found
+            raise ValueError('Deleting non-existent item')
+
+        if node.left is not None and node.right is not None:
+            # replace by the successor in a copy of the node, unlink the successor
+            target = self.copy_path_node(node, path, False)
+            succ = node.right
+            while succ.left is not None:
+                self.copy_path_node(succ, path, True)
+                succ = succ.left
+            target.key = succ.key
+            target.item = succ.item
+            node = succ
+
+        subtree = node.left if node.left is not None else node.right
+        root = self.retrace(path, subtree, -1)
+        return self.new_version(root, self.length - 1)
+
+    def rebalance(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Same as AVLTree.rebalance, but first copies the nodes below
+            current that the rotations will change (current itself is
+            always a copy on the path).
+            :complexity: O(1)
+        """
+        balance = self.get_balance(current)
+        if balance >= 2:
+            current.right = current.right.copy()
+            if self.get_height(current.right.left) > self.get_height(current.right.right):
+                current.right.left = current.right.left.copy()
+        elif balance <= -2:
+            current.left = current.left.copy()
+            if self.get_height(current.left.right) > self.get_height(current.left.left):
+                current.left.right = current.left.right.copy()
+        return AVLTree.rebalance(self, current)
@@ -112,7 +112,8 @@ class Player():
         self.traders = []
         self.foods = []
         self.materials = LinearProbeTable(50)
-        self.caves = AVLTreeCave()
+        self.caves = AVLMultiMap()
+        self.frozen_caves = self.caves.freeze()     # read-only copy of self.caves (buckets as tuples), rebuilt by set_caves
         
 
         
@@ -149,11 +150,17 @@ class Player():
 
     def set_caves(self, caves_list: list[Cave]) -> None:
         """
-        Sets all the Caves accessible to the player in form of an AVL Tree
-        Best and worst case complexity: O(log(C))
+        Sets all the Caves accessible to the player in form of an AVL Tree,
+        keyed by mining rate (caves sharing a material share a bucket), and
+        freezes it once for select_food_and_caves, which only reads it
+        Best and worst case complexity: O(C * log(C)), bulk-loaded if the player has no caves yet
         """
-        for cave in caves_list:
-            self.caves[cave.material.mining_rate] = cave
+        if len(self.caves) == 0:
+            self.caves = AVLMultiMap.from_items([(cave.material.mining_rate, cave) for cave in caves_list])
+        else:
+            for cave in caves_list:
+                self.caves[cave.material.mining_rate] = cave
+        self.frozen_caves = self.caves.freeze()         # O(C)
 
     def select_food_and_caves(self) -> tuple[Food | None, float, list[tuple[Cave, float]]]:
         '''
@@ -209,13 +216,13 @@ class Player():
         
                 
                                                 ---- COMPLEXITY ----
-        Complexity worst case = best case: O(T * log(t) + F * (log(t) * log(C) * C1))
+        Complexity worst case = best case: O(T * log(t) + t + F * (log(t) * log(C) * C1))
         where T is Traders, F is Food, C is Caves and C1 is a a special case where more than one cave has the same material in them.
         The Complexity provided here is less than that of the one given as this complexity does not take into account M. 
         We beleive that it is more than highly likely for M to be around the same as T (+-100). In this assumption, t*log(t) will have a lower time complexity
         compared to M + T if M and T are around the same values (+-100).
         '''
-        trader_ratio = AVLTree()
+        trader_ratio = AVLTree(key=lambda trader: trader.ratio, tie_break=True)   # traders with equal ratios are all kept
 
         hunger_bars_balance = 0
         emerald_balance = 0
@@ -224,10 +231,10 @@ class Player():
         final_food = None
 
         for trader in self.traders:                     # O(T * log(t)), T is the number of traders, t is the amount of traders in the AVL tree
-                try:
-                    trader_ratio[trader.ratio] = trader        # O(height of tree) = O(log(traders in tree))
-                except:
-                    continue
+            if trader.ratio is not None:                # no deal generated, nothing to sell to
+                trader_ratio.add(trader)                # O(height of tree) = O(log(traders in tree))
+        traders_by_ratio = trader_ratio.freeze()        # O(t), only read from here on
+        caves = self.frozen_caves                       # frozen by set_caves
         
         for food in self.foods: #O(F)
             caves_plundered_elements = []
@@ -237,49 +244,31 @@ class Player():
 
             while hunger_bars_balance > 0: #O(1)#O(1)
                 try:
-                    trader_to_sell = trader_ratio.range_between(count, count)   # O(log(t))
-                except:
-                    break
-                try:
-                    material_to_mine = trader_to_sell[0].material #Get Material to mine #O(1)
-                except IndexError:
+                    trader_to_sell = traders_by_ratio.select_item(count)[1]   # O(1) count-th lowest ratio
+                except IndexError:  # ran out of traders
                     break
+                material_to_mine = trader_to_sell.material #Get Material to mine #O(1)
 
                 try:
-                    cave_to_mine = self.caves[material_to_mine.mining_rate] #Found Cave O(log(C))
+                    cave_to_mine = caves[material_to_mine.mining_rate] #Found Cave O(log(C)), bisect on the frozen keys
                 except KeyError: #No cave containing given material
                     count += 1 #O(1)
                     continue
-                if type(cave_to_mine) == list:  
-                    for cave in cave_to_mine:               #O(C1) Special case where two caves have the same material
-                        if hunger_bars_balance > 0: #O(1)
-                            if cave.if_visited(food): #O(1)
-                                continue
+                for cave in cave_to_mine:               #O(C1) caves_to_mine is the bucket of caves with this material
+                    if hunger_bars_balance > 0: #O(1)
+                        if cave.if_visited(food): #O(1)
+                            continue
 
-                            quantity_mined = hunger_bars_balance / cave.material.mining_rate        # #O(1)
-                            if quantity_mined > cave.quantity:
-                                quantity_mined = cave.quantity
-                            
-                            caves_plundered_elements.append((cave, quantity_mined))
-                            
-                            hunger_bars_balance = hunger_bars_balance - cave.material.mining_rate * quantity_mined      #O(1)
-                            emerald_balance += quantity_mined * trader_to_sell[0].buying_price          #O(1) we already know the position to index
-                        else:
-                            break
+                        quantity_mined = hunger_bars_balance / cave.material.mining_rate        # #O(1)
+                        if quantity_mined > cave.quantity:
+                            quantity_mined = cave.quantity
 
-                else:
-                    if cave_to_mine.if_visited(food): #O(1)
-                        count += 1
-                        continue
-                                        
-                    quantity_mined = hunger_bars_balance / cave_to_mine.material.mining_rate        #O(1)
-                    if quantity_mined > cave_to_mine.quantity:
-                        quantity_mined = cave_to_mine.quantity          #O(1)
+                        caves_plundered_elements.append((cave, quantity_mined))
 
-                    caves_plundered_elements.append((cave_to_mine, quantity_mined))
-                    
-                    hunger_bars_balance = hunger_bars_balance - cave_to_mine.material.mining_rate * quantity_mined      #O(1)
-                    emerald_balance += quantity_mined * trader_to_sell[0].buying_price      #O(1)
+                        hunger_bars_balance = hunger_bars_balance - cave.material.mining_rate * quantity_mined      #O(1)
+                        emerald_balance += quantity_mined * trader_to_sell.buying_price          #O(1) we already know the position to index
+                    else:
+                        break
 
                 
                 count += 1
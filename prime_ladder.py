@@ -0,0 +1,105 @@
+""" Prime ladder for sizing tables.
+
+The ladder is the smallest prime at or above every power of two from 2^1
+to 2^40, so consecutive rungs roughly double, as table sizes do when a
+table grows. It is computed once (python prime_ladder.py) and stored in
+prime_ladder.bin as little-endian unsigned 64-bit integers; the file is
+read the first time the ladder is needed, so picking a prime size at
+runtime is a binary search, never a sieve.
+
+Usage:
+```
+next_prime_at_least(1000)   # 1031, the rung for 2^10
+prev_prime_below(1000)      # 521, the rung for 2^9
+```
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from primes import is_probable_prime
+
+LADDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prime_ladder.bin')
+MAX_EXPONENT = 40
+
+_ladder = None      # loaded on first use
+
+
+def build_prime_ladder(max_exponent: int = MAX_EXPONENT) -> array:
+    """
+        Computes the smallest prime >= 2^k for k = 1 .. max_exponent.
+        Uses Miller-Rabin only (exact in this range), so building the
+        ladder never touches the shared sieve.
+        :complexity: O(max_exponent * gap) Miller-Rabin tests
+    """
+    ladder = array('Q')
+    for k in range(1, max_exponent + 1):
+        candidate = 1 << k
+        while not is_probable_prime(candidate):
+            candidate += 1
+        ladder.append(candidate)
+    return ladder
+
+
+def write_prime_ladder(path: str = LADDER_PATH) -> None:
+    """ Recomputes the ladder and stores it in the data file. """
+    ladder = build_prime_ladder()
+    if sys.byteorder != 'little':
+        ladder.byteswap()
+    with open(path, 'wb') as file:
+        ladder.tofile(file)
+
+
+def prime_ladder() -> array:
+    """
+        Returns the ladder, reading the data file the first time. If the
+        file is missing the ladder is recomputed (no sieve is needed for it).
+        :complexity: O(1) once loaded
+    """
+    global _ladder
+    if _ladder is None:
+        try:
+            ladder = array('Q')
+            with open(LADDER_PATH, 'rb') as file:
+                ladder.frombytes(file.read())
+            if sys.byteorder != 'little':
+                ladder.byteswap()
+        except OSError:
+            ladder = build_prime_ladder()
+        _ladder = ladder
+    return _ladder
+
+
+def next_prime_at_least(n: int) -> int:
+    """
+        Returns the smallest ladder prime >= n.
+        :complexity: O(log(rungs))
+        :raises ValueError: if n is above the top rung
+    """
+    ladder = prime_ladder()
+    i = bisect_left(ladder, n)
+    if i == len(ladder):
+        raise ValueError('No ladder prime at least {0}'.format(n))
+    return ladder[i]
+
+
+def prev_prime_below(n: int) -> int:
+    """
+        Returns the largest ladder prime < n.
+        :complexity: O(log(rungs))
+        :raises ValueError: if n is at or below the bottom rung
+    """
+    ladder = prime_ladder()
+    i = bisect_left(ladder, n)
+    if i == 0:
+        raise ValueError('No ladder prime below {0}'.format(n))
+    return ladder[i - 1]
+
+
+if __name__ == '__main__':
+    write_prime_ladder()
+    print('{0} primes written to {1}'.format(len(prime_ladder()), LADDER_PATH))
@@ -1,10 +1,150 @@
-""""""
+""" Largest-prime iterator and the prime engine behind it.
+
+Below SIEVE_LIMIT primes are looked up in a sieve of Eratosthenes kept
+for the whole process: a bytearray of is-prime flags that is extended one
+segment at a time (each segment only crossed off by the primes up to its
+square root, already in the sieve), so every number is sieved once, however
+many iterators and calls ask for it. Above SIEVE_LIMIT the engine walks
+down from the bound testing candidates with Miller-Rabin, which is
+deterministic for every n below 3.3 * 10^24 with the bases used.
+"""
 
 from __future__ import annotations
 
 __author__ = ''
 __docformat__ = 'reStructuredText'
 
+from math import gcd
+
+SIEVE_LIMIT = 10 ** 7
+SEGMENT_SIZE = 1 << 16
+
+# Miller-Rabin with these bases is exact for n < 3317044064679887385961981,
+# and with the seven bases of Sinclair for n < 2^64
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MILLER_RABIN_BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+SMALL_PRIMES_PRODUCT = 1
+for _p in SMALL_PRIMES:
+    SMALL_PRIMES_PRODUCT *= _p
+del _p
+
+
+class SegmentedSieve:
+    """ Is-prime flags of [0, limit), extended on demand segment by segment. """
+
+    def __init__(self) -> None:
+        """
+        Sieves the first segment directly.
+        Best and worst case complexity: O(S log log S), S = SEGMENT_SIZE
+        """
+        self.flags = bytearray([1]) * SEGMENT_SIZE
+        self.flags[0] = self.flags[1] = 0
+        for i in range(2, int(SEGMENT_SIZE ** 0.5) + 1):
+            if self.flags[i]:
+                self.flags[i * i::i] = bytes(len(range(i * i, SEGMENT_SIZE, i)))
+
+    def __len__(self) -> int:
+        """ Returns the limit below which numbers are sieved. """
+        return len(self.flags)
+
+    def extend_to(self, limit: int) -> None:
+        """
+        Sieves segments until every number below limit is covered (the
+        sieve at least doubles, so repeated small extensions stay cheap).
+        Best and worst case complexity: O(L log log L) for the new part, L = limit
+        """
+        if limit <= len(self.flags):
+            return
+        limit = max(limit, 2 * len(self.flags))
+        while len(self.flags) < limit:
+            lo = len(self.flags)
+            hi = lo + SEGMENT_SIZE
+            segment = bytearray([1]) * SEGMENT_SIZE
+            p = 2
+            while p * p < hi:       # base primes come from the part already sieved
+                if self.flags[p]:
+                    start = max(p * p, (lo + p - 1) // p * p) - lo
+                    segment[start::p] = bytes(len(range(start, SEGMENT_SIZE, p)))
+                p += 1
+            self.flags.extend(segment)
+
+    def is_prime(self, n: int) -> bool:
+        """ :pre: 0 <= n < len(self) """
+        return self.flags[n] == 1
+
+    def largest_below(self, n: int) -> int:
+        """
+        Returns the largest prime strictly less than n, or -1 if there is none.
+        Best and worst case complexity: O(gap), done by a single rfind in C
+        :pre: n <= len(self)
+        """
+        return self.flags.rfind(1, 0, max(n, 0))
+
+
+SIEVE = SegmentedSieve()        # shared by every caller in the process
+
+
+def is_probable_prime(n: int) -> bool:
+    """
+    Miller-Rabin test, after ruling out small factors. Exact for
+    n < 3.3 * 10^24 (MILLER_RABIN_BASES_64 below 2^64, MILLER_RABIN_BASES above).
+    Best and worst case complexity: O(B * log(n)) multiplications, B = number of bases
+    """
+    if n < 2:
+        return False
+    if n <= SMALL_PRIMES[-1]:
+        return n in SMALL_PRIMES
+    if gcd(n, SMALL_PRIMES_PRODUCT) != 1:     # one C call rules out most composites
+        return False
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in MILLER_RABIN_BASES_64 if n < 1 << 64 else MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 0 or x == 1 or x == n - 1:     # x == 0: base is a multiple of n, says nothing
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n: int) -> bool:
+    """
+    Checks whether n is prime, using the sieve below SIEVE_LIMIT.
+    Best and worst case complexity: O(1) amortised below SIEVE_LIMIT, Miller-Rabin above
+    """
+    if n < SIEVE_LIMIT:
+        if n < 2:
+            return False
+        SIEVE.extend_to(n + 1)
+        return SIEVE.is_prime(n)
+    return is_probable_prime(n)
+
+
+def largest_prime_below(n: int) -> int:
+    """
+    Returns the largest prime strictly less than n.
+    Best and worst case complexity: O(gap) below SIEVE_LIMIT once sieved,
+    O(gap * log(n)) Miller-Rabin steps above it (gap ~ ln(n))
+    :raises ValueError: if n <= 2
+    """
+    if n <= 2:
+        raise ValueError('There is no prime below {0}'.format(n))
+    if n <= SIEVE_LIMIT:
+        SIEVE.extend_to(n)
+        return SIEVE.largest_below(n)
+    candidate = n - 1 if n % 2 == 0 else n - 2
+    while not is_probable_prime(candidate):
+        candidate -= 2
+    return candidate
+
 class LargestPrimeIterator():
     
     """
@@ -25,25 +165,15 @@ class LargestPrimeIterator():
         that is strictly less than the current value of the upper_bound. After the value is computed, the value of upper_bound 
         will be updated by "upper_bound = p * factor".
 
-        Best and worst case complexity: O(N + N*N), N is the upper_bound
+        Uses the shared prime engine instead of sieving every number below upper_bound on every call.
+        Best and worst case complexity: see largest_prime_below
         """
         upper_bound = self.upper_bound
-
-        current_upper_bound = upper_bound 
-        primes_list = []
-
-        if current_upper_bound < 2: #If 1 or 0, no primes
-            primes_list = []
-
-        for i in range(current_upper_bound):
-            primes_list.append(i)
-
-
-        for i in range(2, int(current_upper_bound**0.5)+1): #Only need to check up to sqrt(n)
-            if primes_list[i]: #If true, its a prime 
-                for j in range(i**2, current_upper_bound, i):
-                    primes_list[j] = 0
-        return max(primes_list)
+        if upper_bound <= 2:    # no prime below: as before, the largest number left
+            if upper_bound <= 0:
+                raise ValueError('upper_bound should be positive')
+            return upper_bound - 1
+        return largest_prime_below(upper_bound)
     
 
     def __iter__(self):
@@ -12,12 +12,21 @@ space to hold the references.
 Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
+
+The bulk operations (resized, copy_into, fill and slicing) are done with
+ctypes slice assignment rather than a raw memmove of the pointers: ctypes
+keeps the references of a py_object array alive in the array's own
+_objects, so every copied slot has to go through ctypes to be counted.
+The per-element loop then runs in C instead of through __getitem__ and
+__setitem__.
 """
+from __future__ import annotations
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
+from array import array
 from ctypes import py_object
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Union
 
 T = TypeVar('T')
 
@@ -31,7 +40,7 @@ class ArrayR(Generic[T]):
         if length <= 0:
             raise ValueError("Array length should be larger than 0.")
         self.array = (length * py_object)() # initialises the space
-        self.array[:] =  [None for _ in range(length)]
+        self.array[:] = (None,) * length    # slots start as NULL, which py_object cannot read
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -39,16 +48,124 @@ class ArrayR(Generic[T]):
         """
         return len(self.array)
 
-    def __getitem__(self, index: int) -> T:
-        """ Returns the object in position index.
-        :complexity: O(1)
+    def __getitem__(self, index: Union[int, slice]) -> T:
+        """ Returns the object in position index, or a list of the objects
+        in the slice if index is a slice.
+        :complexity: O(1) for an index, O(len(slice)) for a slice
         :pre: index in between 0 and length - self.array[] checks it
         """
         return self.array[index]
 
-    def __setitem__(self, index: int, value: T) -> None:
-        """ Sets the object in position index to value
+    def __setitem__(self, index: Union[int, slice], value: T) -> None:
+        """ Sets the object in position index to value. If index is a slice,
+        value must be a sequence (e.g., a list or another ArrayR) of the
+        same length as the slice.
+        :complexity: O(1) for an index, O(len(slice)) for a slice
+        :pre: index in between 0 and length - self.array[] checks it
+        """
+        if isinstance(value, ArrayR):
+            value = value.array
+        self.array[index] = value
+
+    def resized(self, new_length: int) -> ArrayR[T]:
+        """ Returns a new array of new_length holding the first
+        min(len(self), new_length) objects of this one, the rest set to None.
+        :complexity: O(new_length)
+        :pre: new_length > 0
+        """
+        result = ArrayR(new_length)
+        self.copy_into(result, 0, 0, min(len(self), new_length))
+        return result
+
+    def copy_into(self, dst: ArrayR[T], src_start: int, dst_start: int, n: int) -> None:
+        """ Copies the n objects starting at src_start into dst starting at
+        dst_start. dst may be this same array (ranges may overlap).
+        :complexity: O(n)
+        :pre: both ranges lie within their arrays
+        """
+        if n <= 0:
+            return
+        if src_start < 0 or src_start + n > len(self) or dst_start < 0 or dst_start + n > len(dst):
+            raise IndexError("Copy range out of bounds.")
+        dst.array[dst_start:dst_start + n] = self.array[src_start:src_start + n]
+
+    def fill(self, value: T, start: int = 0, stop: int = None) -> None:
+        """ Sets every position in [start, stop) to value.
+        :complexity: O(stop - start)
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if stop > start:
+            self.array[start:stop] = (value,) * (stop - start)
+
+
+class ArrayTyped(Generic[T]):
+    """ Array of unboxed machine values (e.g., floats or 64-bit integers).
+
+    The values are stored contiguously in an array.array of the given
+    typecode ('d' for floats, 'q'/'Q' for signed/unsigned 64-bit integers,
+    and so on) and accessed through a memoryview, so slicing gives a view
+    sharing the same memory instead of a copy. The memoryview returned by
+    view() supports the buffer protocol, so e.g. numpy.asarray(a.view())
+    wraps the data without copying it.
+    """
+
+    def __init__(self, length: int, typecode: str = 'd') -> None:
+        """ Creates an array of the given length and typecode, zero-initialised.
+        :complexity: O(length), done by a single allocation in C
+        :pre: length > 0
+        """
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        zeros = bytes(length * array(typecode).itemsize)
+        self.array = memoryview(array(typecode, zeros))
+
+    @classmethod
+    def from_view(cls, view: memoryview) -> ArrayTyped[T]:
+        """ Wraps an existing one-dimensional memoryview without copying it.
+        :complexity: O(1)
+        """
+        result = cls.__new__(cls)
+        result.array = view
+        return result
+
+    @property
+    def typecode(self) -> str:
+        """ Returns the typecode of the values stored in the array.
+        :complexity: O(1)
+        """
+        return self.array.format
+
+    def view(self) -> memoryview:
+        """ Returns the underlying memoryview (shares memory with the array).
+        This is the only way to export the data: ArrayTyped itself does not
+        support the buffer protocol, so use memoryview(a.view()) or
+        numpy.asarray(a.view()), not memoryview(a).
         :complexity: O(1)
+        """
+        return self.array
+
+    def __len__(self) -> int:
+        """ Returns the length of the array
+        :complexity: O(1)
+        """
+        return len(self.array)
+
+    def __getitem__(self, index: Union[int, slice]) -> T:
+        """ Returns the value in position index, or a view if index is a slice.
+        :complexity: O(1), slices are not copied
+        :pre: index in between 0 and length - self.array[] checks it
+        """
+        if isinstance(index, slice):
+            return ArrayTyped.from_view(self.array[index])
+        return self.array[index]
+
+    def __setitem__(self, index: Union[int, slice], value: T) -> None:
+        """ Sets the value in position index to value. If index is a slice,
+        value must be a buffer (e.g., another ArrayTyped view) of the same
+        typecode and length.
+        :complexity: O(1) for an index, O(len(slice)) for a slice
         :pre: index in between 0 and length - self.array[] checks it
         """
+        if isinstance(value, ArrayTyped):
+            value = value.array
         self.array[index] = value
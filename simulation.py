@@ -0,0 +1,139 @@
+""" Headless multi-day runner for the games.
+
+Simulation.run plays a game for a number of days exactly as the usual
+simulate_day() / finish_day() loop would (same phases, same calls to
+RandomGen, so the same outcome), with the game's printing sent to a null
+stream. Every phase of every day is timed, and the run is summarised as
+days per second and the per-day latency percentiles.
+
+Usage:
+```
+result = Simulation.run(SoloGame(), 365, seed=0)
+result.days_per_second
+result.p99
+```
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import contextlib
+import math
+import os
+import time
+from typing import Callable, NamedTuple
+from game import Game
+from random_gen import RandomGen
+
+PHASES = ('deals', 'food', 'selection', 'verification', 'finish_day')
+
+
+class DayReport(NamedTuple):
+    """ What happened on one simulated day. """
+    day: int                        # 0-based
+    phase_times: tuple[float, ...]  # seconds, in PHASES order
+    balances: tuple[float, ...]     # player balances at the end of the day
+
+    @property
+    def elapsed(self) -> float:
+        """ Wall time of the whole day in seconds. """
+        return sum(self.phase_times)
+
+
+class SimulationResult(NamedTuple):
+    """ Summary of a run. """
+    days: int
+    elapsed: float                  # seconds spent in the game, all days
+    phase_totals: dict[str, float]  # seconds per phase, all days
+    days_per_second: float
+    p50: float                      # per-day latency in seconds
+    p99: float
+    balances: tuple[float, ...]     # final player balances
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """
+        Returns the q-th percentile (0 < q <= 100) of a sorted list by the
+        nearest-rank method, so it is always one of the samples.
+        :complexity: O(1)
+        :raises ValueError: if ordered is empty
+    """
+    if len(ordered) == 0:
+        raise ValueError('No samples')
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+class Simulation:
+    """ Runs games for many days without printing, timing every phase. """
+
+    clock = time.perf_counter
+
+    @classmethod
+    def run(cls, game: Game, days: int, seed: int | None,
+            sink: Callable[[DayReport], None] | None = None) -> SimulationResult:
+        """
+            Seeds RandomGen with seed (None seeds from the clock, as
+            RandomGen.set_seed does) and plays days days of game. A game
+            with no materials yet is first initialised with random data, so
+            run(SoloGame(), days, seed) plays the same game as seeding and
+            calling initialise_game() by hand. If given, sink is called with
+            the DayReport of every day as soon as the day is over; only the
+            game's own printing is silenced, so a sink can print.
+            :complexity: O(days * simulate_day) plus O(days * log(days)) for the percentiles
+            :raises ValueError: if days is not positive
+        """
+        if days <= 0:
+            raise ValueError('Days should be positive.')
+        clock = cls.clock
+        RandomGen.set_seed(seed)
+        day_times = []
+        phase_totals = [0.0] * len(PHASES)
+        with open(os.devnull, 'w') as null:
+            quiet = contextlib.redirect_stdout(null)     # only the game is silenced, not the sink
+            if len(game.get_materials()) == 0:
+                with quiet:
+                    game.initialise_game()
+            for day in range(days):
+                with quiet:
+                    t0 = clock()
+                    game.generate_deals()
+                    t1 = clock()
+                    foods = game.offer_food()
+                    t2 = clock()
+                    selection = game.make_selection(foods)
+                    t3 = clock()
+                    game.verify_output_and_update_quantities(*selection)
+                    t4 = clock()
+                    game.finish_day()
+                    t5 = clock()
+
+                phase_times = (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4)
+                for i, phase_time in enumerate(phase_times):
+                    phase_totals[i] += phase_time
+                day_times.append(t5 - t0)
+                if sink is not None:
+                    sink(DayReport(day, phase_times, tuple(game.player_balances())))
+
+        elapsed = sum(day_times)
+        day_times.sort()
+        return SimulationResult(
+            days=days,
+            elapsed=elapsed,
+            phase_totals=dict(zip(PHASES, phase_totals)),
+            days_per_second=days / elapsed if elapsed > 0 else math.inf,
+            p50=percentile(day_times, 50),
+            p99=percentile(day_times, 99),
+            balances=tuple(game.player_balances()),
+        )
+
+
+if __name__ == '__main__':
+    from game import SoloGame, MultiplayerGame
+
+    for game_type in (SoloGame, MultiplayerGame):
+        result = Simulation.run(game_type(), 365, seed=0)
+        print('{0}: {1:.0f} days/s, p50 {2:.3f}ms, p99 {3:.3f}ms'.format(
+            game_type.__name__, result.days_per_second, result.p50 * 1e3, result.p99 * 1e3))
+        for phase, total in result.phase_totals.items():
+            print('    {0:<14} {1:8.3f}s'.format(phase, total))
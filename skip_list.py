@@ -0,0 +1,178 @@
+""" Indexable skip list implemented on top of the SortedMap ADT.
+
+The keys are kept in a sorted linked list, with extra "express" links on
+higher levels: a node is on level l + 1 with probability 1/2 if it is on
+level l, so a search skips about half the remaining nodes per level and
+takes O(log(N)) expected steps. Every link also stores how many positions
+it jumps over (its width), which gives rank-based access for
+range_between in O(log(N)) expected as well.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import random
+from typing import TypeVar, Generic, Iterator
+from node import SkipListNode
+from sorted_map import SortedMap
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class SkipList(SortedMap, Generic[K, I]):
+    """ Randomised sorted linked list with express levels. """
+
+    MAX_LEVEL = 32
+
+    def __init__(self, seed: int = None) -> None:
+        """
+            Initialises an empty skip list. Levels are drawn from a
+            generator of its own, seeded with seed.
+            :complexity: O(MAX_LEVEL)
+        """
+        self.head = SkipListNode(None, None, self.MAX_LEVEL)
+        self.level = 1          # number of levels in use
+        self.length = 0
+        self.rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def random_level(self) -> int:
+        """ Returns the number of levels of a new node. """
+        level = 1
+        while level < self.MAX_LEVEL and self.rng.random() < 0.5:
+            level += 1
+        return level
+
+    def find_chain(self, key: K) -> tuple[list, list]:
+        """
+            Returns, for every level in use, the last node with a key
+            smaller than key and the number of positions walked on that
+            level to reach it.
+            :complexity: O(log(N)) expected
+        """
+        chain = [None] * self.level
+        steps = [0] * self.level
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            while node.forward[level] is not None and node.forward[level].key < key:
+                steps[level] += node.width[level]
+                node = node.forward[level]
+            chain[level] = node
+        return chain, steps
+
+    def __getitem__(self, key: K) -> I:
+        """
+            :complexity: O(log(N)) expected
+            :raises KeyError: if key is not in the skip list
+        """
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            while node.forward[level] is not None and node.forward[level].key < key:
+                node = node.forward[level]
+        node = node.forward[0]
+        if node is None or node.key != key:
+            raise KeyError('Key not found: {0}'.format(key))
+        return node.item
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            Links a new node in after the nodes found by find_chain, splitting
+            the widths of the links it cuts.
+            :complexity: O(log(N)) expected
+            :raises ValueError: if key is already in the skip list
+        """
+        chain, steps = self.find_chain(key)
+        following = chain[0].forward[0]
+        if following is not None and following.key == key:
+            raise ValueError('Inserting duplicate item')
+
+        levels = self.random_level()
+        while self.level < levels:      # new levels start as one link from head to the end
+            self.head.forward[self.level] = None
+            self.head.width[self.level] = self.length + 1
+            chain.append(self.head)
+            steps.append(0)
+            self.level += 1
+
+        node = SkipListNode(key, item, levels)
+        walked = 0      # positions from chain[level] to the new node's predecessor
+        for level in range(levels):
+            previous = chain[level]
+            node.forward[level] = previous.forward[level]
+            previous.forward[level] = node
+            node.width[level] = previous.width[level] - walked
+            previous.width[level] = walked + 1
+            walked += steps[level]
+        for level in range(levels, self.level):
+            chain[level].width[level] += 1
+        self.length += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+            :complexity: O(log(N)) expected
+            :raises ValueError: if key is not in the skip list
+        """
+        chain, _ = self.find_chain(key)
+        node = chain[0].forward[0]
+        if node is None or node.key != key:
+            raise ValueError('Deleting non-existent item')
+        levels = len(node.forward)
+        for level in range(levels):
+            previous = chain[level]
+            previous.width[level] += node.width[level] - 1
+            previous.forward[level] = node.forward[level]
+        for level in range(levels, self.level):
+            chain[level].width[level] -= 1
+        self.length -= 1
+
+    def select_node(self, k: int) -> SkipListNode:
+        """
+            Returns the node with the k-th smallest key (0-based), walking
+            the widths down from the top level.
+            :complexity: O(log(N)) expected
+        """
+        node = self.head
+        remaining = k + 1
+        for level in range(self.level - 1, -1, -1):
+            while node.forward[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.forward[level]
+        return node
+
+    def items(self) -> Iterator[tuple[K, I]]:
+        """ Lazily yields the (key, item) pairs in key order. """
+        node = self.head.forward[0]
+        while node is not None:
+            yield (node.key, node.item)
+            node = node.forward[0]
+
+    def range_between(self, i: int, j: int) -> list[I]:
+        """
+            Returns the items of the keys ranked i to j (0-based, inclusive).
+            :complexity: O(log(N) + j - i) expected
+        """
+        elements = []
+        i = max(i, 0)
+        if i > j or i >= self.length:
+            return elements
+        node = self.select_node(i)
+        while node is not None and i <= j:
+            elements.append(node.item)
+            node = node.forward[0]
+            i += 1
+        return elements
+
+    def max_item(self) -> tuple[K, I]:
+        if self.length == 0:
+            raise IndexError('Empty skip list')
+        node = self.select_node(self.length - 1)
+        return (node.key, node.item)
+
+    def min_item(self) -> tuple[K, I]:
+        if self.length == 0:
+            raise IndexError('Empty skip list')
+        node = self.head.forward[0]
+        return (node.key, node.item)
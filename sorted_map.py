@@ -0,0 +1,100 @@
+"""
+    Sorted map ADT. Defines a generic abstract map with unique, ordered
+    keys: the part of the AVLTree API the game relies on, so that any
+    ordered-map backend (AVLTree, Treap, SkipList, BTree) can be used
+    where only that API is needed.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from abc import ABC, abstractmethod
+from typing import TypeVar, Generic, Iterable, Iterator
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class SortedMap(ABC, Generic[K, I]):
+    """ Abstract class for a map with unique keys kept in sorted order. """
+
+    @classmethod
+    def from_items(cls, pairs: Iterable[tuple[K, I]], **options) -> SortedMap[K, I]:
+        """ Returns a map holding the given (key, item) pairs. Backends
+            with a faster bulk load override this.
+            :complexity: O(N * insertion), plus O(N * log(N)) for the sort
+            :raises ValueError: if a key is repeated
+        """
+        result = cls(**options)
+        for key, item in sorted(pairs, key=lambda pair: pair[0]):
+            result[key] = item
+        return result
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """ Returns the number of keys in the map. """
+        pass
+
+    def is_empty(self) -> bool:
+        """ True if the map is empty. """
+        return len(self) == 0
+
+    @abstractmethod
+    def __getitem__(self, key: K) -> I:
+        """ Returns the item stored under key.
+            :raises KeyError: if key is not in the map
+        """
+        pass
+
+    @abstractmethod
+    def __setitem__(self, key: K, item: I) -> None:
+        """ Stores item under a new key.
+            :raises ValueError: if key is already in the map
+        """
+        pass
+
+    @abstractmethod
+    def __delitem__(self, key: K) -> None:
+        """ Removes key and its item.
+            :raises ValueError: if key is not in the map
+        """
+        pass
+
+    def __contains__(self, key: K) -> bool:
+        """ True if key is in the map. """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[K]:
+        """ Yields the keys in sorted order. """
+        for key, _ in self.items():
+            yield key
+
+    @abstractmethod
+    def items(self) -> Iterator[tuple[K, I]]:
+        """ Yields the (key, item) pairs in key order. """
+        pass
+
+    @abstractmethod
+    def range_between(self, i: int, j: int) -> list[I]:
+        """ Returns the items of the keys ranked i to j (0-based, both
+            included) in key order.
+        """
+        pass
+
+    @abstractmethod
+    def max_item(self) -> tuple[K, I]:
+        """ Returns the (key, item) pair with the largest key.
+            :raises IndexError: if the map is empty
+        """
+        pass
+
+    @abstractmethod
+    def min_item(self) -> tuple[K, I]:
+        """ Returns the (key, item) pair with the smallest key.
+            :raises IndexError: if the map is empty
+        """
+        pass
@@ -7,7 +7,8 @@ __author__ = 'Maria Garcia de la Banda, modified by Brendon Taylor and Alexey Ig
 __docformat__ = 'reStructuredText'
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterable
+from referential_array import ArrayR
 T = TypeVar('T')
 
 
@@ -47,4 +48,137 @@ class Stack(ABC, Generic[T]):
 
     def clear(self):
         """ Clears all elements from the stack. """
-        self.length = 0
\ No newline at end of file
+        self.length = 0
+
+
+class ArrayStack(Stack[T]):
+    """ Implementation of a stack with an ArrayR that grows as needed.
+
+        The array doubles when a push finds it full, so pushes are O(1)
+        amortised and never allocate anything but the occasional new
+        array. With shrink=True it also halves once it is a quarter full
+        (never below its initial capacity), so a stack that was once large
+        does not keep its memory.
+
+        Attributes:
+            length (int): number of elements in the stack (inherited)
+            array (ArrayR[T]): the elements, bottom first
+            capacity (int): len(array)
+    """
+
+    MIN_CAPACITY = 1
+
+    def __init__(self, capacity: int = 16, shrink: bool = False) -> None:
+        """ Object initializer.
+            :complexity: O(capacity)
+        """
+        Stack.__init__(self)
+        self.min_capacity = max(self.MIN_CAPACITY, capacity)
+        self.array = ArrayR(self.min_capacity)
+        self.capacity = self.min_capacity
+        self.shrink = shrink
+
+    def clear(self) -> None:
+        """ Resets the stack, dropping the references it held.
+            :complexity: O(len(self))
+        """
+        self.array.fill(None, 0, self.length)
+        super().clear()
+
+    def is_empty(self) -> bool:
+        """ Returns whether the stack is empty
+            :complexity: O(1)
+        """
+        return self.length == 0
+
+    def is_full(self) -> bool:
+        """ Returns whether the stack is full: never, it grows.
+            :complexity: O(1)
+        """
+        return False
+
+    def resize(self, capacity: int) -> None:
+        """ Moves the elements to a new array of the given capacity.
+            :complexity: O(capacity)
+        """
+        self.array = self.array.resized(capacity)
+        self.capacity = capacity
+
+    def push(self, item: T) -> None:
+        """ Pushes an element to the top of the stack.
+            :complexity: O(1) amortised, O(N) when the array doubles
+        """
+        if self.length == self.capacity:
+            self.resize(2 * self.capacity)
+        self.array[self.length] = item
+        self.length += 1
+
+    def pop(self) -> T:
+        """ Pops the element at the top of the stack.
+            :pre: stack is not empty
+            :complexity: O(1) amortised, O(N) when the array shrinks
+            :raises Exception: if the stack is empty
+        """
+        if self.is_empty():
+            raise Exception('Stack is empty')
+        self.length -= 1
+        item = self.array[self.length]
+        self.array[self.length] = None
+        if self.shrink:
+            self.shrink_if_sparse()
+        return item
+
+    def peek(self) -> T:
+        """ Returns the element at the top, without popping it from stack.
+            :pre: stack is not empty
+            :complexity: O(1)
+            :raises Exception: if the stack is empty
+        """
+        if self.is_empty():
+            raise Exception('Stack is empty')
+        return self.array[self.length - 1]
+
+    def push_many(self, items: Iterable[T]) -> None:
+        """ Pushes every element of items, in order (the last one ends up
+            on top), growing the array at most once.
+            :complexity: O(len(items)) amortised
+        """
+        items = list(items)
+        needed = self.length + len(items)
+        if needed > self.capacity:
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            self.resize(capacity)
+        self.array[self.length:needed] = items
+        self.length = needed
+
+    def pop_many(self, n: int) -> list[T]:
+        """ Pops the n elements at the top, returned in the order pop()
+            would have returned them (top first).
+            :pre: 0 <= n <= len(self)
+            :complexity: O(n) amortised
+            :raises Exception: if the stack has fewer than n elements
+        """
+        if n < 0 or n > self.length:
+            raise Exception('Stack has fewer than {0} elements'.format(n))
+        start = self.length - n
+        items = self.array[start:self.length]
+        items.reverse()
+        self.array.fill(None, start, self.length)
+        self.length = start
+        self.shrink_if_sparse()
+        return items
+
+    def shrink_if_sparse(self) -> None:
+        """ Halves the array, if shrinking, while it is at most a quarter
+            full and above its initial capacity.
+            :complexity: O(N) when it shrinks, O(1) otherwise
+        """
+        if not self.shrink:
+            return
+        capacity = self.capacity
+        while capacity // 2 >= self.min_capacity and self.length <= capacity // 4:
+            capacity //= 2
+        if capacity != self.capacity:
+            self.resize(capacity)
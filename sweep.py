@@ -0,0 +1,176 @@
+""" Monte Carlo sweeps: one game per RandomGen seed, across processes.
+
+The seeds are cut into chunks and every chunk is played by a worker
+process of a ProcessPoolExecutor, with Simulation.run. Each game only
+depends on its seed (RandomGen is reseeded for every game and the game
+uses no other source of randomness, nor Python's string hashing), so a
+seed gives the same SeedSummary in any process, in any order. Summaries
+are streamed back to an aggregator as chunks finish; the aggregator
+keeps them by seed and computes its statistics in seed order, so the
+result of a parallel sweep is bit-identical to a serial one.
+
+Usage:
+```
+results = sweep(MultiplayerGame, 100, range(1000))
+results.mean_final_total()
+results.failures()
+```
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, NamedTuple
+from game import Game
+from simulation import Simulation
+
+
+class SeedSummary(NamedTuple):
+    """ Outcome of the game played with one seed. """
+    seed: int
+    days_played: int
+    balances: tuple[float, ...]         # player balances after the last day played
+    emeralds_per_day: tuple[float, ...] # total emeralds of all players at the end of every day
+    error: str | None                   # repr of the exception that ended the game early, if any
+
+
+def play_seed(game_type: type[Game], days: int, seed: int) -> SeedSummary:
+    """
+        Plays a fresh game_type for days days with seed. A game that raises
+        (the game itself can, e.g. when the solo player cannot afford any
+        food) ends there and is summarised up to its last full day.
+        :complexity: O(Simulation.run)
+    """
+    totals = []
+    balances = ()
+
+    def record(report) -> None:
+        nonlocal balances
+        balances = report.balances
+        totals.append(sum(report.balances))
+
+    error = None
+    try:
+        Simulation.run(game_type(), days, seed, sink=record)
+    except Exception as exception:
+        error = repr(exception)
+    return SeedSummary(seed, len(totals), balances, tuple(totals), error)
+
+
+def play_chunk(game_type: type[Game], days: int, seeds: list[int]) -> list[SeedSummary]:
+    """ Plays one game per seed; the unit of work of a worker process. """
+    return [play_seed(game_type, days, seed) for seed in seeds]
+
+
+class SweepAggregator:
+    """ Collects the summaries of a sweep, whatever order they come in. """
+
+    def __init__(self, days: int) -> None:
+        self.days = days
+        self.by_seed = {}
+
+    def add(self, summary: SeedSummary) -> None:
+        """
+            :complexity: O(1)
+            :raises ValueError: if the seed was already added
+        """
+        if summary.seed in self.by_seed:
+            raise ValueError('Seed {0} already added'.format(summary.seed))
+        self.by_seed[summary.seed] = summary
+
+    def __len__(self) -> int:
+        return len(self.by_seed)
+
+    def summaries(self) -> list[SeedSummary]:
+        """
+            Returns the summaries in seed order.
+            :complexity: O(S * log(S)) for S seeds
+        """
+        return [self.by_seed[seed] for seed in sorted(self.by_seed)]
+
+    def completed(self) -> list[SeedSummary]:
+        """ Returns the summaries of the games that played every day, in seed order. """
+        return [summary for summary in self.summaries() if summary.error is None]
+
+    def failures(self) -> dict[int, str]:
+        """ Returns the error of every game that ended early, by seed. """
+        return {summary.seed: summary.error for summary in self.summaries() if summary.error is not None}
+
+    def mean_final_total(self) -> float:
+        """
+            Returns the mean total emeralds of the players at the end of
+            the completed games (nan if there are none).
+            :complexity: O(S * log(S) + S * P)
+        """
+        completed = self.completed()
+        if len(completed) == 0:
+            return math.nan
+        return sum(summary.emeralds_per_day[-1] for summary in completed) / len(completed)
+
+    def mean_emeralds_per_day(self) -> list[float]:
+        """
+            Returns, for every day, the mean total emeralds of the players
+            over the completed games.
+            :complexity: O(S * log(S) + S * days)
+        """
+        completed = self.completed()
+        if len(completed) == 0:
+            return []
+        return [sum(summary.emeralds_per_day[day] for summary in completed) / len(completed)
+                for day in range(self.days)]
+
+
+def chunked(seeds: list[int], size: int) -> list[list[int]]:
+    """ Cuts seeds into consecutive chunks of at most size seeds. """
+    return [seeds[i:i + size] for i in range(0, len(seeds), size)]
+
+
+def sweep(game_type: type[Game], days: int, seeds: Iterable[int], workers: int | None = None,
+          chunk_size: int | None = None, aggregator: SweepAggregator | None = None) -> SweepAggregator:
+    """
+        Plays game_type for days days once per seed and adds every
+        SeedSummary to aggregator (a new SweepAggregator by default), which
+        is returned. workers defaults to the number of CPUs; with one
+        worker the games are played in this process, without a pool. The
+        default chunk_size gives every worker about 4 chunks, which keeps
+        them busy to the end without paying for a task per seed.
+        :complexity: O(S * Simulation.run / workers)
+        :raises ValueError: if workers or chunk_size is not positive
+    """
+    seeds = list(seeds)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers <= 0:
+        raise ValueError('Workers should be positive.')
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(seeds) / (workers * 4)))
+    elif chunk_size <= 0:
+        raise ValueError('Chunk size should be positive.')
+    if aggregator is None:
+        aggregator = SweepAggregator(days)
+
+    if workers == 1:
+        for seed in seeds:
+            aggregator.add(play_seed(game_type, days, seed))
+        return aggregator
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_chunk, game_type, days, chunk) for chunk in chunked(seeds, chunk_size)]
+        for future in as_completed(futures):
+            for summary in future.result():
+                aggregator.add(summary)
+    return aggregator
+
+
+if __name__ == '__main__':
+    import time
+    from game import SoloGame, MultiplayerGame
+
+    for game_type in (SoloGame, MultiplayerGame):
+        start = time.perf_counter()
+        results = sweep(game_type, 100, range(200))
+        elapsed = time.perf_counter() - start
+        print('{0}: {1} seeds in {2:.2f}s, {3} failed, mean final total {4:.2f}'.format(
+            game_type.__name__, len(results), elapsed, len(results.failures()), results.mean_final_total()))
@@ -0,0 +1,78 @@
+from aggregate_avl import AggregateAVLTree, Monoid
+import random
+import unittest
+
+
+class TestAggregateAVL(unittest.TestCase):
+    """ Testing sub-tree aggregates. """
+
+    def make_tree(self, **options) -> AggregateAVLTree:
+        return AggregateAVLTree(aggregates={
+            'total': Monoid.sum(lambda key, item: item),
+            'largest': Monoid.max(lambda key, item: item),
+            'smallest': Monoid.min(lambda key, item: item),
+            'keys': Monoid(lambda a, b: a + b, (), lambda key, item: (key,)),  # not commutative
+        }, **options)
+
+    def check(self, tree: AggregateAVLTree, contents: dict) -> None:
+        self.assertEqual(tree.aggregate('total'), sum(contents.values()))
+        self.assertEqual(tree.aggregate('keys'), tuple(sorted(contents)))
+        for _ in range(30):
+            lo, hi = random.randint(-10, 210), random.randint(-10, 210)
+            inclusive = (random.random() < 0.5, random.random() < 0.5)
+            values = [contents[key] for key in sorted(contents)
+                      if (key > lo or (inclusive[0] and key == lo)) and (key < hi or (inclusive[1] and key == hi))]
+            self.assertEqual(tree.range_aggregate('total', lo, hi, inclusive), sum(values))
+            self.assertEqual(tree.range_aggregate('largest', lo, hi, inclusive), max(values, default=float('-inf')))
+            self.assertEqual(tree.range_aggregate('smallest', lo, hi, inclusive), min(values, default=float('inf')))
+        self.assertEqual(tree.range_aggregate('total', lo=100), sum(v for k, v in contents.items() if k >= 100))
+
+    def test_random_updates(self):
+        random.seed(16)
+        tree = self.make_tree(recycle_nodes=True)
+        contents = {}
+        for _ in range(600):
+            key = random.randint(0, 200)
+            if key in contents:
+                del tree[key]
+                del contents[key]
+            else:
+                contents[key] = random.randint(-50, 50)
+                tree[key] = contents[key]
+        self.check(tree, contents)
+
+    def test_bulk_load_and_refresh(self):
+        contents = {key: key * 3 % 17 for key in range(0, 200, 3)}
+        tree = AggregateAVLTree.from_items([(key, [value]) for key, value in contents.items()],
+                                           aggregates={'total': Monoid.sum(lambda key, item: item[0])})
+        self.assertEqual(tree.aggregate('total'), sum(contents.values()))
+        tree[30][0] += 100  # changed in place
+        tree.refresh(30)
+        self.assertEqual(tree.aggregate('total'), sum(contents.values()) + 100)
+        self.assertRaises(KeyError, tree.refresh, 31)
+        self.assertRaises(KeyError, tree.aggregate, 'nothing')
+
+    def test_rekey(self):
+        random.seed(16)
+        tree = self.make_tree()
+        contents = {}
+        for key in random.sample(range(0, 200, 2), 60):
+            contents[key] = random.randint(-50, 50)
+            tree[key] = contents[key]
+        for _ in range(100):
+            old_key = random.choice(list(contents))
+            new_key = old_key + random.choice([-1, 1, 51])
+            if new_key in contents or not 0 <= new_key <= 200:
+                continue
+            contents[new_key] = contents.pop(old_key) + 1
+            tree.rekey(old_key, contents[new_key], new_key)
+        self.check(tree, contents)
+
+    def test_empty(self):
+        tree = self.make_tree()
+        self.assertEqual(tree.aggregate('total'), 0)
+        self.assertEqual(tree.range_aggregate('largest', 1, 5), float('-inf'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-from avl import AVLTree
+from avl import AVLTree, AVLMultiMap
 from node import TreeNode, AVLTreeNode
 import math
 import random
@@ -133,6 +133,165 @@ class TestAVL(unittest.TestCase):
             # print(f"balance:   {self.get_height(tree.root.right) - self.get_height(tree.root.left)}")
             self.assertTrue(self.check_balance(tree.root), 'The tree is unbalanced!')
 
+    def check_augmentation(self, current: AVLTreeNode) -> tuple:
+        """ Checks the stored height and size of every node, returns both. """
+        if current is None:
+            return (0, 0)
+        left_height, left_size = self.check_augmentation(current.left)
+        right_height, right_size = self.check_augmentation(current.right)
+        self.assertEqual(current.height, 1 + max(left_height, right_height), 'Wrong height at {0}'.format(current))
+        self.assertEqual(current.size, 1 + left_size + right_size, 'Wrong size at {0}'.format(current))
+        self.assertIn(right_height - left_height, (-1, 0, 1), 'Unbalanced at {0}'.format(current))
+        return (current.height, current.size)
+
+    def testHeightAndSizeMaintained(self):
+        numbers = list(range(1, 300))
+        for attempt in range(10):
+            with self.subTest(attempt):
+                random.shuffle(numbers)
+                tree = AVLTree()
+                for num in numbers:
+                    tree[num] = num
+                self.check_augmentation(tree.root)
+                to_delete = numbers[:200]
+                random.shuffle(to_delete)
+                for n in to_delete:
+                    del tree[n]
+                    self.assertNotIn(n, tree)
+                self.check_augmentation(tree.root)
+                self.assertEqual(len(tree), len(numbers) - 200)
+                self.assertEqual(list(tree), sorted(numbers[200:]))
+
+    def testDuplicateAndMissing(self):
+        tree = AVLTree()
+        for num in [5, 3, 8]:
+            tree[num] = num
+        self.assertRaises(ValueError, tree.__setitem__, 3, 3)
+        self.assertRaises(ValueError, tree.__delitem__, 4)
+        self.assertEqual(len(tree), 3)
+        self.check_augmentation(tree.root)
+
+    def testNodeRecycling(self):
+        tree = AVLTree(recycle_nodes=True)
+        for num in range(50):
+            tree[num] = num
+        for num in range(0, 50, 2):
+            del tree[num]
+        self.assertEqual(len(tree.free_nodes), 25)
+        for node in tree.free_nodes:
+            self.assertIsNone(node.item)
+        for num in range(100, 110):
+            tree[num] = num
+        self.assertEqual(len(tree.free_nodes), 15)
+        self.check_augmentation(tree.root)
+        self.assertEqual(list(tree), list(range(1, 50, 2)) + list(range(100, 110)))
+        self.assertEqual(tree[105], 105)
+        tree.clear_free_list()
+        self.assertEqual(tree.free_nodes, [])
+
+        plain = AVLTree()
+        plain[1] = 1
+        del plain[1]
+        self.assertEqual(plain.free_nodes, [])
+
+    def testKeyFunctionAndTieBreak(self):
+        words = ['pear', 'fig', 'apple', 'kiwi', 'plum', 'date']
+        tree = AVLTree(key=len, tie_break=True)
+        stored = [tree.add(word) for word in words]
+        self.assertEqual(len(tree), 6)
+        self.assertEqual(stored[0], (4, 0))
+        self.assertEqual(list(tree.values()), ['fig', 'pear', 'kiwi', 'plum', 'date', 'apple'])
+        del tree[stored[3]]
+        self.assertEqual(tree[stored[4]], 'plum')
+        self.assertEqual(tree.select(1).item, 'pear')
+        tree[4] = 'lime'  # explicit keys are tie-broken too
+        self.assertEqual(list(tree.values()), ['fig', 'pear', 'plum', 'date', 'lime', 'apple'])
+        self.check_augmentation(tree.root)
+
+        by_length = AVLTree(key=len)
+        self.assertEqual(by_length.add('fig'), 3)
+        self.assertRaises(ValueError, by_length.add, 'yew')
+
+    def make_tree(self, keys) -> AVLTree:
+        tree = AVLTree()
+        for key in keys:
+            tree[key] = str(key)
+        return tree
+
+    def testSplitAndJoin(self):
+        numbers = random.sample(range(500), 200)
+        for pivot in (-1, 0, 137, numbers[0], 250.5, 499, 600):
+            with self.subTest(pivot):
+                tree = self.make_tree(numbers)
+                left, right = tree.split(pivot)
+                self.assertEqual(len(tree), 0)
+                self.assertEqual(list(left), sorted(n for n in numbers if n < pivot))
+                self.assertEqual(list(right), sorted(n for n in numbers if n >= pivot))
+                self.assertEqual(len(left) + len(right), 200)
+                self.check_augmentation(left.root)
+                self.check_augmentation(right.root)
+                joined = AVLTree.join(left, right)
+                self.assertEqual(list(joined), sorted(numbers))
+                self.assertEqual(len(joined), 200)
+                self.check_augmentation(joined.root)
+                self.assertEqual(len(left), 0)
+        self.assertRaises(ValueError, AVLTree.join, self.make_tree([1, 5]), self.make_tree([3]))
+
+    def testUnionAndDifference(self):
+        for attempt in range(10):
+            with self.subTest(attempt):
+                a_keys = set(random.sample(range(300), random.randint(0, 150)))
+                b_keys = set(random.sample(range(300), random.randint(0, 20)))
+                a, b = self.make_tree(a_keys), self.make_tree(b_keys)
+                a.difference(b)
+                self.assertEqual(list(a), sorted(a_keys - b_keys))
+                self.assertEqual(list(b), sorted(b_keys))
+                self.check_augmentation(a.root)
+                a.union(b)
+                self.assertEqual(list(a), sorted(a_keys | b_keys))
+                self.assertEqual(len(a), len(a_keys | b_keys))
+                self.assertEqual(len(b), 0)
+                self.check_augmentation(a.root)
+
+    def testPopAndRekey(self):
+        numbers = random.sample(range(1000), 300)
+        tree = self.make_tree(numbers)
+        contents = {num: str(num) for num in numbers}
+        for attempt in range(300):
+            old_key = random.choice(list(contents))
+            new_key = old_key + random.choice([-3, -1, 0, 1, 2, 500]) + 0.5 * random.randint(0, 1)
+            if new_key in contents and new_key != old_key:
+                self.assertRaises(ValueError, tree.rekey, old_key, 'x', new_key)
+                continue
+            tree.rekey(old_key, 'moved', new_key)
+            del contents[old_key]
+            contents[new_key] = 'moved'
+        self.assertEqual(list(tree.items()), sorted(contents.items()))
+        self.assertEqual(len(tree), len(contents))
+        self.check_augmentation(tree.root)
+        self.assertRaises(KeyError, tree.rekey, min(contents) - 1, 'x', 5)
+
+        tied = AVLTree(tie_break=True)
+        first = tied.add(5)
+        second = tied.add(5)
+        moved = tied.rekey(first, 5, 7)
+        self.assertEqual(moved[0], 7)
+        self.assertEqual(tied[moved], 5)
+        self.assertEqual(tied.rekey(moved, 5, 1)[0], 1)
+        self.assertEqual([key[0] for key in tied], [1, 5])
+        self.assertIn(second, tied)
+
+        ordered = sorted(contents.items())
+        self.assertEqual(tree.pop_max(), ordered.pop())
+        self.assertEqual(tree.pop_min(), ordered.pop(0))
+        self.assertEqual(tree.pop_min(), ordered.pop(0))
+        self.assertEqual(list(tree.items()), ordered)
+        self.check_augmentation(tree.root)
+        while len(tree) > 0:
+            tree.pop_max()
+        self.assertRaises(IndexError, tree.pop_max)
+        self.assertRaises(IndexError, tree.pop_min)
+
     def test_range_between(self):
         random.seed(16)
         numbers = list(range(1, 100))
@@ -143,6 +302,119 @@ class TestAVL(unittest.TestCase):
 
         self.assertEqual(tree.range_between(1, 5), [2, 3, 4, 5, 6], "Range between failed")
 
+        numbers = random.sample(range(1000), 300)
+        tree = self.make_tree(numbers)
+        numbers.sort()
+        for i, j in [(0, 0), (0, 299), (0, 400), (150, 151), (17, 93), (299, 299), (298, 310), (300, 305)]:
+            with self.subTest((i, j)):
+                self.assertEqual(tree.range_between(i, j), [str(num) for num in numbers[i:j + 1]])
+                self.assertEqual(list(tree), numbers)   # every thread removed
+                self.check_augmentation(tree.root)
+
+
+    def test_order_statistics(self):
+        numbers = random.sample(range(0, 1000, 2), 200)
+        tree = AVLTree()
+        for num in numbers:
+            tree[num] = str(num)
+        numbers.sort()
+        for k, num in enumerate(numbers):
+            node = tree.select(k)
+            self.assertEqual((node.key, node.item), (num, str(num)))
+            self.assertEqual(tree.rank(num), k)
+            self.assertEqual(tree.rank(num + 1), k + 1)  # odd keys are absent
+        self.assertRaises(IndexError, tree.select, 200)
+        self.assertRaises(IndexError, tree.select, -1)
+        self.assertEqual(tree.count_between(numbers[10], numbers[20]), 11)
+        self.assertEqual(tree.count_between(numbers[10] + 1, numbers[20] - 1), 9)
+        self.assertEqual(tree.count_between(-5, 2000), 200)
+        self.assertEqual(tree.count_between(5, 1), 0)
+
+
+    def test_bulk_load(self):
+        for n in (0, 1, 2, 7, 100, 257):
+            with self.subTest(n):
+                numbers = list(range(n))
+                tree = AVLTree.from_sorted([(num, str(num)) for num in numbers])
+                self.assertEqual(len(tree), n)
+                self.assertEqual(list(tree), numbers)
+                self.check_augmentation(tree.root)
+                if n > 0:
+                    self.assertLessEqual(tree.root.height, math.floor(math.log2(n)) + 1)
+                random.shuffle(numbers)
+                tree = AVLTree.from_items([(num, str(num)) for num in numbers])
+                self.assertEqual(list(tree), sorted(numbers))
+                tree[n] = str(n)  # still a normal AVL tree afterwards
+                self.check_augmentation(tree.root)
+        self.assertRaises(ValueError, AVLTree.from_sorted, [(2, 'a'), (1, 'b')])
+        self.assertRaises(ValueError, AVLTree.from_items, [(1, 'a'), (1, 'b')])
+
+    def test_bulk_load_tie_break(self):
+        tree = AVLTree.from_items([(2.0, 'c'), (1.0, 'a'), (1.0, 'b')], tie_break=True)
+        self.assertEqual(list(tree), [(1.0, 0), (1.0, 1), (2.0, 2)])
+        self.assertEqual(list(tree.values()), ['a', 'b', 'c'])
+        tree[1.0] = 'd'     # later inserts are tie-broken after the bulk-loaded keys
+        self.assertEqual(list(tree.values()), ['a', 'b', 'd', 'c'])
+        self.check_augmentation(tree.root)
+
+
+class TestAVLMultiMap(unittest.TestCase):
+    """ Testing the AVL tree with duplicate keys. """
+
+    def test_buckets(self):
+        tree = AVLMultiMap()
+        for key, item in [(2, 'a'), (1, 'b'), (2, 'c'), (3, 'd'), (2, 'e')]:
+            tree[key] = item
+        self.assertEqual(len(tree), 3)
+        self.assertEqual(list(tree[2]), ['a', 'c', 'e'])
+        self.assertEqual(list(tree[1]), ['b'])
+        self.assertEqual(tree.root.size, 3)
+
+    def test_bulk_load(self):
+        tree = AVLMultiMap.from_items([(2, 'a'), (1, 'b'), (2, 'c'), (3, 'd'), (2, 'e')])
+        self.assertEqual(len(tree), 3)
+        self.assertEqual(list(tree[2]), ['a', 'c', 'e'])
+        self.assertEqual(tree.root.size, 3)
+        tree[1] = 'f'
+        self.assertEqual(list(tree[1]), ['b', 'f'])
+
+    def test_add(self):
+        tree = AVLMultiMap(key=len)
+        self.assertEqual(tree.add('fig'), 3)
+        self.assertEqual(tree.add('yew'), 3)
+        tree.add('pear')
+        self.assertEqual([(key, list(bucket)) for key, bucket in tree.items()], [(3, ['fig', 'yew']), (4, ['pear'])])
+        self.assertRaises(ValueError, AVLMultiMap, key=len, tie_break=True)
+
+    def test_union(self):
+        tree = AVLMultiMap.from_items([(1, 'a'), (2, 'b')])
+        tree.union(AVLMultiMap.from_items([(2, 'c'), (3, 'd')]))
+        self.assertEqual([(key, list(bucket)) for key, bucket in tree.items()], [(1, ['a']), (2, ['b', 'c']), (3, ['d'])])
+
+    def test_pop_and_rekey(self):
+        tree = AVLMultiMap()
+        for key, item in [(2, 'a'), (2, 'b'), (5, 'c'), (7, 'd')]:
+            tree[key] = item
+        self.assertEqual(tree.pop_max(), (7, 'd'))
+        self.assertEqual(tree.pop_min(), (2, 'a'))
+        self.assertEqual(tree.rekey(5, 'c', 4), 4)     # alone in its bucket, renamed in place
+        self.assertEqual([(key, list(bucket)) for key, bucket in tree.items()], [(2, ['b']), (4, ['c'])])
+        self.assertEqual(tree.rekey(4, 'c', 2), 2)     # joins the end of an existing bucket
+        self.assertEqual([(key, list(bucket)) for key, bucket in tree.items()], [(2, ['b', 'c'])])
+        tree.rekey(2, 'c', 9)
+        self.assertEqual([(key, list(bucket)) for key, bucket in tree.items()], [(2, ['b']), (9, ['c'])])
+        self.assertRaises(ValueError, tree.rekey, 2, 'c', 3)
+
+    def test_popleft(self):
+        tree = AVLMultiMap()
+        for key, item in [(2, 'a'), (2, 'b'), (5, 'c')]:
+            tree[key] = item
+        self.assertEqual(tree.popleft(2), 'a')
+        self.assertEqual(tree.popleft(2), 'b')
+        self.assertNotIn(2, tree)
+        self.assertEqual(len(tree), 1)
+        self.assertRaises(KeyError, tree.popleft, 2)
+
 
 if __name__ == '__main__':
     # seeding the pseudo-random generator
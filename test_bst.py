@@ -1,4 +1,5 @@
-from bst import BinarySearchTree
+from bst import BinarySearchTree, BSTInOrderIterator
+from stack_adt import ArrayStack
 from node import TreeNode
 import random
 import unittest
@@ -114,6 +115,83 @@ class TestBST(unittest.TestCase):
             array = [key for key in tree]  # using out treesort
 
             self.assertEqual(array, sorted_array, 'In-Order traversal produces a wrong order: {0}'.format(array))
+    def testRangeIterators(self):
+        numbers = random.sample(range(0, 200, 2), 60)
+        tree = BinarySearchTree()
+        for num in numbers:
+            tree[num] = -num
+        numbers.sort()
+        self.assertEqual(list(tree.items()), [(num, -num) for num in numbers])
+        self.assertEqual(list(tree.values()), [-num for num in numbers])
+        self.assertEqual(list(reversed(tree)), numbers[::-1])
+        for lo, hi in [(None, None), (10, 50), (11, 51), (-5, 300), (50, 10), (None, 40), (40, None)]:
+            for inclusive in [(True, True), (False, False), (True, False), (False, True)]:
+                with self.subTest((lo, hi, inclusive)):
+                    expected = [num for num in numbers
+                                if (lo is None or num > lo or (inclusive[0] and num == lo))
+                                and (hi is None or num < hi or (inclusive[1] and num == hi))]
+                    self.assertEqual(list(tree.irange(lo, hi, inclusive)), expected)
+                    self.assertEqual(list(tree.irange(lo, hi, inclusive, reverse=True)), expected[::-1])
+                    self.assertEqual(list(tree.irange_items(lo, hi, inclusive)), [(num, -num) for num in expected])
+
+    def testRangeIteratorEmpty(self):
+        tree = BinarySearchTree()
+        self.assertEqual(list(tree.items()), [])
+        self.assertEqual(list(tree.irange(1, 5)), [])
+
+    def testIteratorStackType(self):
+        numbers = random.sample(range(1000), 100)
+        tree = BinarySearchTree()
+        for num in numbers:
+            tree[num] = num
+        self.assertEqual(list(BSTInOrderIterator(tree.root, stack_type=ArrayStack)), sorted(numbers))
+
+    def testThreadedIterator(self):
+        numbers = random.sample(range(1000), 200)
+        tree = BinarySearchTree()
+        for num in numbers:
+            tree[num] = num
+        numbers.sort()
+        self.assertEqual(list(tree.threaded_iter()), numbers)
+        self.assertEqual(list(BinarySearchTree().threaded_iter()), [])
+        for stop in (0, 1, 57, 199):
+            with self.subTest(stop):
+                for key in tree.threaded_iter():
+                    if key == numbers[stop]:
+                        break   # abandoned mid-walk, the threads have to go
+                self.assertEqual(list(tree), numbers)
+                self.assertTrue(self.check_invariant(tree.root))
+        iterator = tree.threaded_iter()
+        next(iterator)
+        iterator.close()
+        self.assertEqual(iterator.threads, 0)
+        self.assertRaises(StopIteration, next, iterator)
+        self.assertEqual(list(tree), numbers)
+        unused = tree.threaded_iter()
+        unused.next_threaded = None     # holds no threads, so closing must not walk
+        unused.close()
+        del unused
+
+    def testBoundQueries(self):
+        tree = BinarySearchTree()
+        self.assertIsNone(tree.floor(1))
+        self.assertIsNone(tree.nearest(1))
+        keys = random.sample(range(0, 200, 2), 50)
+        for key in keys:
+            tree[key] = str(key)
+        ordered = sorted(keys)
+        for key in range(-2, 202):
+            with self.subTest(key=key):
+                below = [k for k in ordered if k <= key]
+                above = [k for k in ordered if k >= key]
+                strictly_below = [k for k in ordered if k < key]
+                strictly_above = [k for k in ordered if k > key]
+                for node, expected in ((tree.floor(key), below[-1:]), (tree.ceiling(key), above[:1]),
+                                       (tree.lower(key), strictly_below[-1:]), (tree.higher(key), strictly_above[:1])):
+                    self.assertEqual([] if node is None else [node.key], expected)
+                nearest = min(ordered, key=lambda k: (abs(k - key), k))
+                self.assertEqual(tree.nearest(key).key, nearest)
+
 
 if __name__ == '__main__':
 
@@ -0,0 +1,70 @@
+from avl import AVLTree, AVLMultiMap
+from frozen_index import FrozenSortedIndex
+import random
+import unittest
+
+
+class TestFrozenSortedIndex(unittest.TestCase):
+    """ Testing the read-only sorted index. """
+
+    def test_matches_tree(self):
+        for keys, typecode in [([random.random() for _ in range(200)], 'd'),
+                               (random.sample(range(-500, 500), 200), 'q'),
+                               ([(random.randint(0, 9), n) for n in range(200)], None)]:
+            with self.subTest(typecode):
+                tree = AVLTree.from_items([(key, str(key)) for key in keys])
+                index = tree.freeze()
+                ordered = sorted(keys)
+                self.assertEqual(getattr(index.keys, 'typecode', None), typecode)
+                self.assertEqual(len(index), len(ordered))
+                self.assertEqual(list(index.items()), list(tree.items()))
+                self.assertEqual(list(reversed(index)), ordered[::-1])
+                for k in (0, 17, len(ordered) - 1, -1):
+                    self.assertEqual(index.select_item(k), (ordered[k], str(ordered[k])))
+                self.assertRaises(IndexError, index.select_item, len(ordered))
+                for key in random.sample(ordered, 20):
+                    self.assertEqual(index[key], str(key))
+                    self.assertIn(key, index)
+                    self.assertEqual(index.rank(key), ordered.index(key))
+                    self.assertEqual(index.floor_item(key), (key, str(key)))
+                    lower = tree.lower(key)
+                    self.assertEqual(index.lower_item(key), None if lower is None else (lower.key, lower.item))
+                    higher = tree.higher(key)
+                    self.assertEqual(index.higher_item(key), None if higher is None else (higher.key, higher.item))
+
+    def test_slice(self):
+        index = FrozenSortedIndex((key, -key) for key in range(0, 100, 5))
+        part = index.slice(10, 40, (False, True))
+        self.assertEqual(list(part), [15, 20, 25, 30, 35, 40])
+        self.assertIs(part.keys, index.keys)
+        self.assertEqual(part.select_item(0), (15, -15))
+        self.assertEqual(part.rank(30), 3)
+        self.assertIsNone(part.ceiling_item(41))
+        self.assertNotIn(45, part)
+        self.assertEqual(list(part.slice(hi=20).values()), [-15, -20])
+        self.assertTrue(index.slice(50, 10).is_empty())
+
+    def test_multimap_buckets_are_copied(self):
+        tree = AVLMultiMap()
+        tree[1] = 'a'
+        tree[2] = 'c'
+        index = tree.freeze()
+        tree[1] = 'b'
+        tree.popleft(2)
+        self.assertEqual(index[1], ('a',))
+        self.assertEqual(index[2], ('c',))
+        self.assertEqual(list(tree[1]), ['a', 'b'])
+
+    def test_empty_and_missing(self):
+        index = AVLMultiMap().freeze()
+        self.assertEqual(len(index), 0)
+        self.assertEqual(list(index.items()), [])
+        self.assertIsNone(index.floor_item(1))
+        self.assertFalse(hasattr(index, 'select'))     # the tree's select returns a node, not a pair
+        self.assertRaises(KeyError, index.__getitem__, 1)
+        self.assertRaises(KeyError, FrozenSortedIndex([(1, 'a'), (3, 'b')]).__getitem__, 2)
+        self.assertRaises(ValueError, FrozenSortedIndex, [(2, 'a'), (1, 'b')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+from heap import MaxHeap, DaryMaxHeap, IndexedMaxHeap
+import random
+import unittest
+
+
+class TestMaxHeap(unittest.TestCase):
+    """ Testing heap functionality. """
+
+    def test_sorted_output(self):
+        numbers = [random.random() for _ in range(200)]
+        heap = MaxHeap(len(numbers))
+        for number in numbers:
+            heap.add(number)
+        self.assertEqual([heap.get_max() for _ in range(len(numbers))], sorted(numbers, reverse=True))
+
+
+class TestDaryMaxHeap(unittest.TestCase):
+    """ Testing the growable d-ary heap. """
+
+    def test_sorted_output(self):
+        numbers = [random.random() for _ in range(300)]
+        for arity in (2, 3, 4, 8):
+            with self.subTest(arity):
+                heap = DaryMaxHeap(arity=arity)
+                for number in numbers:
+                    heap.add(number)
+                self.assertEqual(len(heap), len(numbers))
+                self.assertGreaterEqual(len(heap.the_array), len(numbers))
+                self.assertEqual([heap.get_max() for _ in range(len(numbers))], sorted(numbers, reverse=True))
+                self.assertRaises(IndexError, heap.get_max)
+
+    def test_push_pop_and_replace(self):
+        heap = DaryMaxHeap(arity=4)
+        self.assertEqual(heap.push_pop(5), 5)
+        self.assertRaises(IndexError, heap.replace, 5)
+        for number in [3, 9, 1, 7]:
+            heap.add(number)
+        self.assertEqual(heap.push_pop(10), 10)
+        self.assertEqual(heap.push_pop(4), 9)
+        self.assertEqual(heap.replace(8), 7)
+        self.assertEqual([heap.get_max() for _ in range(len(heap))], [8, 4, 3, 1])
+
+    def test_bad_arity(self):
+        self.assertRaises(ValueError, DaryMaxHeap, 1, 1)
+
+
+class TestIndexedMaxHeap(unittest.TestCase):
+    """ Testing the indexed heap. """
+
+    def check_positions(self, heap: IndexedMaxHeap):
+        for k in range(1, len(heap) + 1):
+            self.assertEqual(heap.position[heap.handles[k]], k)
+            if k > 1:
+                self.assertLessEqual(heap.priorities[k], heap.priorities[k // 2])
+
+    def test_heapify(self):
+        entries = [('cave{0}'.format(i), random.random()) for i in range(100)]
+        heap = IndexedMaxHeap.heapify(entries)
+        self.check_positions(heap)
+        self.assertEqual(len(heap), 100)
+        expected = sorted(entries, key=lambda e: e[1], reverse=True)
+        self.assertEqual([heap.get_max() for _ in range(100)], expected)
+        self.assertRaises(ValueError, IndexedMaxHeap.heapify, [('a', 1), ('a', 2)])
+
+    def test_update_and_remove(self):
+        heap = IndexedMaxHeap()
+        expected = {}
+        for i in range(200):
+            heap.add(i, random.randint(0, 1000))  # grows from capacity 1
+            expected[i] = heap[i]
+        for _ in range(300):
+            handle = random.choice(list(expected))
+            if random.random() < 0.3:
+                self.assertEqual(heap.remove(handle), expected.pop(handle))
+            else:
+                expected[handle] = random.randint(0, 1000)
+                heap.update(handle, expected[handle])
+            self.check_positions(heap)
+        self.assertEqual(len(heap), len(expected))
+        self.assertEqual(heap.peek()[1], max(expected.values()))
+        self.assertRaises(KeyError, heap.remove, -1)
+        self.assertRaises(ValueError, heap.add, next(iter(expected)), 0)
+
+    def test_empty(self):
+        heap = IndexedMaxHeap()
+        self.assertRaises(IndexError, heap.peek)
+        self.assertRaises(IndexError, heap.get_max)
+
+
+if __name__ == '__main__':
+    unittest.main()
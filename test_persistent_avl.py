@@ -0,0 +1,100 @@
+from persistent_avl import PersistentAVLTree
+from node import AVLTreeNode
+import random
+import unittest
+
+
+class TestPersistentAVL(unittest.TestCase):
+    """ Testing that old versions survive updates. """
+
+    def check_tree(self, current: AVLTreeNode) -> tuple:
+        """ Checks order, balance, heights and sizes, returns (height, size). """
+        if current is None:
+            return (0, 0)
+        left_height, left_size = self.check_tree(current.left)
+        right_height, right_size = self.check_tree(current.right)
+        if current.left is not None:
+            self.assertLess(current.left.key, current.key)
+        if current.right is not None:
+            self.assertGreater(current.right.key, current.key)
+        self.assertIn(right_height - left_height, (-1, 0, 1))
+        self.assertEqual(current.height, 1 + max(left_height, right_height))
+        self.assertEqual(current.size, 1 + left_size + right_size)
+        return (current.height, current.size)
+
+    def nodes(self, current: AVLTreeNode, found: set) -> set:
+        if current is not None:
+            found.add(id(current))
+            self.nodes(current.left, found)
+            self.nodes(current.right, found)
+        return found
+
+    def test_versions(self):
+        random.seed(16)
+        versions = [PersistentAVLTree()]
+        contents = [set()]
+        for _ in range(400):
+            tree, keys = versions[-1], set(contents[-1])
+            if keys and random.random() < 0.4:
+                key = random.choice(sorted(keys))
+                tree = tree.delete(key)
+                keys.remove(key)
+            else:
+                key = random.randint(0, 300)
+                if key in keys:
+                    continue
+                tree = tree.insert(key, str(key))
+                keys.add(key)
+            versions.append(tree)
+            contents.append(keys)
+        for tree, keys in zip(versions, contents):
+            self.check_tree(tree.root)
+            self.assertEqual(len(tree), len(keys))
+            self.assertEqual(list(tree), sorted(keys))
+            for key in keys:
+                self.assertEqual(tree[key], str(key))
+            if keys:
+                self.assertEqual(tree.select(0).key, min(keys))
+
+    def test_sharing(self):
+        old = PersistentAVLTree.from_sorted([(key, key) for key in range(1000)])
+        new = old.insert(1000.5, 'x').delete(3)
+        shared = self.nodes(old.root, set()) & self.nodes(new.root, set())
+        self.assertGreater(len(shared), 1000 - 4 * 12)
+        self.assertNotIn(1000.5, old)
+        self.assertIn(3, old)
+        self.assertEqual(len(old), 1000)
+
+    def test_errors(self):
+        tree = PersistentAVLTree().insert(1, 'a')
+        self.assertRaises(ValueError, tree.insert, 1, 'b')
+        self.assertRaises(ValueError, tree.delete, 2)
+        self.assertRaises(TypeError, tree.__setitem__, 2, 'b')
+        self.assertRaises(TypeError, tree.__delitem__, 1)
+        self.assertRaises(ValueError, PersistentAVLTree, True)
+        self.assertRaises(TypeError, tree.split, 1)
+        self.assertRaises(TypeError, tree.union, PersistentAVLTree())
+
+    def test_add_on_old_version(self):
+        old = PersistentAVLTree.from_sorted([(key, key) for key in range(10)])
+        new = old.insert(20, 'x')
+        self.assertRaises(TypeError, old.add, 5.5)
+        self.assertEqual(list(old), list(range(10)))
+        self.assertEqual(list(new), list(range(10)) + [20])
+        self.assertEqual(len(new), 11)
+
+
+    def test_reads_never_write_shared_nodes(self):
+        old = PersistentAVLTree.from_sorted([(key, key) for key in range(15)])
+        new = old.insert(100, 100)
+        iterator = old.threaded_iter()
+        self.assertEqual([next(iterator) for _ in range(3)], [0, 1, 2])
+        self.assertEqual(new.range_between(0, 5), list(range(6)))
+        self.assertEqual(list(new.items()), [(key, key) for key in list(range(15)) + [100]])
+        self.assertEqual(list(iterator), list(range(3, 15)))
+        for i, j in ((-3, 2), (4, 4), (10, 40), (16, 20), (5, 2)):
+            with self.subTest((i, j)):
+                self.assertEqual(new.range_between(i, j), (list(range(15)) + [100])[max(i, 0):j + 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 from random_gen import RandomGen
 from player import Player
+from material import Material
+from cave import Cave
 import unittest
 
 
@@ -16,6 +18,15 @@ class TestPlayer(unittest.TestCase):
         except Exception:
             raise AssertionError("Unable to instantiate player with correct inputs")
 
+    def test_set_caves_freezes(self):
+        gold, iron = Material("Gold Nugget", 27.24), Material("Iron Ingot", 4.51)
+        player = Player("Enderman", 10)
+        player.set_caves([Cave("Castle", gold, 4)])
+        self.assertEqual([cave.name for cave in player.frozen_caves[27.24]], ["Castle"])
+        player.set_caves([Cave("Glacier", iron, 3), Cave("Crimson", gold, 2)])
+        self.assertEqual([cave.name for cave in player.frozen_caves[27.24]], ["Castle", "Crimson"])
+        self.assertEqual([cave.name for cave in player.frozen_caves[4.51]], ["Glacier"])
+
 
 if __name__ == '__main__':
     # seeding the pseudo-random generator
@@ -0,0 +1,34 @@
+import prime_ladder
+from prime_ladder import build_prime_ladder, next_prime_at_least, prev_prime_below
+import primes
+from primes import is_prime
+import unittest
+
+
+class TestPrimeLadder(unittest.TestCase):
+    """ Testing the stored prime ladder. """
+
+    def test_data_file(self):
+        ladder = prime_ladder.prime_ladder()
+        sieved = len(primes.SIEVE.flags)
+        self.assertEqual(list(ladder), list(build_prime_ladder()))
+        self.assertEqual(len(primes.SIEVE.flags), sieved)     # no sieve work to build it
+        self.assertEqual(len(ladder), prime_ladder.MAX_EXPONENT)
+        for k, prime in enumerate(ladder, 1):
+            self.assertTrue(is_prime(prime))
+            self.assertGreaterEqual(prime, 2 ** k)
+            self.assertLess(prime, 2 ** (k + 1))
+
+    def test_queries(self):
+        self.assertEqual(next_prime_at_least(0), 2)
+        self.assertEqual(next_prime_at_least(1000), 1031)
+        self.assertEqual(next_prime_at_least(1031), 1031)
+        self.assertEqual(prev_prime_below(1031), 521)
+        self.assertEqual(prev_prime_below(1032), 1031)
+        self.assertEqual(next_prime_at_least(2 ** 40), 1099511627791)
+        self.assertRaises(ValueError, next_prime_at_least, 2 ** 41)
+        self.assertRaises(ValueError, prev_prime_below, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+from primes import LargestPrimeIterator, SegmentedSieve, is_prime, is_probable_prime, largest_prime_below, SIEVE_LIMIT
+import unittest
+
+
+def naive_is_prime(n: int) -> bool:
+    return n >= 2 and all(n % d != 0 for d in range(2, int(n ** 0.5) + 1))
+
+
+class TestPrimes(unittest.TestCase):
+    """ Testing the prime engine and the iterator built on it. """
+
+    def test_sieve_segments(self):
+        sieve = SegmentedSieve()
+        sieve.extend_to(3 * len(sieve) + 5)
+        for n in list(range(200)) + list(range(len(sieve) - 300, len(sieve))):
+            self.assertEqual(sieve.is_prime(n), naive_is_prime(n), n)
+        self.assertEqual(sieve.largest_below(2), -1)
+        self.assertEqual(sieve.largest_below(100), 97)
+
+    def test_engines_agree(self):
+        for n in list(range(0, 2000)) + list(range(SIEVE_LIMIT - 200, SIEVE_LIMIT + 200)):
+            self.assertEqual(is_prime(n), naive_is_prime(n), n)
+            self.assertEqual(is_probable_prime(n), naive_is_prime(n), n)
+        self.assertEqual(largest_prime_below(SIEVE_LIMIT + 30), max(n for n in range(SIEVE_LIMIT, SIEVE_LIMIT + 30) if naive_is_prime(n)))
+        self.assertEqual(largest_prime_below(3), 2)
+        self.assertRaises(ValueError, largest_prime_below, 2)
+
+    def test_large(self):
+        self.assertEqual(largest_prime_below(10 ** 18), 10 ** 18 - 11)
+        self.assertEqual(largest_prime_below(2 ** 61), 2 ** 61 - 1)
+        self.assertTrue(is_prime(2 ** 61 - 1))
+        self.assertFalse(is_prime(3215031751))     # strong pseudoprime to bases 2, 3, 5 and 7
+        self.assertFalse(is_prime((2 ** 31 - 1) * (2 ** 61 - 1)))
+
+    def test_iterator(self):
+        self.assertEqual([p for p, _ in zip(LargestPrimeIterator(6, 2), range(5))], [5, 7, 13, 23, 43])
+        self.assertEqual([p for p, _ in zip(LargestPrimeIterator(2, 3), range(2))], [1, 2])
+        big = LargestPrimeIterator(10 ** 6, 10)
+        primes = [next(big) for _ in range(20)]     # climbs well past SIEVE_LIMIT
+        for p, following in zip(primes, primes[1:]):
+            self.assertTrue(is_prime(following))
+            self.assertLess(following, p * 10)
+        self.assertRaises(ValueError, next, LargestPrimeIterator(0, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+from referential_array import ArrayR, ArrayTyped
+import unittest
+
+
+class TestArrayR(unittest.TestCase):
+    """ Testing the bulk operations of the referential array. """
+
+    def make(self, n):
+        a = ArrayR(n)
+        for i in range(n):
+            a[i] = i
+        return a
+
+    def test_init(self):
+        a = ArrayR(3)
+        self.assertEqual(a[:], [None, None, None])
+        self.assertRaises(ValueError, lambda: ArrayR(0))
+
+    def test_resized(self):
+        a = self.make(4)
+        self.assertEqual(a.resized(6)[:], [0, 1, 2, 3, None, None])
+        self.assertEqual(a.resized(2)[:], [0, 1])
+
+    def test_copy_into(self):
+        a = self.make(5)
+        b = ArrayR(5)
+        a.copy_into(b, 1, 2, 3)
+        self.assertEqual(b[:], [None, None, 1, 2, 3])
+        a.copy_into(a, 0, 1, 4)  # overlapping ranges
+        self.assertEqual(a[:], [0, 0, 1, 2, 3])
+        self.assertRaises(IndexError, a.copy_into, b, 3, 0, 3)
+
+    def test_fill_and_slices(self):
+        a = self.make(5)
+        a.fill('x', 1, 3)
+        self.assertEqual(a[:], [0, 'x', 'x', 3, 4])
+        a[3:5] = ['y', 'z']
+        self.assertEqual(a[2:], ['x', 'y', 'z'])
+        a.fill(None)
+        self.assertEqual(a[:], [None] * 5)
+
+    def test_references_survive_copy(self):
+        a = ArrayR(2)
+        a[0] = [1, 2]
+        b = a.resized(3)
+        a[0] = None
+        del a
+        self.assertEqual(b[0], [1, 2])
+
+
+class TestArrayTyped(unittest.TestCase):
+    """ Testing the typed, buffer-backed array. """
+
+    def test_init(self):
+        a = ArrayTyped(5)
+        self.assertEqual(len(a), 5)
+        self.assertEqual(a.typecode, 'd')
+        self.assertEqual([a[i] for i in range(5)], [0.0] * 5)
+        self.assertRaises(ValueError, lambda: ArrayTyped(0))
+
+    def test_get_set(self):
+        a = ArrayTyped(4, 'q')
+        for i in range(4):
+            a[i] = i * 10
+        self.assertEqual([a[i] for i in range(4)], [0, 10, 20, 30])
+        self.assertRaises(IndexError, lambda: a[4])
+        self.assertRaises(TypeError, a.__setitem__, 0, 'x')
+
+    def test_slice_is_view(self):
+        a = ArrayTyped(6)
+        view = a[2:5]
+        self.assertEqual(len(view), 3)
+        view[0] = 1.5
+        self.assertEqual(a[2], 1.5)
+        a[4] = 2.5
+        self.assertEqual(view[2], 2.5)
+
+    def test_slice_assignment(self):
+        a = ArrayTyped(4)
+        b = ArrayTyped(2)
+        b[0], b[1] = 7.0, 8.0
+        a[1:3] = b
+        self.assertEqual([a[i] for i in range(4)], [0.0, 7.0, 8.0, 0.0])
+
+    def test_buffer_export(self):
+        a = ArrayTyped(3, 'Q')
+        a[1] = 42
+        view = memoryview(a.view())
+        self.assertEqual(view.format, 'Q')
+        self.assertEqual(view.tolist(), [0, 42, 0])
+        view[2] = 7     # no copy: writes through the view reach the array
+        self.assertEqual(a[2], 7)
+        self.assertRaises(TypeError, memoryview, a)     # view() is the only export
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import contextlib
+import io
+from game import SoloGame, MultiplayerGame
+from random_gen import RandomGen
+from simulation import Simulation, PHASES, percentile
+import unittest
+
+
+def play_by_hand(game_type, days: int, seed: int) -> list[list[float]]:
+    """ The usual printing loop, returning the balances after every day. """
+    balances = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        RandomGen.set_seed(seed)
+        g = game_type()
+        g.initialise_game()
+        for _ in range(days):
+            g.simulate_day()
+            g.finish_day()
+            balances.append(g.player_balances())
+    return balances
+
+
+class TestSimulation(unittest.TestCase):
+    """ Testing the headless runner. """
+
+    def test_same_game(self):
+        for game_type in (SoloGame, MultiplayerGame):
+            with self.subTest(game_type=game_type.__name__):
+                reports = []
+                result = Simulation.run(game_type(), 30, 0, sink=reports.append)
+                expected = play_by_hand(game_type, 30, 0)
+                self.assertEqual([list(report.balances) for report in reports], expected)
+                self.assertEqual(list(result.balances), expected[-1])
+
+    def test_headless(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            Simulation.run(MultiplayerGame(), 5, 0)
+        self.assertEqual(out.getvalue(), '')
+
+    def test_printing_sink(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            Simulation.run(SoloGame(), 3, 0, sink=lambda report: print(report.day))
+        self.assertEqual(out.getvalue(), '0\n1\n2\n')
+
+    def test_result(self):
+        reports = []
+        result = Simulation.run(MultiplayerGame(), 20, 0, sink=reports.append)
+        self.assertEqual(result.days, 20)
+        self.assertEqual([report.day for report in reports], list(range(20)))
+        self.assertEqual(list(result.phase_totals), list(PHASES))
+        self.assertAlmostEqual(result.elapsed, sum(result.phase_totals.values()))
+        self.assertAlmostEqual(result.elapsed, sum(report.elapsed for report in reports))
+        self.assertLessEqual(result.p50, result.p99)
+        self.assertEqual(result.p99, max(report.elapsed for report in reports))
+        self.assertGreater(result.days_per_second, 0)
+        self.assertRaises(ValueError, Simulation.run, MultiplayerGame(), 0, 0)
+
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile(samples, 100), 100)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertRaises(ValueError, percentile, [], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+from avl import AVLTree
+from btree import BTree
+from skip_list import SkipList
+from sorted_map import SortedMap
+from treap import Treap
+import random
+import unittest
+
+
+class TestSortedMap(unittest.TestCase):
+    """ Testing every SortedMap backend against a dict. """
+
+    backends = [AVLTree, lambda: Treap(seed=16), lambda: SkipList(seed=16), lambda: BTree(4), BTree]
+
+    def check(self, sorted_map: SortedMap, contents: dict) -> None:
+        ordered = sorted(contents.items())
+        self.assertEqual(len(sorted_map), len(ordered))
+        self.assertEqual(list(sorted_map.items()), ordered)
+        self.assertEqual(list(sorted_map), [key for key, _ in ordered])
+        if len(ordered) > 0:
+            self.assertEqual(sorted_map.max_item(), ordered[-1])
+            self.assertEqual(sorted_map.min_item(), ordered[0])
+        for _ in range(10):
+            i = random.randint(0, len(ordered))
+            j = random.randint(i, len(ordered) + 2)
+            self.assertEqual(sorted_map.range_between(i, j), [item for _, item in ordered[i:j + 1]])
+        for i, j in ((-5, -2), (-2, 1), (0, -1), (2, 1), (len(ordered), len(ordered) + 3)):
+            expected = [item for _, item in ordered[max(i, 0):j + 1]] if j >= 0 else []
+            self.assertEqual(sorted_map.range_between(i, j), expected)
+
+    def test_random_operations(self):
+        for make in self.backends:
+            sorted_map = make()
+            with self.subTest(type(sorted_map).__name__):
+                self.assertIsInstance(sorted_map, SortedMap)
+                self.assertTrue(sorted_map.is_empty())
+                self.assertRaises(IndexError, sorted_map.max_item)
+                contents = {}
+                for step in range(3000):
+                    key = random.randint(0, 400)
+                    if key in contents:
+                        self.assertEqual(sorted_map[key], contents[key])
+                        self.assertRaises(ValueError, sorted_map.__setitem__, key, 0)
+                        del sorted_map[key]
+                        del contents[key]
+                        self.assertNotIn(key, sorted_map)
+                    else:
+                        self.assertRaises(KeyError, sorted_map.__getitem__, key)
+                        self.assertRaises(ValueError, sorted_map.__delitem__, key)
+                        contents[key] = -key
+                        sorted_map[key] = -key
+                    if step % 500 == 0 or step < 5:
+                        self.check(sorted_map, contents)
+                self.check(sorted_map, contents)
+                for key in list(contents):
+                    del sorted_map[key]
+                self.check(sorted_map, {})
+
+    def test_from_items(self):
+        pairs = [(key, str(key)) for key in random.sample(range(1000), 300)]
+        for backend in (Treap, SkipList, BTree, AVLTree):
+            with self.subTest(backend.__name__):
+                self.check(backend.from_items(pairs), dict(pairs))
+        self.assertRaises(ValueError, BTree.from_items, [(1, 'a'), (1, 'b')])
+        self.assertRaises(ValueError, BTree, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
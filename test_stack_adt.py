@@ -0,0 +1,52 @@
+from stack_adt import ArrayStack
+from linked_stack import LinkedStack
+import unittest
+
+
+class TestArrayStack(unittest.TestCase):
+    """ Testing the growable array stack. """
+
+    def test_push_pop(self):
+        for shrink in (False, True):
+            with self.subTest(shrink=shrink):
+                stack, reference = ArrayStack(2, shrink), LinkedStack()
+                for i in range(100):
+                    stack.push(i)
+                    reference.push(i)
+                self.assertEqual(len(stack), 100)
+                self.assertGreaterEqual(stack.capacity, 100)
+                self.assertFalse(stack.is_full())
+                self.assertEqual(stack.peek(), 99)
+                while not reference.is_empty():
+                    self.assertEqual(stack.pop(), reference.pop())
+                self.assertTrue(stack.is_empty())
+                self.assertEqual(stack.capacity, 2 if shrink else 128)
+                self.assertRaises(Exception, stack.pop)
+                self.assertRaises(Exception, stack.peek)
+
+    def test_push_many_pop_many(self):
+        stack = ArrayStack(1, shrink=True)
+        stack.push_many(range(10))
+        stack.push(10)
+        stack.push_many([])
+        self.assertEqual(stack.capacity, 16)
+        self.assertEqual(stack.pop_many(3), [10, 9, 8])
+        self.assertEqual(stack.pop_many(0), [])
+        self.assertRaises(Exception, stack.pop_many, 9)
+        self.assertEqual(stack.pop_many(6), [7, 6, 5, 4, 3, 2])
+        self.assertEqual(stack.capacity, 4)
+        self.assertEqual(stack.array[2:4], [None, None])  # popped references dropped
+        self.assertEqual([stack.pop(), stack.pop()], [1, 0])
+
+    def test_clear(self):
+        stack = ArrayStack()
+        stack.push_many('abc')
+        stack.clear()
+        self.assertTrue(stack.is_empty())
+        self.assertEqual(stack.array[0:3], [None, None, None])
+        stack.push('d')
+        self.assertEqual(stack.peek(), 'd')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+from game import SoloGame, MultiplayerGame
+from sweep import sweep, play_seed, chunked, SweepAggregator
+import unittest
+
+
+class TestSweep(unittest.TestCase):
+    """ Testing the seed sweeps. """
+
+    def test_parallel_matches_serial(self):
+        for game_type in (SoloGame, MultiplayerGame):
+            with self.subTest(game_type=game_type.__name__):
+                serial = sweep(game_type, 15, range(8), workers=1)
+                parallel = sweep(game_type, 15, range(8), workers=2, chunk_size=3)
+                self.assertEqual(parallel.summaries(), serial.summaries())
+                self.assertEqual(parallel.mean_emeralds_per_day(), serial.mean_emeralds_per_day())
+                self.assertEqual(parallel.failures(), serial.failures())
+
+    def test_play_seed(self):
+        summary = play_seed(MultiplayerGame, 10, 0)
+        self.assertEqual(summary, play_seed(MultiplayerGame, 10, 0))
+        self.assertIsNone(summary.error)
+        self.assertEqual(summary.days_played, 10)
+        self.assertEqual(len(summary.emeralds_per_day), 10)
+        self.assertEqual(summary.emeralds_per_day[-1], sum(summary.balances))
+
+        failed = play_seed(SoloGame, 100, 2)    # the player runs out of food to buy
+        self.assertIsNotNone(failed.error)
+        self.assertLess(failed.days_played, 100)
+        self.assertEqual(len(failed.emeralds_per_day), failed.days_played)
+
+    def test_aggregator(self):
+        summaries = [play_seed(SoloGame, 5, seed) for seed in range(4)]
+        forward, backward = SweepAggregator(5), SweepAggregator(5)
+        for summary in summaries:
+            forward.add(summary)
+        for summary in reversed(summaries):
+            backward.add(summary)
+        self.assertEqual(backward.summaries(), summaries)
+        self.assertEqual(backward.mean_final_total(), forward.mean_final_total())
+        self.assertEqual(len(forward.mean_emeralds_per_day()), 5)
+        self.assertRaises(ValueError, forward.add, summaries[0])
+
+    def test_arguments(self):
+        self.assertEqual(chunked([1, 2, 3, 4, 5], 2), [[1, 2], [3, 4], [5]])
+        self.assertRaises(ValueError, sweep, SoloGame, 5, range(2), workers=0)
+        self.assertRaises(ValueError, sweep, SoloGame, 5, range(2), workers=1, chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+from top_k import top_k, bottom_k, TopKTracker
+import random
+import unittest
+
+
+class TestTopK(unittest.TestCase):
+    """ Testing streaming top-k selection. """
+
+    def test_matches_sort(self):
+        numbers = [random.randint(0, 50) for _ in range(300)]
+        for k in (0, 1, 5, 300, 400):
+            with self.subTest(k):
+                self.assertEqual(top_k(numbers, k), sorted(numbers, reverse=True)[:k])
+                self.assertEqual(bottom_k(numbers, k), sorted(numbers)[:k])
+
+    def test_key_and_stability(self):
+        pairs = [('a', 2), ('b', 3), ('c', 2), ('d', 1), ('e', 3)]
+        self.assertEqual(top_k(pairs, 3, key=lambda p: p[1]), [('b', 3), ('e', 3), ('a', 2)])
+        self.assertEqual(bottom_k(pairs, 2, key=lambda p: p[1]), [('d', 1), ('a', 2)])
+
+    def test_tracker(self):
+        tracker = TopKTracker(2)
+        self.assertTrue(tracker.push(5))
+        self.assertTrue(tracker.push(1))
+        self.assertEqual(tracker.threshold(), 1)
+        self.assertFalse(tracker.push(0))
+        self.assertTrue(tracker.push(7))
+        self.assertEqual(tracker.items(), [7, 5])
+        self.assertEqual(list(tracker), [7, 5])
+        self.assertEqual(len(tracker), 2)
+        self.assertRaises(ValueError, TopKTracker, -1)
+
+    def test_updates(self):
+        values = {'a': 5, 'b': 3, 'c': 8, 'd': 1}
+        tracker = TopKTracker(2, key=values.get)
+        for name in 'abcd':
+            tracker.push(name, handle=name)
+        self.assertEqual(tracker.items(), ['c', 'a'])
+        self.assertNotIn('b', tracker)
+        values['a'] = 9     # a kept item gets better
+        self.assertTrue(tracker.update('a', 'a'))
+        self.assertEqual(tracker.items(), ['a', 'c'])
+        values['d'] = 10    # a dropped item gets better and comes back
+        self.assertTrue(tracker.update('d', 'd'))
+        self.assertEqual(tracker.items(), ['d', 'a'])
+        self.assertNotIn('c', tracker)
+        values['a'] = 0     # 'c' was dropped, so it could now beat 'a'
+        self.assertRaises(ValueError, tracker.update, 'a', 'a')
+        self.assertRaises(ValueError, tracker.push, 'd', 'd')
+
+        smallest = TopKTracker(3, largest=False)
+        for handle, number in enumerate([4, 2, 7]):
+            smallest.push(number, handle)
+        smallest.update(0, 9)   # nothing dropped yet, so it can get worse
+        self.assertEqual(smallest.items(), [2, 7, 9])
+        self.assertFalse(smallest.push(10))
+        smallest.update(2, 1)
+        self.assertEqual(smallest.items(), [1, 2, 9])
+
+    def test_update_unordered_items(self):
+        class Trader:
+            def __init__(self, ratio):
+                self.ratio = ratio
+
+        for largest in (True, False):
+            with self.subTest(largest=largest):
+                tracker = TopKTracker(2, key=lambda trader: trader.ratio, largest=largest)
+                first, second = Trader(1.0), Trader(1.0)
+                tracker.push(first, handle='a')
+                tracker.push(second, handle='b')
+                self.assertTrue(tracker.update('a', Trader(1.0)))
+                self.assertIs(tracker.items()[1], second)
+                self.assertEqual(tracker.threshold(), 1.0)
+
+    def test_large_k(self):
+        self.assertEqual(top_k([3, 1, 2], 10 ** 7), [3, 2, 1])
+        self.assertLess(len(TopKTracker(10 ** 7).heap.handles), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
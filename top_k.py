@@ -0,0 +1,196 @@
+"""
+Streaming top-k selection built on IndexedMaxHeap.
+
+Only the k best entries seen so far are kept, in a heap whose root is the
+worst of them, so each new entry costs one comparison against the root
+and, if it gets in, replaces the root. The heap is indexed so that items
+already kept can have their key changed. Selecting from n entries is then
+O(n log k) time and O(min(n, k)) memory rather than a full sort.
+
+Usage:
+```
+top_k(caves, 3, key=lambda cave: cave.quantity)       # 3 fullest caves
+bottom_k(traders, 2, key=lambda trader: trader.ratio)  # 2 lowest ratios
+```
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Callable, Generic, Iterable, Iterator, TypeVar
+from heap import IndexedMaxHeap
+
+T = TypeVar('T')
+
+
+class _Larger:
+    """ Heap entry ordered so that the heap root is the entry with the
+        smallest key (and, among equal keys, the one seen last). Used to
+        keep the largest keys.
+    """
+    __slots__ = ('key', 'seq', 'item')
+
+    def __init__(self, key, seq: int, item) -> None:
+        self.key = key
+        self.seq = seq
+        self.item = item
+
+    def __gt__(self, other: _Larger) -> bool:
+        return self.key < other.key or (self.key == other.key and self.seq > other.seq)
+
+    def __le__(self, other: _Larger) -> bool:
+        return not self > other
+
+    def __lt__(self, other: _Larger) -> bool:
+        """ Orders entries best first, for sorting. """
+        return other > self
+
+
+class _Smaller(_Larger):
+    """ Heap entry ordered so that the heap root is the entry with the
+        largest key (and, among equal keys, the one seen last). Used to
+        keep the smallest keys. Like _Larger, it never compares the items.
+    """
+    __slots__ = ()
+
+    def __gt__(self, other: _Smaller) -> bool:
+        return self.key > other.key or (self.key == other.key and self.seq > other.seq)
+
+
+class TopKTracker(Generic[T]):
+    """ Keeps the k best items of a stream of updates.
+
+        By default "best" means largest key; with largest=False it means
+        smallest key. Among items with equal keys the ones pushed first are
+        kept. An item pushed with a handle can be updated later: its key is
+        computed again and it moves among the kept items, or is offered
+        again if it is not kept. A kept item can be made worse only while
+        no item has been dropped; after that, an item dropped earlier could
+        be better than the new version, and only a rebuild can tell.
+    """
+
+    def __init__(self, k: int, key: Callable[[T], object] = None, largest: bool = True) -> None:
+        """
+            :complexity: O(1)
+            :pre: k >= 0
+        """
+        if k < 0:
+            raise ValueError("k should not be negative.")
+        self.k = k
+        self.key = key
+        self.largest = largest
+        self.seq = 0
+        self.heap = IndexedMaxHeap()    # seq -> entry, the root is the worst kept item; grows up to k
+        self.seq_of = {}        # handle -> seq, for the kept items pushed with a handle
+        self.handle_of = {}     # seq -> handle, the other way round
+        self.dropped = False    # whether an item was ever rejected or evicted
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, handle) -> bool:
+        """ True if the item pushed with handle is kept. """
+        return handle in self.seq_of
+
+    def _entry(self, item: T, seq: int):
+        """ Wraps an item so that the heap root is the worst kept item. """
+        key = item if self.key is None else self.key(item)
+        if self.largest:
+            return _Larger(key, seq, item)
+        return _Smaller(key, seq, item)
+
+    def _keep(self, seq: int, entry, handle) -> None:
+        self.heap.add(seq, entry)
+        if handle is not None:
+            self.seq_of[handle] = seq
+            self.handle_of[seq] = handle
+
+    def _evict_worst(self) -> None:
+        seq, _ = self.heap.get_max()
+        handle = self.handle_of.pop(seq, None)
+        if handle is not None:
+            del self.seq_of[handle]
+        self.dropped = True
+
+    def push(self, item: T, handle=None) -> bool:
+        """ Offers an item to the tracker. Returns whether it was kept.
+            If a handle is given, the item can later be changed with update.
+            :complexity: O(log k)
+            :raises ValueError: if handle is already used by a kept item
+        """
+        if handle is not None and handle in self.seq_of:
+            raise ValueError('Duplicate handle: {0}'.format(handle))
+        if self.k == 0:
+            self.dropped = True
+            return False
+        self.seq += 1
+        entry = self._entry(item, self.seq)
+        if len(self.heap) < self.k:
+            self._keep(self.seq, entry, handle)
+            return True
+        if self.heap.peek()[1] > entry:
+            self._evict_worst()
+            self._keep(self.seq, entry, handle)
+            return True
+        self.dropped = True
+        return False
+
+    def update(self, handle, item: T) -> bool:
+        """ Replaces the item pushed with handle by item (which can be the
+            same object, changed) and returns whether it is kept. If the
+            handle is not kept, this is push(item, handle). A kept item keeps
+            its place among equal keys.
+            :complexity: O(log k)
+            :raises ValueError: if a kept item gets worse after an item was dropped
+        """
+        seq = self.seq_of.get(handle)
+        if seq is None:
+            return self.push(item, handle)
+        entry = self._entry(item, seq)
+        if self.dropped and entry > self.heap[seq]:
+            raise ValueError('A kept item cannot get worse once items have been dropped')
+        self.heap.update(seq, entry)
+        return True
+
+    def extend(self, items: Iterable[T]) -> None:
+        """ Offers every item of an iterable.
+            :complexity: O(n log k)
+        """
+        for item in items:
+            self.push(item)
+
+    def threshold(self):
+        """ Returns the key an item has to beat to be kept once the tracker
+            holds k items (the key of the worst item kept).
+            :raises IndexError: if the tracker is empty
+        """
+        return self.heap.peek()[1].key
+
+    def items(self) -> list[T]:
+        """ Returns the kept items, best first, without changing the tracker.
+            :complexity: O(k log k)
+        """
+        entries = [self.heap.priorities[i] for i in range(1, len(self.heap) + 1)]
+        entries.sort()
+        return [entry.item for entry in entries]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items())
+
+
+def top_k(iterable: Iterable[T], k: int, key: Callable[[T], object] = None) -> list[T]:
+    """ Returns the k items with the largest keys, largest first.
+        :complexity: O(n log k) time, O(min(n, k)) memory
+    """
+    tracker = TopKTracker(k, key, largest=True)
+    tracker.extend(iterable)
+    return tracker.items()
+
+
+def bottom_k(iterable: Iterable[T], k: int, key: Callable[[T], object] = None) -> list[T]:
+    """ Returns the k items with the smallest keys, smallest first.
+        :complexity: O(n log k) time, O(min(n, k)) memory
+    """
+    tracker = TopKTracker(k, key, largest=False)
+    tracker.extend(iterable)
+    return tracker.items()
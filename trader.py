@@ -198,22 +198,24 @@ class RangeTrader(Trader):
     RangeTrader offers a deal based on a radnom deal inside range of the mining rate
     """
 
+    # any SortedMap backend (AVLTree, Treap, SkipList, BTree) can hold the materials
+    materials_map_type = AVLTree
+
     def __init__(self, name: str) -> None:
         """
         Defines all the variables present in a Range Trader instance. 
         best and worst case complexity: O(1)
         """
         Trader.__init__(self, name)
-        self.all_materials = AVLTree()
+        self.all_materials = self.materials_map_type()
 
     def set_all_materials(self, mats: list[Material]) -> None:
         """
-        Sets all the materials available to this trader as a AVL Tree
-        Worst case complexity: O(mlog(m))
+        Sets all the materials available to this trader as a AVL Tree,
+        sorted once and then bulk-loaded
+        Worst case complexity: O(mlog(m)) for the sort, O(m) for the build
         """
-        self.all_materials = AVLTree()
-        for material in mats:
-            self.all_materials[material.mining_rate] = material
+        self.all_materials = self.materials_map_type.from_items([(material.mining_rate, material) for material in mats])
     
     def add_material(self, mat: Material) -> None:
         """
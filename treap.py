@@ -0,0 +1,190 @@
+""" Treap implemented on top of the SortedMap ADT.
+
+A treap is a binary search tree on the keys that is also a max-heap on
+random priorities drawn when a node is created, so its shape is that of
+a BST built by inserting the keys in random order: expected depth
+O(log(N)) whatever the insertion order, with no balance bookkeeping
+beyond the priority. Every node also keeps the size of its sub-tree, for
+the rank-based range_between.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import random
+from typing import TypeVar, Generic, Iterator
+from node import TreapNode
+from sorted_map import SortedMap
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class Treap(SortedMap, Generic[K, I]):
+    """ Randomised balanced binary search tree. """
+
+    def __init__(self, seed: int = None) -> None:
+        """
+            Initialises an empty treap. Priorities come from a generator of
+            its own, seeded with seed, so using a treap never changes the
+            state of the random module (or of RandomGen).
+            :complexity: O(1)
+        """
+        self.root = None
+        self.length = 0
+        self.rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def get_size(self, current: TreapNode) -> int:
+        return 0 if current is None else current.size
+
+    def update_size(self, current: TreapNode) -> None:
+        current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
+
+    def get_tree_node_by_key(self, key: K) -> TreapNode:
+        """
+            :complexity: O(log(N)) expected
+            :raises KeyError: if key is not in the treap
+        """
+        current = self.root
+        while current is not None:
+            if key == current.key:
+                return current
+            current = current.left if key < current.key else current.right
+        raise KeyError('Key not found: {0}'.format(key))
+
+    def __getitem__(self, key: K) -> I:
+        return self.get_tree_node_by_key(key).item
+
+    def split_nodes(self, current: TreapNode, key: K) -> tuple[TreapNode, TreapNode]:
+        """
+            Splits a sub-tree into the nodes with keys smaller than key and
+            those with larger keys (key itself is not in the sub-tree).
+            :complexity: O(log(N)) expected
+        """
+        if current is None:
+            return (None, None)
+        if key < current.key:
+            left, current.left = self.split_nodes(current.left, key)
+            self.update_size(current)
+            return (left, current)
+        current.right, right = self.split_nodes(current.right, key)
+        self.update_size(current)
+        return (current, right)
+
+    def merge_nodes(self, left: TreapNode, right: TreapNode) -> TreapNode:
+        """
+            Merges two sub-trees, all keys of left being smaller than those
+            of right, keeping the higher priority on top.
+            :complexity: O(log(N)) expected
+        """
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self.merge_nodes(left.right, right)
+            self.update_size(left)
+            return left
+        right.left = self.merge_nodes(left, right.left)
+        self.update_size(right)
+        return right
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            :complexity: O(log(N)) expected
+            :raises ValueError: if key is already in the treap
+        """
+        if key in self:
+            raise ValueError('Inserting duplicate item')
+        self.root = self.insert_aux(self.root, TreapNode(key, item, self.rng.random()))
+        self.length += 1
+
+    def insert_aux(self, current: TreapNode, node: TreapNode) -> TreapNode:
+        """
+            Walks down until node's priority beats the current one, then
+            splits the rest of the sub-tree around node's key below node.
+            returns the new root of the subtree.
+        """
+        if current is None:
+            return node
+        if node.priority > current.priority:
+            node.left, node.right = self.split_nodes(current, node.key)
+            self.update_size(node)
+            return node
+        if node.key < current.key:
+            current.left = self.insert_aux(current.left, node)
+        else:
+            current.right = self.insert_aux(current.right, node)
+        current.size += 1
+        return current
+
+    def __delitem__(self, key: K) -> None:
+        """
+            :complexity: O(log(N)) expected
+            :raises ValueError: if key is not in the treap
+        """
+        self.root = self.delete_aux(self.root, key)
+        self.length -= 1
+
+    def delete_aux(self, current: TreapNode, key: K) -> TreapNode:
+        """ Replaces the node with key by the merge of its children. """
+        if current is None:
+            raise ValueError('Deleting non-existent item')
+        if key == current.key:
+            return self.merge_nodes(current.left, current.right)
+        if key < current.key:
+            current.left = self.delete_aux(current.left, key)
+        else:
+            current.right = self.delete_aux(current.right, key)
+        current.size -= 1
+        return current
+
+    def items(self) -> Iterator[tuple[K, I]]:
+        """ Lazily yields the (key, item) pairs in key order. """
+        stack = []
+        current = self.root
+        while len(stack) > 0 or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            node = stack.pop()
+            yield (node.key, node.item)
+            current = node.right
+
+    def range_between(self, i: int, j: int) -> list[I]:
+        """
+            Returns the items of the keys ranked i to j (0-based, inclusive).
+            :complexity: O(log(N) + j - i) expected
+        """
+        elements = []
+        self.range_between_aux(self.root, i, j, elements)
+        return elements
+
+    def range_between_aux(self, current: TreapNode, i: int, j: int, elements: list[I]) -> None:
+        """ Appends the items ranked i to j of the sub-tree, in order. """
+        if current is None or j < 0 or i >= current.size:
+            return
+        rank = self.get_size(current.left)
+        self.range_between_aux(current.left, i, j, elements)
+        if i <= rank <= j:
+            elements.append(current.item)
+        self.range_between_aux(current.right, i - rank - 1, j - rank - 1, elements)
+
+    def max_item(self) -> tuple[K, I]:
+        if self.root is None:
+            raise IndexError('Empty treap')
+        current = self.root
+        while current.right is not None:
+            current = current.right
+        return (current.key, current.item)
+
+    def min_item(self) -> tuple[K, I]:
+        if self.root is None:
+            raise IndexError('Empty treap')
+        current = self.root
+        while current.left is not None:
+            current = current.left
+        return (current.key, current.item)